@@ -0,0 +1,38 @@
+"""add task events outbox
+
+Revision ID: 0a8e2f6c4b19
+Revises: f3c9d5e1b702
+Create Date: 2026-10-18 15:48:30.918402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0a8e2f6c4b19'
+down_revision: Union[str, None] = 'f3c9d5e1b702'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'task_events',
+        sa.Column('seq', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('organization_id', sa.Integer(), nullable=True),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('team_id', sa.Integer(), nullable=True),
+        sa.Column('event_type', sa.String(), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('seq'),
+    )
+    op.create_index('ix_task_events_organization_id_seq', 'task_events', ['organization_id', 'seq'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_task_events_organization_id_seq', table_name='task_events')
+    op.drop_table('task_events')
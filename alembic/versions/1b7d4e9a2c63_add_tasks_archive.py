@@ -0,0 +1,53 @@
+"""add tasks archive
+
+Revision ID: 1b7d4e9a2c63
+Revises: 0a8e2f6c4b19
+Create Date: 2026-10-18 16:40:05.113574
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1b7d4e9a2c63'
+down_revision: Union[str, None] = '0a8e2f6c4b19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'tasks_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('status', postgresql.ENUM(name='taskstatus', create_type=False), nullable=True),
+        sa.Column('priority', postgresql.ENUM(name='prioritystatus', create_type=False), nullable=True),
+        sa.Column('deadline', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('reviewer_id', sa.Integer(), nullable=True),
+        sa.Column('assignee_id', sa.Integer(), nullable=True),
+        sa.Column('creator_id', sa.Integer(), nullable=False),
+        sa.Column('team_id', sa.Integer(), nullable=False),
+        sa.Column('organization_id', sa.Integer(), nullable=True),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('archived_at', sa.DateTime(), server_default=sa.text("(now() at time zone 'utc')"), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_tasks_archive_organization_id_created_at', 'tasks_archive', ['organization_id', 'created_at'], unique=False)
+    op.create_index('ix_tasks_archive_assignee_id', 'tasks_archive', ['assignee_id'], unique=False)
+    op.create_index('ix_tasks_archive_creator_id', 'tasks_archive', ['creator_id'], unique=False)
+    op.create_index('ix_tasks_archive_reviewer_id', 'tasks_archive', ['reviewer_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_archive_reviewer_id', table_name='tasks_archive')
+    op.drop_index('ix_tasks_archive_creator_id', table_name='tasks_archive')
+    op.drop_index('ix_tasks_archive_assignee_id', table_name='tasks_archive')
+    op.drop_index('ix_tasks_archive_organization_id_created_at', table_name='tasks_archive')
+    op.drop_table('tasks_archive')
@@ -0,0 +1,26 @@
+"""add tasks deadline index
+
+Revision ID: 2c8f1e5a7d30
+Revises: 1b7d4e9a2c63
+Create Date: 2026-10-18 17:05:42.618203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c8f1e5a7d30'
+down_revision: Union[str, None] = '1b7d4e9a2c63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_tasks_deadline', 'tasks', ['deadline'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_deadline', table_name='tasks')
@@ -0,0 +1,29 @@
+"""add tasks archive search index
+
+Revision ID: 3d6a9f2b8e41
+Revises: 2c8f1e5a7d30
+Create Date: 2026-10-18 18:12:37.904415
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d6a9f2b8e41'
+down_revision: Union[str, None] = '2c8f1e5a7d30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Same expression as tasks.search_vector, so archive-aware search can use the index
+    op.create_index('ix_tasks_archive_search_vector', 'tasks_archive',
+                    [sa.text("to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, ''))")],
+                    unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_archive_search_vector', table_name='tasks_archive')
@@ -0,0 +1,70 @@
+"""add task access-pattern indexes
+
+Revision ID: c4f18a2d6e90
+Revises: b71c0e5f9a36
+Create Date: 2026-10-18 12:20:55.061748
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f18a2d6e90'
+down_revision: Union[str, None] = 'b71c0e5f9a36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns, unique)
+INDEXES = [
+    ('ix_tasks_assignee_id_status', 'tasks', ['assignee_id', 'status'], False),
+    ('ix_tasks_creator_id', 'tasks', ['creator_id'], False),
+    ('ix_tasks_reviewer_id', 'tasks', ['reviewer_id'], False),
+    ('ix_tasks_team_id_status', 'tasks', ['team_id', 'status'], False),
+    ('ix_tasks_organization_id_created_at', 'tasks', ['organization_id', 'created_at'], False),
+    ('ix_tasks_organization_id_deadline', 'tasks', ['organization_id', 'deadline'], False),
+    ('ix_tasks_created_at', 'tasks', ['created_at'], False),
+    ('uq_team_memberships_team_id_user_id', 'team_memberships', ['team_id', 'user_id'], True),
+    ('ix_team_memberships_user_id', 'team_memberships', ['user_id'], False),
+]
+
+
+# Nothing ever prevented duplicate memberships; keep one row per (team, user) before the
+# unique index is built, preferring an active membership, then the oldest
+DEDUPE_TEAM_MEMBERSHIPS = """
+    DELETE FROM team_memberships
+    USING (
+        SELECT id, row_number() OVER (PARTITION BY team_id, user_id
+                                      ORDER BY is_active DESC NULLS LAST, id) AS position
+        FROM team_memberships
+    ) ranked
+    WHERE team_memberships.id = ranked.id AND ranked.position > 1
+"""
+
+# A failed CREATE INDEX CONCURRENTLY leaves an INVALID index behind, which
+# if_not_exists would otherwise skip on every rerun
+INVALID_INDEX = """
+    SELECT 1 FROM pg_index JOIN pg_class ON pg_class.oid = pg_index.indexrelid
+    WHERE pg_class.relname = :name AND NOT pg_index.indisvalid
+"""
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        connection.execute(sa.text(DEDUPE_TEAM_MEMBERSHIPS))
+        for name, table, columns, unique in INDEXES:
+            if connection.execute(sa.text(INVALID_INDEX), {"name": name}).first():
+                op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+            op.create_index(name, table, columns, unique=unique,
+                            postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
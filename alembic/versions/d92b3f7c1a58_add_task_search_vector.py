@@ -0,0 +1,61 @@
+"""add task full-text search vector
+
+Revision ID: d92b3f7c1a58
+Revises: c4f18a2d6e90
+Create Date: 2026-10-18 13:41:09.227463
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd92b3f7c1a58'
+down_revision: Union[str, None] = 'c4f18a2d6e90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEARCH_VECTOR_EXPRESSION = "to_tsvector('english', coalesce({0}title, '') || ' ' || coalesce({0}description, ''))"
+# Rows per backfill transaction; each batch holds row locks only on its own rows
+BACKFILL_BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    # A plain nullable column is a catalog-only change; a STORED generated column
+    # would rewrite the whole table under ACCESS EXCLUSIVE
+    op.add_column('tasks', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    # New and edited rows are kept current from here on; the backfill covers the rest
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION tasks_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {SEARCH_VECTOR_EXPRESSION.format('NEW.')};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER tasks_search_vector_update BEFORE INSERT OR UPDATE OF title, description ON tasks
+        FOR EACH ROW EXECUTE FUNCTION tasks_search_vector_update()
+    """)
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        last_id = connection.scalar(sa.text("SELECT max(id) FROM tasks")) or 0
+        for after in range(0, last_id, BACKFILL_BATCH_SIZE):
+            connection.execute(sa.text(
+                f"UPDATE tasks SET search_vector = {SEARCH_VECTOR_EXPRESSION.format('')} "
+                "WHERE id > :after AND id <= :until AND search_vector IS NULL"
+            ), {"after": after, "until": after + BACKFILL_BATCH_SIZE})
+        op.create_index('ix_tasks_search_vector', 'tasks', ['search_vector'], postgresql_using='gin',
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_tasks_search_vector', table_name='tasks', postgresql_concurrently=True, if_exists=True)
+    op.execute("DROP TRIGGER IF EXISTS tasks_search_vector_update ON tasks")
+    op.execute("DROP FUNCTION IF EXISTS tasks_search_vector_update()")
+    op.drop_column('tasks', 'search_vector')
@@ -0,0 +1,26 @@
+"""add task version
+
+Revision ID: e5a07c3b9d14
+Revises: d92b3f7c1a58
+Create Date: 2026-10-18 14:26:52.480117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a07c3b9d14'
+down_revision: Union[str, None] = 'd92b3f7c1a58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('tasks', sa.Column('version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    op.drop_column('tasks', 'version')
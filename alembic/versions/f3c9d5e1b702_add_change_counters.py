@@ -0,0 +1,31 @@
+"""add change counters
+
+Revision ID: f3c9d5e1b702
+Revises: e5a07c3b9d14
+Create Date: 2026-10-18 15:03:17.652930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c9d5e1b702'
+down_revision: Union[str, None] = 'e5a07c3b9d14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'change_counters',
+        sa.Column('scope', sa.String(), nullable=False),
+        sa.Column('value', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('scope'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('change_counters')
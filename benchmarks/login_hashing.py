@@ -0,0 +1,68 @@
+"""
+    Benchmark: bcrypt logins/sec per core, inline (threadpool) vs HashingService (process pool).
+
+    Inline mode reproduces the old sync login handlers: every verify runs on one of
+    AnyIO's 40 worker threads and is serialised by the GIL. Pool mode awaits
+    hashing_service.verify from the event loop, as the async login routes now do.
+
+    Usage: python -m benchmarks.login_hashing [--logins 200] [--concurrency 40]
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from starlette.concurrency import run_in_threadpool
+
+from task.hashing import HashingService, get_password_hash, verify_password
+
+
+async def run_inline(hashed: str, logins: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one_login():
+        async with semaphore:
+            await run_in_threadpool(verify_password, "benchmark-password", hashed)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one_login() for _ in range(logins)))
+    return time.perf_counter() - start
+
+
+async def run_pool(hashed: str, logins: int, concurrency: int, workers: int) -> float:
+    service = HashingService(workers=workers, max_pending=max(concurrency, logins))
+    # Warm the pool so process start-up is not counted
+    await asyncio.gather(*(service.verify("benchmark-password", hashed) for _ in range(workers)))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one_login():
+        async with semaphore:
+            await service.verify("benchmark-password", hashed)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one_login() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    service.shutdown()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    hashed = get_password_hash("benchmark-password")
+    cores = os.cpu_count() or 1
+
+    inline = asyncio.run(run_inline(hashed, args.logins, args.concurrency))
+    pool = asyncio.run(run_pool(hashed, args.logins, args.concurrency, args.workers))
+
+    for name, elapsed in (("inline threadpool", inline), (f"process pool ({args.workers} workers)", pool)):
+        rate = args.logins / elapsed
+        print(f"{name:32s} {rate:8.1f} logins/sec  {rate / cores:8.1f} logins/sec/core")
+
+
+if __name__ == "__main__":
+    main()
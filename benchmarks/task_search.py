@@ -0,0 +1,115 @@
+"""
+    Benchmark: /task/search query latency on a seeded dataset (default 1M tasks).
+
+    Seeds tasks for one throwaway organization and team with generate_series, so the
+    data never leaves the database, then times the full-text statement used by the
+    endpoint against the ILIKE scan it replaces. The seeded rows are removed at the
+    end unless --keep is passed.
+
+    Usage: python -m benchmarks.task_search [--tasks 1000000] [--runs 20] [--keep]
+"""
+import argparse
+import statistics
+import time
+
+from sqlalchemy import or_, select, text
+
+from task.database import engine, SessionLocal
+from task.models import Organization, Team, User, Task
+from task.utils.task_filters import build_search_statement
+
+WORDS = ["login", "billing", "invoice", "release", "timeout", "android", "ios", "export", "report",
+         "dashboard", "migration", "cache", "search", "upload", "email", "payment", "refactor", "docs"]
+QUERIES = ["login timeout", "\"billing report\"", "android -ios", "payment or invoice", "cache migration"]
+
+SEED_SQL = text("""
+    INSERT INTO tasks (title, description, status, priority, deadline, created_at, updated_at,
+                       creator_id, team_id, organization_id)
+    SELECT
+        initcap(w.words[1 + (i % 18)]) || ' ' || w.words[1 + ((i / 18) % 18)] || ' #' || i,
+        'Task ' || i || ' about ' || w.words[1 + ((i * 7) % 18)] || ' and ' || w.words[1 + ((i * 13) % 18)]
+            || ' for the ' || w.words[1 + ((i * 5) % 18)] || ' team',
+        'NOT_STARTED', 'MEDIUM', now() + (i % 90) * interval '1 day', now(), now(),
+        :user_id, :team_id, :organization_id
+    FROM generate_series(1, :count) AS i, (SELECT CAST(:words AS text[]) AS words) AS w
+""")
+
+
+def seed(count: int):
+    db = SessionLocal()
+    organization = Organization(name=f"search-benchmark-{int(time.time())}")
+    db.add(organization)
+    db.flush()
+    user = User(email=f"search-benchmark-{organization.id}@example.com", hashed_password="x",
+                organization_id=organization.id)
+    team = Team(name=f"search-benchmark-{organization.id}", organization_id=organization.id)
+    db.add_all([user, team])
+    db.flush()
+    ids = {"organization_id": organization.id, "team_id": team.id, "user_id": user.id}
+    start = time.perf_counter()
+    db.execute(SEED_SQL, {**ids, "count": count, "words": WORDS})
+    db.commit()
+    print(f"seeded {count} tasks in {time.perf_counter() - start:.1f}s")
+    db.close()
+    with engine.connect() as connection:
+        connection.execute(text("ANALYZE tasks"))
+    return ids
+
+
+def cleanup(ids):
+    db = SessionLocal()
+    db.query(Task).filter(Task.organization_id == ids["organization_id"]).delete()
+    db.query(Team).filter(Team.id == ids["team_id"]).delete()
+    db.query(User).filter(User.id == ids["user_id"]).delete()
+    db.query(Organization).filter(Organization.id == ids["organization_id"]).delete()
+    db.commit()
+    db.close()
+
+
+def time_statement(statement, params, runs: int):
+    timings = []
+    with engine.connect() as connection:
+        for _ in range(runs):
+            start = time.perf_counter()
+            connection.execute(statement, params).fetchall()
+            timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--keep", action="store_true", help="Leave the seeded rows in place")
+    args = parser.parse_args()
+
+    ids = seed(args.tasks)
+    try:
+        search = build_search_statement(False, False)
+        for query in QUERIES:
+            params = {"q": query, "organization_id": ids["organization_id"], "limit": 20, "offset": 0}
+            p50, p95 = time_statement(search, params, args.runs)
+            print(f"tsvector  {query:22s} p50 {p50:8.2f} ms  p95 {p95:8.2f} ms")
+
+            terms = [term for term in query.replace('"', "").split() if not term.startswith("-") and term != "or"]
+            ilike = (select(Task.id, Task.title)
+                     .where(Task.organization_id == ids["organization_id"],
+                            or_(*(Task.title.ilike(f"%{term}%") | Task.description.ilike(f"%{term}%") for term in terms)))
+                     .order_by(Task.id).limit(20))
+            p50, p95 = time_statement(ilike, {}, args.runs)
+            print(f"ILIKE     {query:22s} p50 {p50:8.2f} ms  p95 {p95:8.2f} ms")
+
+        compiled = search.compile(engine)
+        params = compiled.construct_params({"q": QUERIES[0], "organization_id": ids["organization_id"],
+                                            "limit": 20, "offset": 0})
+        with engine.connect() as connection:
+            plan = connection.exec_driver_sql("EXPLAIN (ANALYZE, BUFFERS) " + str(compiled), params)
+            print("\n".join(row[0] for row in plan))
+    finally:
+        if not args.keep:
+            cleanup(ids)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,24 +2,36 @@ from datetime import datetime, timedelta
 from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.session import make_transient_to_detached
+from sqlalchemy import event, func
 from typing import Any, Dict
-from .models import User
-from .database import get_db
+from .models import User, TeamMembership, Role, UserRole, RefreshToken
+from .schemas import TokenClaims
+from .database import get_db, get_async_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from .utils.principal_cache import principal_cache
+from .utils.revocation import revocation_list
 from fastapi.security import OAuth2PasswordBearer
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from starlette.concurrency import run_in_threadpool
 from jwt.exceptions import ExpiredSignatureError, InvalidTokenError
+import os
+import uuid
 
 SECRET_KEY = "your_secret_key" 
 REFRESH_SECRET_KEY = "your_refresh_secret" 
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 
 REFRESH_TOKEN_EXPIRE_DAYS = 7 
+# Opt-in: embed role, organization and team roles in access tokens
+USE_CLAIMS_TOKENS = os.getenv("USE_CLAIMS_TOKENS", "false").lower() == "true"
 
 # Function to create an access token
 def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta if expires_delta else timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode.update({"exp": expire})
+    to_encode.setdefault("jti", uuid.uuid4().hex)  # Lets the token be revoked individually
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -30,32 +42,180 @@ def create_refresh_token(data: dict, expires_delta: timedelta = None):
     encoded_jwt = jwt.encode(to_encode, REFRESH_SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def issue_refresh_token(db: Session, user_id: int, family_id: str = None) -> str:
+    """
+        Mint a refresh token and record its jti so it can be rotated exactly once.
+        The caller commits.
+    """
+    jti = uuid.uuid4().hex
+    expires_delta = timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    db.add(RefreshToken(
+        jti=jti,
+        family_id=family_id or jti,
+        user_id=user_id,
+        expires_at=datetime.utcnow() + expires_delta,
+    ))
+    return create_refresh_token({"sub": str(user_id), "jti": jti, "fam": family_id or jti}, expires_delta)
+
+def rotate_refresh_token(db: Session, refresh_token: str):
+    """
+        Exchange a refresh token for a new one in the same family.
+
+        Presenting a token that was already rotated means it leaked, so the whole
+        family is revoked and the legitimate holder has to log in again.
+        Returns (user_id, new_refresh_token); the caller commits.
+    """
+    try:
+        payload = jwt.decode(refresh_token, REFRESH_SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+
+    jti = payload.get("jti")
+    stored = None
+    if jti:
+        stored = db.query(RefreshToken).filter(RefreshToken.jti == jti).with_for_update().first()
+    if not stored or str(stored.user_id) != payload.get("sub"):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+
+    if stored.revoked or stored.used_at is not None:
+        db.query(RefreshToken).filter(RefreshToken.family_id == stored.family_id).update(
+            {RefreshToken.revoked: True}, synchronize_session=False
+        )
+        db.commit()
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token reuse detected")
+
+    stored.used_at = datetime.utcnow()
+    return stored.user_id, issue_refresh_token(db, stored.user_id, stored.family_id)
+
 async def verify_jwt_token(token: str):
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
         if user_id is None:
             raise HTTPException(status_code=403, detail="Invalid authentication credentials")
+        # The periodic filter sync and a filter hit both query the database; keep them off the event loop
+        if await run_in_threadpool(revocation_list.is_revoked, payload.get("jti")):
+            raise HTTPException(status_code=403, detail="Token has been revoked")
         return user_id  # Return the user ID from the token
     except JWTError:
         raise HTTPException(status_code=403, detail="Invalid or expired token")
     
 security = HTTPBearer()
 
-# Dependency to get the current user based on the token
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security),db:Session = Depends(get_db)):
-    token = credentials.credentials 
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: int = payload.get("sub")
-        if not user_id:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User ID not found in token")
+def load_principal(db: Session, user_id):
+    """
+        Return the User for a token subject, served from the principal cache when possible.
+
+        On a cache hit the user is attached to the request session without a SELECT,
+        so relationships still lazy-load normally.
+    """
+    subject = str(user_id)
+    values = principal_cache.get(subject)
+    if values is not None:
+        user = User(**values)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
 
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    user = db.query(User).filter(User.id == user_id).first()
+    if user:
+        principal_cache.set(subject, {attr.key: getattr(user, attr.key) for attr in User.__mapper__.column_attrs})
+    return user
 
-        return user
+def invalidate_principal(user_id):
+    """Forget a cached user after its role, organization or password changes."""
+    principal_cache.invalidate(user_id)
 
+def get_token_payload(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """Decode the bearer token once per request; shared by the user and claims dependencies."""
+    try:
+        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
     except JWTError:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
\ No newline at end of file
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    if revocation_list.is_revoked(payload.get("jti")):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has been revoked")
+    return payload
+
+# Dependency to get the current user based on the token
+def get_current_user(payload: Dict[str, Any] = Depends(get_token_payload), db:Session = Depends(get_db)):
+    user_id: int = payload.get("sub")
+    if not user_id:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User ID not found in token")
+
+    user = load_principal(db, user_id)
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+
+    db.info["user_id"] = user.id  # Lets the session attribute its writes to this user
+    return user
+
+def build_user_claims(db: Session, user: User) -> Dict[str, Any]:
+    """
+        Collect the authorization facts for a user: global role, organization,
+        per-team role map and the auth_version they were read at.
+    """
+    memberships = (
+        db.query(TeamMembership.team_id, Role.role_name)
+        .outerjoin(Role, TeamMembership.role_id == Role.id)
+        .filter(TeamMembership.user_id == user.id)
+        .all()
+    )
+    return {
+        "sub": str(user.id),
+        "role": user.role,
+        "org": user.organization_id,
+        "teams": {str(team_id): (role_name.value if role_name else UserRole.MEMBER.value)
+                  for team_id, role_name in memberships},
+        "ver": user.auth_version or 0,
+    }
+
+def build_token_data(db: Session, user: User) -> Dict[str, Any]:
+    """Token payload for a user; carries authorization claims when USE_CLAIMS_TOKENS is on."""
+    if USE_CLAIMS_TOKENS:
+        return build_user_claims(db, user)
+    return {"sub": str(user.id)}
+
+def bump_auth_version(db: Session, user_id: int):
+    """
+        Mark every claims token issued to a user as stale.
+        Call before committing a change to the user's role, organization or team memberships.
+    """
+    db.query(User).filter(User.id == user_id).update(
+        {User.auth_version: func.coalesce(User.auth_version, 0) + 1}, synchronize_session=False
+    )
+    invalidate_principal(user_id)
+    # Invalidate again once committed, in case a concurrent request re-cached the old row
+    db.info.setdefault("stale_principals", set()).add(user_id)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_stale_principals(session):
+    for user_id in session.info.pop("stale_principals", ()):
+        invalidate_principal(user_id)
+
+def get_current_claims(payload: Dict[str, Any] = Depends(get_token_payload),
+                       current_user: User = Depends(get_current_user),
+                       db: Session = Depends(get_db)) -> TokenClaims:
+    """
+        Authorization claims for the caller.
+
+        Claims tokens are trusted as long as their version stamp matches the user's
+        auth_version (served from the principal cache); a mismatch means memberships
+        changed and the client must refresh. Plain tokens fall back to the database.
+    """
+    if "ver" not in payload:
+        return TokenClaims(**build_user_claims(db, current_user))
+
+    if payload["ver"] != (current_user.auth_version or 0):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
+                            detail="Token claims are stale, please refresh your token")
+    return TokenClaims(**payload)
+
+async def get_current_user_async(payload: Dict[str, Any] = Depends(get_token_payload),
+                                 db: AsyncSession = Depends(get_async_db)):
+    """get_current_user for routes running on an AsyncSession."""
+    return await db.run_sync(lambda session: get_current_user(payload, session))
+
+async def get_current_claims_async(payload: Dict[str, Any] = Depends(get_token_payload),
+                                   current_user: User = Depends(get_current_user_async),
+                                   db: AsyncSession = Depends(get_async_db)) -> TokenClaims:
+    """get_current_claims for routes running on an AsyncSession."""
+    return await db.run_sync(lambda session: get_current_claims(payload, current_user, session))
@@ -1,4 +1,8 @@
 from passlib.context import CryptContext
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import multiprocessing
+import os
 import random
 from task.routers.send_email import send_email
 import string
@@ -17,6 +21,54 @@ def get_password_hash(password: str) -> str:
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
+HASHING_POOL_WORKERS = int(os.getenv("HASHING_POOL_WORKERS", os.cpu_count() or 1))
+HASHING_MAX_PENDING = int(os.getenv("HASHING_MAX_PENDING", "64"))
+
+class HashingService:
+    """
+        Runs bcrypt in a dedicated process pool so password checks neither hold
+        an AnyIO worker thread nor compete for the GIL with request handling.
+
+        At most max_pending hash/verify calls may be queued or running at once;
+        beyond that callers get a 503 instead of piling up behind the pool.
+    """
+    def __init__(self, workers: int = HASHING_POOL_WORKERS, max_pending: int = HASHING_MAX_PENDING):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn, so workers do not inherit the parent's DB connections or threads
+            self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    async def _submit(self, fn, *args):
+        if self.pending >= self.max_pending:
+            raise HTTPException(status_code=503, detail="Too many authentication requests, please retry",
+                                headers={"Retry-After": "1"})
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self.pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(get_password_hash, password)
+
+    async def verify(self, plain_password, hashed_password) -> bool:
+        return await self._submit(verify_password, plain_password, hashed_password)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+hashing_service = HashingService()
+
 def generate_random_password(length=10) -> str:
     characters = string.ascii_letters + string.digits
     return "".join(random.choices(characters, k=length))
@@ -1,9 +1,11 @@
 from  fastapi import FastAPI, Request, HTTPException
 from fastapi.responses import RedirectResponse
-from .routers import organizations, permissions, users, task, team, dashboard, websockets
+from .routers import organizations, permissions, users, task, team, dashboard, websockets, metrics
+from .routers import async_users, async_task, async_team, async_dashboard
 from . import models
 from .models import User, Task, Team
-from .database import engine
+from .database import engine, async_engine, DATABASE_MODE, THREADPOOL_SIZE
+import anyio.to_thread
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
@@ -13,6 +15,14 @@ from fastapi.responses import HTMLResponse
 from sqlalchemy.orm import Session
 from .database import get_db
 from task.auth import get_current_user
+from task.hashing import hashing_service
+from task.utils.sql_instrumentation import sql_instrumentation_middleware
+from task.routers.dependency import write_stickiness_middleware
+from task.utils.task_archive import task_archiver, ARCHIVE_ENABLED
+from task.utils.revocation import revocation_list
+from task.utils.deadline_scheduler import deadline_scheduler, DEADLINE_REMINDERS_ENABLED
+from task.utils.notification_dispatcher import notification_dispatcher
+from task.utils.websocket_manager import manager as websocket_manager
 app= FastAPI()
 
 # Mount static files
@@ -31,9 +41,47 @@ app.add_middleware(CORSMiddleware,
                    allow_credentials = True,
                    allow_methods =["*"],
                    allow_headers=["*"],
+                   # Response headers the SPA reads: read-your-writes marker, pagination, conditional GET
+                   expose_headers=["X-Last-Write-At", "X-Next-Cursor", "X-Next-Offset", "ETag"],
                    )
+app.middleware("http")(sql_instrumentation_middleware)
+app.middleware("http")(write_stickiness_middleware)
 models.Base.metadata.create_all(bind=engine)
 
+@app.on_event("startup")
+def size_threadpool():
+    # Sync routes run on AnyIO worker threads; match them to the DB connections available
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+
+@app.on_event("startup")
+async def start_notification_dispatcher():
+    notification_dispatcher.start()
+
+@app.on_event("startup")
+async def start_revoked_token_pruning():
+    revocation_list.start()
+
+@app.on_event("startup")
+async def start_task_archiver():
+    if ARCHIVE_ENABLED:
+        task_archiver.start()
+
+@app.on_event("startup")
+async def start_deadline_scheduler():
+    if DEADLINE_REMINDERS_ENABLED:
+        deadline_scheduler.start()
+
+@app.on_event("shutdown")
+async def shutdown_pools():
+    await task_archiver.stop()
+    await revocation_list.stop()
+    await deadline_scheduler.stop()
+    await notification_dispatcher.stop()
+    await websocket_manager.close_all()
+    hashing_service.shutdown()
+    if async_engine is not None:
+        await async_engine.dispose()
+
 @app.get("/register/super_admin")
 def register_super_admin_page(request: Request):
     return templates.TemplateResponse("register_super_admin.html",{"request": request})
@@ -74,10 +122,18 @@ def dashboard_page(request:Request):
 def websocket_page(request:Request):
     return templates.TemplateResponse("websocket_live.html",{"request":request})
 
+if DATABASE_MODE == "async":
+    # Registered first so they take precedence over the sync routes on the same paths
+    app.include_router(async_users.router)
+    app.include_router(async_task.router)
+    app.include_router(async_team.router)
+    app.include_router(async_dashboard.router)
+
 app.include_router(organizations.router)
 app.include_router(users.router)
 app.include_router(permissions.router)
 app.include_router(team.router)
 app.include_router(task.router)
 app.include_router(dashboard.router)
-app.include_router(websockets.router)
\ No newline at end of file
+app.include_router(websockets.router)
+app.include_router(metrics.router)
\ No newline at end of file
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum, DateTime, Boolean, Table
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey, Enum, DateTime, Boolean, Table, Index, JSON, DDL, event, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from task.database import Base
 import enum
 from datetime import datetime
@@ -52,6 +53,7 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     role = Column(String, default="Member")
     organization_id = Column(Integer, ForeignKey("organizations.id", ondelete="CASCADE"), nullable=True)  # FK to Organization
+    auth_version = Column(Integer, nullable=False, default=0, server_default="0")  # Bumped when role/org/teams change
 
     organization = relationship("Organization", back_populates="users", foreign_keys="[User.organization_id]")
     created_tasks = relationship("Task", back_populates="creator", foreign_keys="Task.creator_id")
@@ -90,6 +92,9 @@ class Team(Base):
     tasks = relationship("Task", back_populates="team")
     memberships = relationship("TeamMembership", back_populates="team")
 
+# Full-text document of a task; tasks store it, tasks_archive indexes the expression
+SEARCH_VECTOR_EXPRESSION = "to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, ''))"
+
 class Task(Base):
     __tablename__ = "tasks"
     id = Column(Integer, primary_key=True, index=True)
@@ -105,6 +110,10 @@ class Task(Base):
     creator_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     team_id = Column(Integer, ForeignKey("teams.id", ondelete="CASCADE"), nullable=False)
     organization_id = Column(Integer, ForeignKey("organizations.id"))
+    version = Column(Integer, nullable=False, default=0, server_default="0")  # Bumped by every update; exposed as the ETag
+    # Full-text search document, kept current by the tasks_search_vector_update trigger;
+    # deferred so normal task loads skip it
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
 
     organization = relationship("Organization", back_populates="tasks")
     reviewer = relationship("User", back_populates="review_tasks", foreign_keys=[reviewer_id])
@@ -112,6 +121,33 @@ class Task(Base):
     creator = relationship("User", back_populates="created_tasks", foreign_keys=[creator_id])
     team = relationship("Team", back_populates="tasks")
 
+    # Match the dashboard, sortfilter and organization dashboard predicates
+    __table_args__ = (
+        Index("ix_tasks_assignee_id_status", "assignee_id", "status"),
+        Index("ix_tasks_creator_id", "creator_id"),
+        Index("ix_tasks_reviewer_id", "reviewer_id"),
+        Index("ix_tasks_team_id_status", "team_id", "status"),
+        Index("ix_tasks_organization_id_created_at", "organization_id", "created_at"),
+        Index("ix_tasks_organization_id_deadline", "organization_id", "deadline"),
+        Index("ix_tasks_created_at", "created_at"),
+        Index("ix_tasks_deadline", "deadline"),
+        Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
+# Same trigger as migration d92b3f7c1a58, for databases built by create_all
+event.listen(Task.__table__, "after_create", DDL("""
+    CREATE OR REPLACE FUNCTION tasks_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := to_tsvector('english', coalesce(NEW.title, '') || ' ' || coalesce(NEW.description, ''));
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+""").execute_if(dialect="postgresql"))
+event.listen(Task.__table__, "after_create", DDL("""
+    CREATE TRIGGER tasks_search_vector_update BEFORE INSERT OR UPDATE OF title, description ON tasks
+    FOR EACH ROW EXECUTE FUNCTION tasks_search_vector_update()
+""").execute_if(dialect="postgresql"))
+
 class TeamMembership(Base):
     __tablename__ = "team_memberships"
     id = Column(Integer, primary_key=True, index=True)
@@ -122,4 +158,78 @@ class TeamMembership(Base):
 
     user = relationship("User", back_populates="memberships")
     team = relationship("Team", back_populates="memberships")
-    role = relationship("Role", back_populates="memberships")
\ No newline at end of file
+    role = relationship("Role", back_populates="memberships")
+
+    __table_args__ = (
+        Index("uq_team_memberships_team_id_user_id", "team_id", "user_id", unique=True),
+        Index("ix_team_memberships_user_id", "user_id"),
+    )
+
+class RefreshToken(Base):
+    __tablename__ = "refresh_tokens"
+    jti = Column(String, primary_key=True)
+    family_id = Column(String, nullable=False, index=True)  # Every rotation of one login shares a family
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    expires_at = Column(DateTime, nullable=False)
+    used_at = Column(DateTime, nullable=True)
+    revoked = Column(Boolean, default=False, nullable=False)
+
+    user = relationship("User")
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+    jti = Column(String, primary_key=True)
+    expires_at = Column(DateTime, nullable=False, index=True)  # Rows are pruned once the token would have expired anyway
+    revoked_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+class ChangeCounter(Base):
+    __tablename__ = "change_counters"
+    scope = Column(String, primary_key=True)  # e.g. "org:3", "team:7", "user:42"
+    value = Column(BigInteger, nullable=False, default=0)  # Bumped on writes; dashboards build their ETags from it
+
+class TaskEvent(Base):
+    """Outbox of task changes, written in the same transaction as the change itself."""
+    __tablename__ = "task_events"
+    seq = Column(BigInteger, primary_key=True, autoincrement=True)
+    organization_id = Column(Integer, nullable=True)
+    task_id = Column(Integer, nullable=False)  # No FK: events outlive deleted tasks
+    team_id = Column(Integer, nullable=True)
+    event_type = Column(String, nullable=False)  # created / updated / deleted
+    payload = Column(JSON, nullable=False, default=dict)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("ix_task_events_organization_id_seq", "organization_id", "seq"),
+    )
+
+class TaskArchive(Base):
+    """
+        Cold storage for completed tasks, filled by the background archiver.
+
+        Mirrors the columns of tasks (ids are kept) so archive-aware reads can UNION ALL the
+        two tables. Foreign keys are left out so archived rows never block deletes elsewhere.
+    """
+    __tablename__ = "tasks_archive"
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    title = Column(String, nullable=False)
+    description = Column(String)
+    status = Column(Enum(TaskStatus))
+    priority = Column(Enum(PriorityStatus))
+    deadline = Column(DateTime, nullable=False)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    reviewer_id = Column(Integer, nullable=True)
+    assignee_id = Column(Integer, nullable=True)
+    creator_id = Column(Integer, nullable=False)
+    team_id = Column(Integer, nullable=False)
+    organization_id = Column(Integer)
+    version = Column(Integer, nullable=False, default=0)
+    archived_at = Column(DateTime, nullable=False, server_default=text("(now() at time zone 'utc')"))
+
+    __table_args__ = (
+        Index("ix_tasks_archive_organization_id_created_at", "organization_id", "created_at"),
+        Index("ix_tasks_archive_assignee_id", "assignee_id"),
+        Index("ix_tasks_archive_creator_id", "creator_id"),
+        Index("ix_tasks_archive_reviewer_id", "reviewer_id"),
+        Index("ix_tasks_archive_search_vector", text(SEARCH_VECTOR_EXPRESSION), postgresql_using="gin"),
+    )
@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_async_db
+from ..models import User
+from ..auth import get_current_user_async, get_current_claims_async
+from ..schemas import TokenClaims
+from . import dashboard as sync_dashboard
+
+"""
+    AsyncSession versions of the dashboard routes, used when DATABASE_MODE=async.
+"""
+router = APIRouter(tags=["Dashboard"])
+
+@router.get("/dashboard/user-dashboard")
+async def user_dashboard_async(request: Request, response: Response, include_archived: bool = Query(False),
+                               db: AsyncSession = Depends(get_async_db),
+                               current_user: User = Depends(get_current_user_async)):
+    return await db.run_sync(
+        lambda session: sync_dashboard.user_dashboard(request, response, include_archived, session, current_user)
+    )
+
+@router.get("/dashboard/admin-dashboard")
+async def admin_dashboard_async(db: AsyncSession = Depends(get_async_db),
+                                current_user: User = Depends(get_current_user_async),
+                                claims: TokenClaims = Depends(get_current_claims_async)):
+    return await db.run_sync(lambda session: sync_dashboard.admin_dashboard(session, current_user, claims))
+
+@router.get("/dashboard/team-dashboard/{team_id}")
+async def team_dashboard_async(team_id: int, request: Request, response: Response,
+                               db: AsyncSession = Depends(get_async_db),
+                               current_user: User = Depends(get_current_user_async),
+                               claims: TokenClaims = Depends(get_current_claims_async)):
+    return await db.run_sync(lambda session: sync_dashboard.team_dashboard(team_id, request, response, session, current_user, claims))
+
+@router.get("/organization/dashboard")
+async def dashboard_page_async(request: Request, response: Response, db: AsyncSession = Depends(get_async_db),
+                               current_user: User = Depends(get_current_user_async)):
+    return await db.run_sync(lambda session: sync_dashboard.dashboard_page(request, response, session, current_user))
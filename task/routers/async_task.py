@@ -0,0 +1,87 @@
+from fastapi import APIRouter, Depends, Header, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from task.models import User
+from task.schemas import TaskCreate, TaskOut, BulkTaskCreateResponse, TaskResponse, TaskUpdateRequest, TaskBulkUpdateRequest, BulkTaskUpdateResponse, DeleteTaskRequest, TaskResponseSchema, TaskSearchResult, TaskChangesResponse, TokenClaims
+from task.database import get_async_db
+from task.auth import get_current_user_async, get_current_claims_async
+from task.utils.notification_dispatcher import notification_dispatcher
+from task.utils.etag import make_etag
+from task.utils.task_events import TASK_CHANGES_MAX_LIMIT
+from task.utils.task_filters import TaskListQuery, SEARCH_MAX_LIMIT, SEARCH_MAX_OFFSET
+from task.routers import task as sync_task
+from typing import List, Optional
+
+"""
+    AsyncSession versions of the task routes, used when DATABASE_MODE=async.
+    Each route runs the shared handler logic through AsyncSession.run_sync, so the
+    queries go through the async driver and never block the event loop.
+"""
+router = APIRouter(tags=['Task'])
+
+@router.post("/task/{team_id}/create-task", response_model=TaskOut)
+async def create_task_async(team_id: int, task_data: TaskCreate,
+                            db: AsyncSession = Depends(get_async_db),
+                            current_user: User = Depends(get_current_user_async)):
+    return await db.run_sync(lambda session: sync_task.create_task(team_id, task_data, session, current_user))
+
+@router.post("/task/{team_id}/bulk-create", response_model=BulkTaskCreateResponse)
+async def bulk_create_tasks_async(team_id: int, tasks_data: List[TaskCreate],
+                                  db: AsyncSession = Depends(get_async_db),
+                                  current_user: User = Depends(get_current_user_async)):
+    return await db.run_sync(lambda session: sync_task.bulk_create_tasks(team_id, tasks_data, session, current_user))
+
+@router.put("/task/{team_id}/update-task", response_model=TaskResponse)
+async def update_task_async(team_id: int, request: TaskUpdateRequest, response: Response,
+                            if_match: Optional[str] = Header(None),
+                            db: AsyncSession = Depends(get_async_db),
+                            current_user: User = Depends(get_current_user_async)):
+    task, notification_messages = await db.run_sync(
+        lambda session: sync_task.apply_task_update(team_id, request, session, current_user, if_match)
+    )
+    response.headers["ETag"] = make_etag(task["id"], task["version"])
+    notification_dispatcher.notify((notif["users"], notif["message"]) for notif in notification_messages)
+    return task
+
+@router.put("/task/bulk-update", response_model=BulkTaskUpdateResponse)
+async def bulk_update_tasks_async(request: TaskBulkUpdateRequest,
+                                  db: AsyncSession = Depends(get_async_db),
+                                  current_user: User = Depends(get_current_user_async)):
+    result, notifications = await db.run_sync(
+        lambda session: sync_task.apply_bulk_task_update(request, session, current_user)
+    )
+    notification_dispatcher.notify(([user_id], message) for user_id, message in notifications.items())
+    return result
+
+@router.delete("/task/{team_id}/delete-task")
+async def delete_task_async(team_id: int, request: DeleteTaskRequest,
+                            db: AsyncSession = Depends(get_async_db),
+                            current_user: User = Depends(get_current_user_async),
+                            claims: TokenClaims = Depends(get_current_claims_async)):
+    return await db.run_sync(lambda session: sync_task.delete_task(team_id, request, session, current_user, claims))
+
+@router.get("/task/sortfilter", response_model=List[TaskResponseSchema])
+async def sortfilter_async(request: Request, response: Response,
+                           db: AsyncSession = Depends(get_async_db),
+                           filters: TaskListQuery = Depends(),
+                           current_user: User = Depends(get_current_user_async)):
+    return await db.run_sync(lambda session: sync_task.sortfilter(request, response, session, filters, current_user))
+
+@router.get("/task/search", response_model=List[TaskSearchResult])
+async def search_async(response: Response,
+                       q: str = Query(..., min_length=1, max_length=200),
+                       team_id: Optional[List[int]] = Query(None),
+                       limit: int = Query(20, ge=1, le=SEARCH_MAX_LIMIT),
+                       offset: int = Query(0, ge=0, le=SEARCH_MAX_OFFSET),
+                       include_archived: bool = Query(False),
+                       db: AsyncSession = Depends(get_async_db),
+                       current_user: User = Depends(get_current_user_async)):
+    return await db.run_sync(
+        lambda session: sync_task.search(response, q, team_id, limit, offset, include_archived, session, current_user)
+    )
+
+@router.get("/task/changes", response_model=TaskChangesResponse)
+async def task_changes_async(since: int = Query(0, ge=0),
+                             limit: int = Query(500, ge=1, le=TASK_CHANGES_MAX_LIMIT),
+                             db: AsyncSession = Depends(get_async_db),
+                             current_user: User = Depends(get_current_user_async)):
+    return await db.run_sync(lambda session: sync_task.task_changes(since, limit, session, current_user))
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..schemas import TeamCreate, TeamMemberAddRequest, ResponseMessage, TeamRemoveMember
+from ..database import get_async_db
+from ..auth import get_current_user_async
+from ..models import User
+from . import team as sync_team
+
+"""
+    AsyncSession versions of the team routes, used when DATABASE_MODE=async.
+"""
+router = APIRouter(tags=['Team'])
+
+@router.post("/team-create")
+async def create_team_async(team: TeamCreate, db: AsyncSession = Depends(get_async_db),
+                            current_user: User = Depends(get_current_user_async)):
+    return await db.run_sync(lambda session: sync_team.create_team(team, session, current_user))
+
+@router.post("/team/{team_id}/add-member", response_model=ResponseMessage)
+async def add_team_member_async(team_id: int, request: TeamMemberAddRequest,
+                                db: AsyncSession = Depends(get_async_db),
+                                current_user: User = Depends(get_current_user_async)):
+    return await db.run_sync(lambda session: sync_team.add_team_member(team_id, request, session, current_user))
+
+@router.delete("/team/{team_id}/remove-member", response_model=ResponseMessage)
+async def remove_member_async(team_id: int, request: TeamRemoveMember,
+                              db: AsyncSession = Depends(get_async_db),
+                              current_user: User = Depends(get_current_user_async)):
+    return await db.run_sync(lambda session: sync_team.remove_member(team_id, request, session, current_user))
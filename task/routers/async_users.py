@@ -0,0 +1,120 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from typing import Any, Dict
+from ..schemas import UserOut, UserCreate, UserLogin, Token, RoleCreateRequest, SuperUserCreate, TokenRefreshRequest
+from ..hashing import hashing_service
+from ..auth import get_current_user_async, get_token_payload
+from ..models import User, UserRole, Organization
+from ..database import get_async_db
+from ..utils.change_counters import bump_change_counters
+from .invite import send_invite_email
+from . import users as sync_users
+
+"""
+    AsyncSession versions of the user routes, used when DATABASE_MODE=async.
+    Password checks still go through the hashing process pool.
+"""
+router = APIRouter(tags=["User"])
+
+async def authenticate(db: AsyncSession, user: UserLogin) -> User:
+    db_user = await db.scalar(select(User).where(User.email == user.email))
+    if not db_user or not await hashing_service.verify(user.password, db_user.hashed_password):
+        raise HTTPException(status_code=400, detail="Invalid credentials")
+    return db_user
+
+@router.post("/register/super_admin")
+async def register_super_admin_async(user: SuperUserCreate, db: AsyncSession = Depends(get_async_db)):
+    if await db.scalar(select(User.id).where(User.email == user.email)):
+        raise HTTPException(status_code=400, detail="Email already registered")
+
+    super_admin = User(
+        email=user.email,
+        hashed_password=await hashing_service.hash(user.password),
+        role="super_admin"
+    )
+    db.add(super_admin)
+    await db.commit()
+
+    return {"message": "Super Admin registered successfully", "email": super_admin.email}
+
+@router.post("/register", response_model=UserOut)
+async def register_async(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    try:
+        if not await db.scalar(select(Organization.id).where(Organization.id == user.organization_id)):
+            raise HTTPException(status_code=404, detail="Organization not found")
+
+        # Determine role (First user = Admin, others = Member)
+        existing_users = await db.scalar(select(func.count(User.id)).where(User.organization_id == user.organization_id))
+        role = "admin" if existing_users == 0 else "member"
+
+        if await db.scalar(select(User.id).where(User.email == user.email)):
+            raise HTTPException(status_code=400, detail="Email already registered")
+
+        new_user = User(
+            email=user.email,
+            hashed_password=await hashing_service.hash(user.password),
+            role=role,
+            organization_id=user.organization_id
+        )
+        db.add(new_user)
+        await db.run_sync(bump_change_counters, [f"org:{user.organization_id}"])
+        await db.commit()
+        await db.refresh(new_user)
+
+        await run_in_threadpool(send_invite_email, user.email, user.password)
+        print("Invitation sent")
+
+        return new_user
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/super_admin_login", response_model=Token)
+async def super_admin_login_async(user: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    db_user = await authenticate(db, user)
+    if db_user.role != "super_admin":
+        raise HTTPException(status_code=403, detail="Access denied. Super Admins only.")
+    access_token, refresh_token = await db.run_sync(lambda session: sync_users.issue_login_tokens(session, db_user))
+
+    return {"message": "success", "access_token": access_token,
+            "refresh_token": refresh_token, "token_type": "bearer", "role": db_user.role}
+
+@router.post("/login", response_model=Token)
+async def login_async(user: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    db_user = await authenticate(db, user)
+    access_token, refresh_token = await db.run_sync(lambda session: sync_users.issue_login_tokens(session, db_user))
+
+    return {"message": "success", "access_token": access_token,
+            "refresh_token": refresh_token, "token_type": "bearer"}
+
+@router.post("/admin/login")
+async def admin_login_async(user: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    db_user = await authenticate(db, user)
+    if db_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Access denied. Admins only.")
+    access_token, refresh_token = await db.run_sync(lambda session: sync_users.issue_login_tokens(session, db_user))
+
+    return {"message": "success", "access_token": access_token,
+            "refresh_token": refresh_token, "token_type": "bearer"}
+
+@router.post("/token/refresh", response_model=Token)
+async def refresh_access_token_async(request: TokenRefreshRequest, db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(lambda session: sync_users.refresh_access_token(request, session))
+
+@router.post("/logout")
+async def logout_async(payload: Dict[str, Any] = Depends(get_token_payload), db: AsyncSession = Depends(get_async_db),
+                       current_user: User = Depends(get_current_user_async)):
+    return await db.run_sync(lambda session: sync_users.logout(payload, session, current_user))
+
+@router.post("/roles")
+async def create_role_async(role_request: RoleCreateRequest, role_name: UserRole, db: AsyncSession = Depends(get_async_db),
+                            current_user: User = Depends(get_current_user_async)):
+    return await db.run_sync(lambda session: sync_users.create_role(role_request, role_name, session, current_user))
+
+@router.get("/users")
+async def get_users_async(db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
+    return await db.run_sync(lambda session: sync_users.get_users(session, current_user))
@@ -1,17 +1,22 @@
-from fastapi import APIRouter, status, Depends, HTTPException
+from fastapi import APIRouter, status, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from ..database import get_db
+from .dependency import get_read_db
 from fastapi.templating import Jinja2Templates
 from ..models import User, Task, Team, TaskStatus, TeamMembership
-from ..auth import get_current_user
-from ..schemas import UserOut
+from ..auth import get_current_user, get_current_claims
+from ..schemas import UserOut, TokenClaims
+from ..utils.change_counters import check_not_modified, read_change_counter
+from ..utils.task_archive import tasks_with_archive
 from fastapi.responses import HTMLResponse
 
 router = APIRouter(tags=["Dashboard"])
 templates = Jinja2Templates(directory="task/templates")
 
 @router.get("/dashboard/user-dashboard")
-def user_dashboard(db: Session = Depends(get_db), 
+def user_dashboard(request: Request, response: Response,
+        include_archived: bool = Query(False, description="Also list archived tasks"),
+        db: Session = Depends(get_read_db), 
         current_user: User = Depends(get_current_user)):
     
     """
@@ -19,12 +24,20 @@ def user_dashboard(db: Session = Depends(get_db),
         Retrieves the user dashboard with an overview of tasks.
         Method: GET
         Response: All the records shows from assigned tasks, created tasks, review tasks.
+                  Archived tasks are left out unless include_archived=true.
+                  Carries an ETag; If-None-Match with the current one answers 304.
     """
-    assigned_tasks = db.query(Task).filter(Task.assignee_id == current_user.id).all()
+    not_modified = check_not_modified(request, response, "user", current_user.id,
+                                      read_change_counter(db, f"user:{current_user.id}"))
+    if not_modified:
+        return not_modified
 
-    created_tasks = db.query(Task).filter(Task.creator_id == current_user.id).all()
+    tasks = tasks_with_archive() if include_archived else Task
+    assigned_tasks = db.query(tasks).filter(tasks.assignee_id == current_user.id).all()
 
-    review_tasks = db.query(Task).filter(Task.reviewer_id == current_user.id).all()
+    created_tasks = db.query(tasks).filter(tasks.creator_id == current_user.id).all()
+
+    review_tasks = db.query(tasks).filter(tasks.reviewer_id == current_user.id).all()
 
 
     dashboard_data = {
@@ -40,8 +53,9 @@ def user_dashboard(db: Session = Depends(get_db),
 
 
 @router.get("/dashboard/admin-dashboard")
-def admin_dashboard(db:Session = Depends(get_db), 
-        current_user: User = Depends(get_current_user)
+def admin_dashboard(db: Session = Depends(get_read_db), 
+        current_user: User = Depends(get_current_user),
+        claims: TokenClaims = Depends(get_current_claims)
     ):
     """
     Retrieves the admin dashboard with an overview of tasks, users, and teams.
@@ -51,8 +65,7 @@ def admin_dashboard(db:Session = Depends(get_db),
     Response: Total counts of tasks, users, and teams.
               Recent tasks, users, and teams (latest 5 records).
     """
-    team_membership = (db.query(TeamMembership).filter( TeamMembership.user_id == current_user.id).first())
-    if team_membership.role.role_name != "admin":
+    if "admin" not in claims.teams.values():
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, 
                                 detail="you do not have permission to access.")
     
@@ -81,8 +94,9 @@ def admin_dashboard(db:Session = Depends(get_db),
 
 
 @router.get("/dashboard/team-dashboard/{team_id}")
-def team_dashboard(team_id: int, db:Session = Depends(get_db), 
-        current_user: User = Depends(get_current_user)
+def team_dashboard(team_id: int, request: Request, response: Response, db: Session = Depends(get_read_db), 
+        current_user: User = Depends(get_current_user),
+        claims: TokenClaims = Depends(get_current_claims)
     ):
     """
         Retrieves the team dashboard with an overview of tasks assigned to the current user.
@@ -91,25 +105,25 @@ def team_dashboard(team_id: int, db:Session = Depends(get_db),
         Method: GET
         Path Parameter: team_id (int): The ID of the team whose dashboard is being accessed.
         Response: Lists all tasks assigned to the user within the specified team.
+                  Carries an ETag; If-None-Match with the current one answers 304.
 
     """
     # breakpoint()
     user_id = current_user.id
-    team = db.query(Team).filter(Team.id == team_id).first()
-    if not team:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Team not found")
-
-    is_member = (
-        db.query(TeamMembership)
-        .filter(TeamMembership.team_id == team_id, TeamMembership.user_id == current_user.id)
-        .first()
-    )
-
-    if not is_member:
+    # Membership comes from the token claims; the team table is only consulted to tell 404 from 403
+    if str(team_id) not in claims.teams:
+        team = db.query(Team).filter(Team.id == team_id).first()
+        if not team:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Team not found")
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, 
             detail="You are not a member of this team"
         )
+
+    not_modified = check_not_modified(request, response, "team", team_id, "user", user_id,
+                                      read_change_counter(db, f"user:{user_id}"))
+    if not_modified:
+        return not_modified
     
     all_assigned_tasks = db.query(Task).filter(Task.assignee_id == user_id).all()
     in_assigned_tasks = db.query(Task).filter(Task.assignee_id == user_id, Task.status == TaskStatus.IN_PROGRESS).all()
@@ -125,11 +139,18 @@ def team_dashboard(team_id: int, db:Session = Depends(get_db),
 
 
 @router.get("/organization/dashboard",)
-async def dashboard_page(db:Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def dashboard_page(request: Request, response: Response, db: Session = Depends(get_read_db),
+                   current_user: User = Depends(get_current_user)):
     # Ensure that the user has an organization_id and is the admin of that organization
     if not current_user.organization_id:
         raise HTTPException(status_code=403, detail="User not part of any organization")
 
+    # The org counter moves whenever a task, team or member of the organization changes
+    not_modified = check_not_modified(request, response, "org", current_user.organization_id,
+                                      read_change_counter(db, f"org:{current_user.organization_id}"))
+    if not_modified:
+        return not_modified
+
     # Fetch data for the current user's organization
     # Users, tasks, and teams are all filtered by the organization_id of the logged-in user
     users = db.query(User).filter(User.organization_id == current_user.organization_id).all()
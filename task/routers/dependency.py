@@ -1,17 +1,53 @@
-from fastapi import Depends, HTTPException
+import math
+from fastapi import Depends, HTTPException, Request
 from sqlalchemy.orm import Session
-from task.database import get_db
+from task.database import get_db, ReadSessionLocal, read_engine, engine, write_stickiness
 from task.models import User
-from task.auth import get_current_user  # Your authentication function
+from task.schemas import TokenClaims
+from task.auth import get_current_user, get_current_claims  # Your authentication function
 
-def is_admin(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.id == current_user.id).first()
-    if not user or user.role != "Admin":
+def is_admin(current_user: User = Depends(get_current_user), claims: TokenClaims = Depends(get_current_claims)):
+    if (claims.role or "").lower() != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
     return current_user
 
-def is_super_admin(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.id == current_user.id).first()
-    if not user or user.role != "Super_Admin":
+def is_super_admin(current_user: User = Depends(get_current_user), claims: TokenClaims = Depends(get_current_claims)):
+    if (claims.role or "").lower() != "super_admin":
         raise HTTPException(status_code=403, detail="Not authorized")
-    return current_user
\ No newline at end of file
+    return current_user
+
+def reads_from_primary(request: Request) -> bool:
+    """Whether this request's reads must see the primary: no replica, a recent write, or asked for."""
+    return (read_engine is engine
+            or request.headers.get("X-Read-Consistency") == "primary"
+            or write_stickiness.is_sticky(write_stickiness.request_marker(request)))
+
+def get_read_db(request: Request, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    """
+        Session for read-only endpoints, served by the read replica.
+
+        Falls back to the primary session when no replica is configured, when the
+        client committed a write within READ_STICKINESS_SECONDS (the last_write_at
+        cookie or X-Last-Write-At header), or when it asks for it with the header
+        "X-Read-Consistency: primary".
+    """
+    if reads_from_primary(request):
+        yield db
+        return
+
+    read_db = ReadSessionLocal()
+    try:
+        yield read_db
+    finally:
+        read_db.close()
+
+async def write_stickiness_middleware(request: Request, call_next):
+    """Hand the time of a committed write back to the client, for whichever worker serves its next read."""
+    response = await call_next(request)
+    last_write_at = getattr(request.state, "last_write_at", None)
+    if last_write_at is not None:
+        marker = write_stickiness.marker(last_write_at)
+        response.headers[write_stickiness.header] = marker
+        response.set_cookie(write_stickiness.cookie, marker, max_age=math.ceil(write_stickiness.window),
+                            httponly=True, samesite="lax")
+    return response
@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends
+from task.models import User
+from task.routers.dependency import is_admin
+from task.utils.pool_metrics import pool_metrics
+from task.utils.notification_dispatcher import notification_dispatcher
+from task.utils.websocket_manager import manager
+
+router = APIRouter(tags=["Metrics"])
+
+@router.get("/metrics/db-pool")
+def db_pool_metrics(current_admin: User = Depends(is_admin)):
+    """
+        Connection pool health for every engine.
+
+        Access: Admin only.
+        Method: GET
+        Response: Per pool, the configured size, connections checked out / idle / in overflow,
+                  total checkouts, checkout timeouts and a histogram of checkout wait times.
+    """
+    return {name: metrics.snapshot() for name, metrics in pool_metrics.items()}
+
+@router.get("/metrics/notifications")
+def notification_metrics(current_admin: User = Depends(is_admin)):
+    """
+        WebSocket notification dispatcher health.
+
+        Access: Admin only.
+        Method: GET
+        Response: Worker count, current queue depth and capacity, items enqueued, dispatched
+                  and dropped, connections the messages were queued on or refused by, and
+                  the average and maximum time items waited in the queue.
+    """
+    return notification_dispatcher.snapshot()
+
+@router.get("/metrics/websockets")
+async def websocket_metrics(current_admin: User = Depends(is_admin)):
+    """
+        WebSocket connection and outbound queue health.
+
+        Runs on the event loop, like the connection writers, so the registry is read
+        between their updates rather than from a worker thread.
+
+        Access: Admin only.
+        Method: GET
+        Response: Connected users and connections, the overflow policy and per-connection
+                  queue size, messages queued right now and the deepest queue, and totals of
+                  messages sent, dropped by the overflow policy or a disconnect, and
+                  connections evicted.
+    """
+    return manager.snapshot()
@@ -3,10 +3,11 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from task.schemas import OrganizationCreate
 from sqlalchemy.orm import Session
 from task.models import User
-from task.auth import get_current_user
+from task.auth import get_current_user, bump_auth_version
 from task.database import get_db
 from task.routers.dependency import is_admin,is_super_admin
 from task.models import Organization
+from task.utils.change_counters import bump_change_counters
 
 router = APIRouter(tags=['Organization'])
 
@@ -40,6 +41,9 @@ def assign_user_to_org(org_id: int, user_id: int, db: Session = Depends(get_db),
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    previous_org_id = user.organization_id
     user.organization_id = org_id
+    bump_auth_version(db, user.id)
+    bump_change_counters(db, [f"org:{org_id}", f"org:{previous_org_id}"])
     db.commit()
     return {"message": "User assigned to organization"}
@@ -4,7 +4,7 @@ from task.models import Permission, User, TeamMembership
 from task.schemas import PermissionSchema
 from task.routers.dependency import is_admin
 from task.database import get_db
-from task.auth import get_current_user
+from task.auth import get_current_user, invalidate_principal
 
 router = APIRouter()
 
@@ -86,5 +86,6 @@ def assign_permission(
         db.add(new_permission)
 
     db.commit()
+    invalidate_principal(request.user_id)
     return {"message": "Permissions assigned successfully"}
 
@@ -1,13 +1,34 @@
-from fastapi import APIRouter, HTTPException, status, Depends ,Query
+import io
+import logging
+import os
+from fastapi import APIRouter, HTTPException, status, Depends ,Query, Request, Response, Header, UploadFile, File
+from collections import defaultdict
+from sqlalchemy import Integer, any_, bindparam, insert, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from task.models import Task, Team, TeamMembership, User
-from task.schemas import TaskCreate, TaskOut, TaskResponse, TaskUpdateRequest, DeleteTaskRequest, TaskResponseSchema
+from task.models import Task, Team, TeamMembership, User, Organization
+from task.schemas import TaskCreate, TaskOut, BulkTaskCreateResponse, TaskResponse, TaskUpdateRequest, TaskBulkUpdateRequest, BulkTaskUpdateResponse, DeleteTaskRequest, TaskResponseSchema, TaskSearchResult, TaskChangesResponse, TaskImportReport, TokenClaims
 from task.database import get_db
-from task.auth import get_current_user
-from typing import List, Optional
-from task.utils.websocket_manager import manager
+from task.auth import get_current_user, get_current_claims
+from typing import List, Optional, Literal
+from task.utils.notification_dispatcher import notification_dispatcher
 from task.routers.permissions import check_user_permission
+from task.routers.dependency import get_read_db, is_admin, reads_from_primary
+from starlette.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from task.utils.task_export import export_csv, export_ndjson
+from task.utils.task_import import import_tasks
+from task.utils.deadline_scheduler import deadline_scheduler
+from task.utils.etag import make_etag, parse_task_etag
+from task.utils.change_counters import bump_change_counters, task_scopes, check_not_modified, read_change_counter
+from task.utils.task_events import task_event, record_task_events, read_task_changes, TASK_CHANGES_MAX_LIMIT
+from task.utils.task_filters import TaskListQuery, list_tasks, search_tasks, SEARCH_MAX_LIMIT, SEARCH_MAX_OFFSET
 router = APIRouter(tags=['Task'])
+logger = logging.getLogger("task.import")
+
+BULK_TASK_LIMIT = int(os.getenv("BULK_TASK_LIMIT", "1000"))
+IMPORT_REJECTS_RETURNED = 1000
 
 @router.post("/task/{team_id}/create-task", response_model=TaskOut)
 def create_task(
@@ -65,13 +86,110 @@ def create_task(
     )
 
     db.add(new_task)
+    db.flush()
+    record_task_events(db, [task_event("created", new_task.id, team_id, task_data.organization_id,
+                                       task_data.model_dump())])
+    bump_change_counters(db, task_scopes(task_data.organization_id, team_id,
+                                         (user_id, task_data.assignee_id, task_data.reviewer_id)))
     db.commit()
     db.refresh(new_task)
+    deadline_scheduler.schedule(new_task.id, new_task.deadline, new_task.title, new_task.status,
+                                (user_id, new_task.assignee_id, new_task.reviewer_id))
 
     return new_task
+
+
+@router.post("/task/{team_id}/bulk-create", response_model=BulkTaskCreateResponse)
+def bulk_create_tasks(
+    team_id: int,
+    tasks_data: List[TaskCreate],
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)):
+    """
+        Create many tasks in a team with one INSERT and one commit.
+
+        Each item is checked the same way create_task checks a single task: the title must
+        not already exist (or appear earlier in the batch) and referenced users and
+        organizations must exist. Items that fail are reported and skipped; the rest are
+        created.
+
+        Method: POST
+        Request Body: A list of tasks, at most BULK_TASK_LIMIT items.
+        Response: The created tasks with the index of their item, and the errors with the
+                  index of the failing item.
+        Permissions: Only admins can create tasks.
+    """
+    if len(tasks_data) > BULK_TASK_LIMIT:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            detail=f"At most {BULK_TASK_LIMIT} tasks per request")
+    team = db.query(Team).filter(Team.id == team_id).first()
+    if not team:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Team not found")
+    if current_user.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="you do not have permission to edit this task")
+
+    # One query per lookup for the whole batch
+    titles = {item.title for item in tasks_data}
+    existing_titles = set(db.scalars(select(Task.title).where(Task.title.in_(titles)))) if titles else set()
+    user_ids = {user_id for item in tasks_data for user_id in (item.assignee_id, item.reviewer_id) if user_id is not None}
+    known_users = set(db.scalars(select(User.id).where(User.id.in_(user_ids)))) if user_ids else set()
+    organization_ids = {item.organization_id for item in tasks_data}
+    known_organizations = set(db.scalars(select(Organization.id).where(Organization.id.in_(organization_ids))))
+
+    rows, row_indexes, errors = [], [], []
+    for index, item in enumerate(tasks_data):
+        if item.title in existing_titles:
+            errors.append({"index": index, "title": item.title, "detail": "Task with this title already exists."})
+            continue
+        missing_user = next((user_id for user_id in (item.assignee_id, item.reviewer_id)
+                             if user_id is not None and user_id not in known_users), None)
+        if missing_user is not None:
+            errors.append({"index": index, "title": item.title, "detail": f"User {missing_user} not found"})
+            continue
+        if item.organization_id not in known_organizations:
+            errors.append({"index": index, "title": item.title, "detail": "Organization not found"})
+            continue
+        existing_titles.add(item.title)
+        rows.append({
+            "title": item.title,
+            "description": item.description,
+            "status": item.status,
+            "priority": item.priority,
+            "deadline": item.deadline,
+            "creator_id": current_user.id,
+            "team_id": team_id,
+            "reviewer_id": item.reviewer_id,
+            "assignee_id": item.assignee_id,
+            "organization_id": item.organization_id,
+        })
+        row_indexes.append(index)
+
+    created = []
+    if rows:
+        # Multi-row INSERT ... RETURNING; SQLAlchemy batches it into as few round trips as the driver allows
+        statement = insert(Task).returning(
+            Task.id, Task.title, Task.description, Task.status, Task.priority, Task.deadline, Task.creator_id,
+            Task.team_id, Task.reviewer_id, Task.assignee_id, Task.organization_id, sort_by_parameter_order=True,
+        )
+        created = [dict(row) for row in db.execute(statement, rows).mappings()]
+        record_task_events(db, [task_event("created", task["id"], team_id, task["organization_id"],
+                                           {field: value for field, value in task.items() if field != "id"})
+                                for task in created])
+        scopes = set()
+        for row in rows:
+            scopes |= task_scopes(row["organization_id"], team_id, (row["creator_id"], row["assignee_id"], row["reviewer_id"]))
+        bump_change_counters(db, scopes)
+        db.commit()
+        for task in created:
+            deadline_scheduler.schedule(task["id"], task["deadline"], task["title"], task["status"],
+                                        (task["creator_id"], task["assignee_id"], task["reviewer_id"]))
+
+    # RETURNING rows come back in parameter order (sort_by_parameter_order), i.e. the order of row_indexes
+    return {"created": [{**task, "index": index} for task, index in zip(created, row_indexes)], "errors": errors}
     
 @router.put("/task/{team_id}/update-task", response_model=TaskResponse)
-async def update_task(team_id: int, request: TaskUpdateRequest, 
+async def update_task(team_id: int, request: TaskUpdateRequest, response: Response,
+                      if_match: Optional[str] = Header(None),
                       db: Session = Depends(get_db),
                       current_user: User = Depends(get_current_user)):
     """
@@ -82,104 +200,229 @@ async def update_task(team_id: int, request: TaskUpdateRequest,
         or have a manager role in the team.
         
         Method: PUT
-        Response: Returns the updated task details.
+        Headers: If-Match (optional): the ETag the client last saw. The update only applies
+                 if the task has not changed since.
+        Response: Returns the updated task details, with the new version in the ETag header.
         Permissions: Only the assignee, reviewer, or users with a 'manager' role can update the task.
         Error Handling: If the team or task does not exist, a 404 error is returned.
                         If the user is not part of the team or lacks the necessary permissions, 
                         a 403 error is returned.
                         If the assignee provided is invalid, a 404 error is returned.
-        Real-Time Notifications: Sends WebSocket notifications to team members 
-                                 if task assignee or status changes.
+                        If If-Match does not match the current version, a 412 error is returned.
+        Real-Time Notifications: Queues WebSocket notifications to team members 
+                                 if task assignee or status changes; they are sent
+                                 after the response by the notification dispatcher.
     """
-    
-    current_user_id = current_user.id 
-    team = db.query(Team).filter(Team.id == team_id).first()
-    if not team:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Team not found")
-    
-    task = db.query(Task).filter(Task.id == request.task_id).first()
-    if not task:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
-    
-    if task.team_id != team.id:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="The task does not belong to the specified team.")
-    
-    # team_membership = db.query(TeamMembership).filter(
-    #     TeamMembership.team_id == team.id, 
-    #     TeamMembership.user_id == current_user_id
-    # ).first()
-
-    # if not team_membership:
-    #     raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You are not a member of this team")
-
-    # if (
-    #     current_user_id != task.assignee_id and 
-    #     current_user_id != task.reviewer_id and
-    #     team_membership.role.role_name != "manager"
-    # ):
-    #     raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You do not have permission to edit this task")
-
-    check_user_permission(current_user_id,db)
-    # Store old values before updating
-    old_assignee = task.assignee_id
-    old_status = task.status
-    # task.assignee_id = task_data.assignee_id
-    # task.status = task_data.status
+    # The database work runs in the threadpool so it does not block the event loop
+    task, notification_messages = await run_in_threadpool(apply_task_update, team_id, request, db, current_user, if_match)
+    response.headers["ETag"] = make_etag(task["id"], task["version"])
+
+    # Delivered by the dispatcher's workers; the response does not wait for any socket
+    notification_dispatcher.notify((notif["users"], notif["message"]) for notif in notification_messages)
+
+    return task
+
+
+def apply_task_update(team_id: int, request: TaskUpdateRequest, db: Session, current_user: User,
+                      if_match: Optional[str] = None):
+    """
+        Validate and apply a task update, returning the task and the notifications to send.
+        Shared by the sync and async-session update_task routes.
+
+        The update is a single UPDATE ... RETURNING: a locking CTE captures the old assignee
+        and status for the notifications, and the version check rides in its WHERE clause.
+    """
+    expected_version = None
+    if if_match:
+        try:
+            expected_version = parse_task_etag(if_match, request.task_id)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED,
+                                detail="Task has been modified, reload it and retry")
+
+    check_user_permission(current_user.id, db)
 
     # Update Task Fields
+    values = {"priority": request.priority, "status": request.status, "version": Task.version + 1}
     if request.description:
-        task.description = request.description
-    if request.priority:
-        task.priority = request.priority
-    if request.status:
-        task.status = request.status  # Allow updating status
+        values["description"] = request.description
     if request.assignee_id:
-        assignee = db.query(User).filter(User.id == request.assignee_id).first()
-        if not assignee:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Assignee not found")
-        task.assignee_id = assignee.id
+        values["assignee_id"] = request.assignee_id
 
+    conditions = [Task.id == request.task_id, Task.team_id == team_id]
+    if expected_version is not None:
+        conditions.append(Task.version == expected_version)
+    old = select(Task.id, Task.assignee_id, Task.status).where(*conditions).with_for_update().cte("old")
+    statement = (update(Task)
+                 .where(Task.id == old.c.id)
+                 .values(**values)
+                 .returning(Task.id, Task.title, Task.description, Task.status, Task.priority, Task.assignee_id,
+                            Task.reviewer_id, Task.creator_id, Task.team_id, Task.organization_id, Task.version,
+                            Task.deadline, old.c.assignee_id.label("old_assignee_id"), old.c.status.label("old_status"))
+                 .execution_options(synchronize_session=False))
+    try:
+        task = db.execute(statement).mappings().first()
+    except IntegrityError:
+        # The only foreign key the update can set is the assignee
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Assignee not found")
+    if task is None:
+        db.rollback()
+        raise_task_update_miss(db, team_id, request.task_id)
+    task = dict(task)
+    old_assignee = task.pop("old_assignee_id")
+    old_status = task.pop("old_status")
+    deadline = task.pop("deadline")
+    record_task_events(db, [task_event("updated", task["id"], task["team_id"], task["organization_id"],
+                                       {field: task[field] for field in values})])
+    bump_change_counters(db, task_scopes(task["organization_id"], task["team_id"],
+                                         (old_assignee, task["assignee_id"], task["reviewer_id"], task["creator_id"])))
     db.commit()
-    db.refresh(task)
-    # breakpoint()
-    # **Send Real-Time Notifications via WebSockets**
+    deadline_scheduler.schedule(task["id"], deadline, task["title"], task["status"],
+                                (task["creator_id"], task["assignee_id"], task["reviewer_id"]))
+
+    # **Collect Real-Time Notifications for WebSockets**
     notification_messages = []
 
     # Notify Assignee Change (if changed)
-    if old_assignee != task.assignee_id:
+    if old_assignee != task["assignee_id"]:
         notification_messages.append({
-            "users": [old_assignee, task.assignee_id],  
-            "message": f"Task {task.id} was reassigned to a user {task.assignee_id}."
+            "users": [old_assignee, task["assignee_id"]],  
+            "message": f"Task {task['id']} was reassigned to a user {task['assignee_id']}."
         })
 
     # Notify Task Status Change (if changed)
-    if old_status != task.status:
-        assigned_users = {task.assignee_id, task.reviewer_id}  
+    if old_status != task["status"]:
+        assigned_users = {task["assignee_id"], task["reviewer_id"]}  
 
         # Get all team members
-        team_members = db.query(TeamMembership).filter(TeamMembership.team_id == task.team_id).all()
+        team_members = db.query(TeamMembership).filter(TeamMembership.team_id == task["team_id"]).all()
         for member in team_members:
             assigned_users.add(member.user_id)
 
         notification_messages.append({
             "users": list(assigned_users),
-            "message": f"Task {task.id} status changed from {old_status} to {task.status}."
+            "message": f"Task {task['id']} status changed from {old_status} to {task['status']}."
         })
 
-    # Send WebSocket notifications
-    for notif in notification_messages:
-        print(f"Sending notification: {notif['message']} to users {notif['users']}")
-        await manager.broadcast_to_team(notif["users"], notif["message"])
-    
+    return task, notification_messages
 
-    return task
+
+def raise_task_update_miss(db: Session, team_id: int, task_id: int):
+    """Work out why a task UPDATE matched no row and raise the matching error."""
+    if not db.query(Team.id).filter(Team.id == team_id).first():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Team not found")
+    task_team_id = db.scalar(select(Task.team_id).where(Task.id == task_id))
+    if task_team_id is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+    if task_team_id != team_id:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="The task does not belong to the specified team.")
+    raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED,
+                        detail="Task has been modified, reload it and retry")
+
+
+@router.put("/task/bulk-update", response_model=BulkTaskUpdateResponse)
+async def bulk_update_tasks(request: TaskBulkUpdateRequest,
+                            db: Session = Depends(get_db),
+                            current_user: User = Depends(get_current_user)):
+    """
+        Apply the same status, priority and/or assignee change to many tasks at once.
+
+        Method: PUT
+        Request Body: task_ids plus the fields to set; omitted fields are left unchanged.
+        Response: The updated tasks, and the requested IDs that were not found in the
+                  caller's organization.
+        Permissions: Same as update_task.
+        Real-Time Notifications: Each affected user receives one message summarising
+                                 every change that concerns them.
+    """
+    result, notifications = await run_in_threadpool(apply_bulk_task_update, request, db, current_user)
+    notification_dispatcher.notify(([user_id], message) for user_id, message in notifications.items())
+    return result
+
+
+def apply_bulk_task_update(request: TaskBulkUpdateRequest, db: Session, current_user: User):
+    """
+        Update every requested task with one UPDATE ... RETURNING and build one
+        notification per recipient. Shared by the sync and async-session routes.
+    """
+    task_ids = list(dict.fromkeys(request.task_ids))
+    if not task_ids:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No tasks given")
+    if len(task_ids) > BULK_TASK_LIMIT:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            detail=f"At most {BULK_TASK_LIMIT} tasks per request")
+    values = {field: value for field, value in (("status", request.status), ("priority", request.priority),
+                                                ("assignee_id", request.assignee_id)) if value is not None}
+    if not values:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No fields to update")
+    values["version"] = Task.version + 1
+
+    check_user_permission(current_user.id, db)
+    if request.assignee_id is not None:
+        if db.scalar(select(User.id).where(User.id == request.assignee_id)) is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Assignee not found")
+
+    # Lock and capture the old values in the same statement that writes the new ones
+    old = (select(Task.id, Task.assignee_id, Task.status)
+           .where(Task.id == any_(bindparam("task_ids", task_ids, type_=ARRAY(Integer))),
+                  Task.organization_id.is_not_distinct_from(current_user.organization_id))
+           .with_for_update()
+           .cte("old"))
+    statement = (update(Task)
+                 .where(Task.id == old.c.id)
+                 .values(**values)
+                 .returning(Task.id, Task.title, Task.description, Task.status, Task.priority, Task.assignee_id,
+                            Task.reviewer_id, Task.creator_id, Task.team_id, Task.organization_id, Task.deadline,
+                            old.c.assignee_id.label("old_assignee_id"), old.c.status.label("old_status"))
+                 .execution_options(synchronize_session=False))
+    rows = db.execute(statement).mappings().all()
+    record_task_events(db, [task_event("updated", row["id"], row["team_id"], row["organization_id"],
+                                       {field: row[field] for field in values if field != "version"})
+                            for row in rows])
+    scopes = set()
+    for row in rows:
+        scopes |= task_scopes(row["organization_id"], row["team_id"],
+                              (row["old_assignee_id"], row["assignee_id"], row["reviewer_id"], row["creator_id"]))
+    bump_change_counters(db, scopes)
+    db.commit()
+    for row in rows:
+        deadline_scheduler.schedule(row["id"], row["deadline"], row["title"], row["status"],
+                                    (row["creator_id"], row["assignee_id"], row["reviewer_id"]))
+
+    # Team members only matter for status changes; load each affected team once
+    status_changed = [row for row in rows if row["old_status"] != row["status"]]
+    members = defaultdict(set)
+    if status_changed:
+        team_ids = {row["team_id"] for row in status_changed}
+        for team_id, user_id in db.execute(select(TeamMembership.team_id, TeamMembership.user_id)
+                                           .where(TeamMembership.team_id.in_(team_ids))):
+            members[team_id].add(user_id)
+
+    lines = defaultdict(list)
+    for row in rows:
+        if row["old_assignee_id"] != row["assignee_id"]:
+            for user_id in {row["old_assignee_id"], row["assignee_id"]} - {None}:
+                lines[user_id].append(f"Task {row['id']} was reassigned to a user {row['assignee_id']}.")
+        if row["old_status"] != row["status"]:
+            recipients = members[row["team_id"]] | {row["assignee_id"], row["reviewer_id"]}
+            for user_id in recipients - {None}:
+                lines[user_id].append(f"Task {row['id']} status changed from {row['old_status']} to {row['status']}.")
+    notifications = {user_id: f"{len(messages)} task updates: " + " ".join(messages) if len(messages) > 1 else messages[0]
+                     for user_id, messages in lines.items()}
+
+    updated_ids = {row["id"] for row in rows}
+    result = {"updated": [dict(row) for row in rows],
+              "not_found": [task_id for task_id in task_ids if task_id not in updated_ids]}
+    return result, notifications
 
 
 @router.delete("/task/{team_id}/delete-task")
 def delete_task(team_id: int,
                 request: DeleteTaskRequest, 
                 db: Session = Depends(get_db), 
-                current_user: User = Depends(get_current_user)):
+                current_user: User = Depends(get_current_user),
+                claims: TokenClaims = Depends(get_current_claims)):
     """
         Deletes a task from a specific team.
 
@@ -202,14 +445,15 @@ def delete_task(team_id: int,
         if not task:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
         
-        team_membership = (db.query(TeamMembership).filter(TeamMembership.team_id == team.id, 
-                                                           TeamMembership.user_id == current_user.id)
-                                                           .first())
-        if (team_membership.role.role_name != "admin" and team_membership.role.role_name != "manager"):
+        if claims.teams.get(str(team.id)) not in ("admin", "manager"):
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, 
                                 detail="you do not have permission to edit this task")
         db.delete(task)
+        record_task_events(db, [task_event("deleted", task.id, task.team_id, task.organization_id)])
+        bump_change_counters(db, task_scopes(task.organization_id, task.team_id,
+                                             (task.creator_id, task.assignee_id, task.reviewer_id)))
         db.commit()
+        deadline_scheduler.cancel(task_id)
         return {"message": "Task Deleted"}
     except Exception as e:
         return {"message": str(e)}
@@ -217,29 +461,127 @@ def delete_task(team_id: int,
 
 @router.get("/task/sortfilter", response_model=List[TaskResponseSchema])
 def sortfilter(
-    db: Session = Depends(get_db),  
-    status: Optional[str] = Query(None, description="Filter by task status"),
-    priority: Optional[str] = Query(None, description="Filter by task priority"),
-    assignee_id: Optional[int] = Query(None, description="Filter by assignee ID"),
-    sort_by: Optional[str] = Query("created_at", description="Sort field (e.g., deadline, created_at)"),
-    order: Optional[str] = Query("asc", description="Sort order: asc or desc"),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),  
+    filters: TaskListQuery = Depends(),
     current_user: User = Depends(get_current_user)):
+    """
+        Filter and sort the tasks of the caller's organization, one page at a time.
 
-    query = db.query(Task)
+        Method: GET
+        Filters: IN-lists on status, priority, assignee_id and team_id (repeat the parameter),
+                 ranges on deadline, created_at and updated_at, and overdue=true.
+        Sorting: sort_by takes several fields, e.g. sort_by=priority,-deadline.
+        Pagination: Keyset on the sort fields plus id. When more rows exist the response carries
+                    an X-Next-Cursor header; pass it back as ?cursor= to get the next page.
+        Response: Up to `limit` tasks. Carries an ETag; If-None-Match with the current one answers 304.
+                  overdue=true lists are never answered 304: tasks turn overdue as time
+                  passes, without any write to bump the change counter.
+    """
+    organization_id = current_user.organization_id
+    if not filters.overdue:
+        not_modified = check_not_modified(request, response, "tasks", organization_id,
+                                          read_change_counter(db, f"org:{organization_id}"))
+        if not_modified:
+            return not_modified
+    tasks, next_cursor = list_tasks(db, filters, current_user.organization_id)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return tasks
+
+
+@router.get("/task/search", response_model=List[TaskSearchResult])
+def search(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200, description="Search text, e.g. login bug -android"),
+    team_id: Optional[List[int]] = Query(None, description="Only search these teams (repeatable)"),
+    limit: int = Query(20, ge=1, le=SEARCH_MAX_LIMIT),
+    offset: int = Query(0, ge=0, le=SEARCH_MAX_OFFSET),
+    include_archived: bool = Query(False, description="Also search archived tasks"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)):
+    """
+        Full-text search over task titles and descriptions in the caller's organization.
 
-    if status:
-        query = query.filter(Task.status == status)
-    if priority:
-        query = query.filter(Task.priority == priority)
-    if assignee_id:
-        query = query.filter(Task.assignee_id == assignee_id)
+        Method: GET
+        Query: Web-search syntax - quoted phrases, "or", and -word to exclude.
+        Pagination: limit/offset; X-Next-Offset is set while more results may follow.
+        Response: Matching tasks ordered by relevance, each with its rank.
+    """
+    results = search_tasks(db, q, current_user.organization_id, team_id, limit, offset, include_archived)
+    if len(results) == limit and offset + limit <= SEARCH_MAX_OFFSET:
+        response.headers["X-Next-Offset"] = str(offset + limit)
+    return results
 
 
-    sort_column = getattr(Task, sort_by, Task.created_at)  # Default to created_at if invalid
-    if order == "desc":
-        query = query.order_by(sort_column.desc())
+@router.get("/task/changes", response_model=TaskChangesResponse)
+def task_changes(
+    since: int = Query(0, ge=0, description="Highest seq the client has already applied"),
+    limit: int = Query(500, ge=1, le=TASK_CHANGES_MAX_LIMIT),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)):
+    """
+        Incremental feed of task changes in the caller's organization.
+
+        Method: GET
+        Query: since - the next_since value from the previous call (0 for everything).
+        Response: Events in seq order. "created" carries the new task's fields, "updated" only
+                  the fields that were set, "deleted" nothing. Repeat with next_since while
+                  has_more is true.
+    """
+    events = read_task_changes(db, current_user.organization_id, since, limit + 1)
+    has_more = len(events) > limit
+    events = events[:limit]
+    return {"events": events, "next_since": events[-1].seq if events else since, "has_more": has_more}
+
+
+@router.get("/task/export")
+def export_tasks(
+    request: Request,
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="ndjson or csv"),
+    include_archived: bool = Query(True, description="Include archived tasks"),
+    current_user: User = Depends(get_current_user)):
+    """
+        Export every task of the caller's organization.
+
+        Method: GET
+        Response: A streamed body, one task per line (NDJSON) or row (CSV with a header).
+                  Rows are read from a server-side cursor in batches, so memory use does
+                  not grow with the size of the organization. Archived tasks are included
+                  unless include_archived=false.
+    """
+    organization_id = current_user.organization_id
+    primary = reads_from_primary(request)
+    if format == "csv":
+        body, media_type = export_csv(organization_id, include_archived, primary), "text/csv"
     else:
-        query = query.order_by(sort_column)
+        body, media_type = export_ndjson(organization_id, include_archived, primary), "application/x-ndjson"
+    filename = f"tasks-{organization_id or 'none'}.{format}"
+    return StreamingResponse(body, media_type=media_type,
+                             headers={"Content-Disposition": f'attachment; filename="{filename}"'})
 
-    tasks = query.all()
-    return tasks
\ No newline at end of file
+
+@router.post("/task/import", response_model=TaskImportReport)
+def import_task_file(
+    file: UploadFile = File(...),
+    format: Optional[Literal["csv", "ndjson"]] = Query(None, description="Defaults to the file extension"),
+    db: Session = Depends(get_db),
+    current_admin: User = Depends(is_admin)):
+    """
+        Import tasks for the admin's organization from a CSV or NDJSON file.
+
+        Method: POST (multipart upload)
+        Rows: TaskCreate fields plus team_id. Rows are validated and loaded in chunks
+              through COPY; each chunk commits on its own. Rows for another organization,
+              or whose team, assignee or reviewer belongs to one, are rejected.
+        Response: Row counts and the first IMPORT_REJECTS_RETURNED rejected rows with their
+                  line number and errors. Use the task_import CLI for a full reject file.
+        Permissions: Admins only.
+    """
+    fmt = format or ("csv" if (file.filename or "").endswith(".csv") else "ndjson")
+    stream = io.TextIOWrapper(file.file, encoding="utf-8", newline="")
+    progress = import_tasks(db, stream, fmt, current_admin.id, organization_id=current_admin.organization_id,
+                            on_progress=lambda p: logger.info("Task import by user %s: %s", current_admin.id, p))
+    return {"read": progress.read, "imported": progress.imported, "rejected": progress.rejected,
+            "rejects": progress.rejects[:IMPORT_REJECTS_RETURNED]}
@@ -2,8 +2,9 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from ..schemas import TeamCreate, TeamResponse, TeamMemberAddRequest, ResponseMessage, TeamRemoveMember
 from sqlalchemy.orm import Session
 from ..database import get_db
-from ..auth import get_current_user
+from ..auth import get_current_user, bump_auth_version
 from ..models import Team, TeamMembership, User, Role
+from ..utils.change_counters import bump_change_counters
 
 router = APIRouter(tags=['Team'])
 
@@ -29,6 +30,7 @@ def create_team(team: TeamCreate,db: Session = Depends(get_db),
     
     new_team = Team(name=team.name,organization_id =team.organization_id)
     db.add(new_team)
+    bump_change_counters(db, [f"org:{team.organization_id}"])
     db.commit()
     db.refresh(new_team)
     
@@ -70,6 +72,7 @@ def add_team_member(team_id: int,
 
         new_membership = TeamMembership(user_id=user.id, team_id=team.id)
         db.add(new_membership)
+        bump_auth_version(db, user.id)
         db.commit()
 
         return {"message": "User added to team successfully"}
@@ -111,5 +114,6 @@ def remove_member(team_id:int, request: TeamRemoveMember, db:Session=Depends(get
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User is not a member of team")
         
         db.delete(member)
+        bump_auth_version(db, user.id)
         db.commit()
         return {"message": "User Deleted from the team successfully"}
\ No newline at end of file
@@ -1,27 +1,60 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from ..schemas import UserBase, UserOut, UserCreate, UserLogin, Token, RoleCreateRequest, SuperUserCreate
+from ..schemas import UserBase, UserOut, UserCreate, UserLogin, Token, RoleCreateRequest, SuperUserCreate, TokenRefreshRequest
 from sqlalchemy.orm import session
-from ..hashing import get_password_hash,verify_password, generate_random_password
-from ..auth import create_access_token, get_current_user, create_refresh_token
-from ..models import User, UserRole, Role, TeamMembership
+from ..hashing import get_password_hash,verify_password, generate_random_password, hashing_service
+from ..auth import create_access_token, get_current_user, create_refresh_token, build_token_data, issue_refresh_token, rotate_refresh_token, load_principal, get_token_payload
+from ..models import User, UserRole, Role, TeamMembership, RefreshToken
+from ..utils.revocation import revocation_list
+from ..utils.change_counters import bump_change_counters
+from datetime import datetime
+from typing import Any, Dict
 from sqlalchemy.orm import Session
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 from task.models import User, Organization
-from ..database import SessionLocal
+from ..database import get_db
 from .invite import send_invite_email
+from .dependency import get_read_db
 
 
 router = APIRouter(tags=["User"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+def find_user_by_email(db: Session, email: str):
+    return db.query(User).filter(User.email == email).first()
+
+def issue_login_tokens(db: Session, db_user: User):
+    """Mint an access token and a tracked refresh token for a freshly authenticated user."""
+    access_token = create_access_token(build_token_data(db, db_user))
+    refresh_token = issue_refresh_token(db, db_user.id)
+    db.commit()
+    return access_token, refresh_token
+
+def save_new_user(db: Session, new_user: User, change_scopes=()):
+    db.add(new_user)
+    if change_scopes:
+        bump_change_counters(db, change_scopes)
+    db.commit()
+    db.refresh(new_user)
+
+def registration_role(db: Session, user: UserCreate) -> str:
+    """Validate a registration and return the role the new user gets."""
+    # Check if the organization exists
+    organization = db.query(Organization).filter(Organization.id == user.organization_id).first()
+    if not organization:
+        raise HTTPException(status_code=404, detail="Organization not found")
+
+    # Determine role (First user = Admin, others = Member)
+    existing_users = db.query(User).filter(User.organization_id == user.organization_id).count()
+    role = "admin" if existing_users == 0 else "member"
+
+    # Ensure the email is unique
+    existing_user = find_user_by_email(db, user.email)
+    if existing_user:
+        raise HTTPException(status_code=400, detail="Email already registered")
+    return role
 
 @router.post("/register/super_admin")
-def register_super_admin(user: SuperUserCreate, db: Session = Depends(get_db)):
+async def register_super_admin(user: SuperUserCreate, db: Session = Depends(get_db)):
     """
     Register the first Super Admin.
     
@@ -29,25 +62,24 @@ def register_super_admin(user: SuperUserCreate, db: Session = Depends(get_db)):
     - Assigns "super_admin" role to the first user.
     """
     # breakpoint()
-    existing_user = db.query(User).filter(User.email == user.email).first()
+    # The session is sync: its queries run in the threadpool, only the hash is awaited on the loop
+    existing_user = await run_in_threadpool(find_user_by_email, db, user.email)
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await hashing_service.hash(user.password)
     super_admin = User(
         email=user.email,
         hashed_password=hashed_password,
         role="super_admin"
     )
-    db.add(super_admin)
-    db.commit()
-    db.refresh(super_admin)
+    await run_in_threadpool(save_new_user, db, super_admin)
     
     return {"message": "Super Admin registered successfully", "email": super_admin.email}
 
 
 @router.post("/register", response_model=UserOut)
-def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(user: UserCreate, db: Session = Depends(get_db)):
     """
     Register a new user.
     
@@ -57,22 +89,10 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
     - Users cannot see other organizations' data.
     """
     try:
-        # Check if the organization exists
-        organization = db.query(Organization).filter(Organization.id == user.organization_id).first()
-        if not organization:
-            raise HTTPException(status_code=404, detail="Organization not found")
-
-        # Determine role (First user = Admin, others = Member)
-        existing_users = db.query(User).filter(User.organization_id == user.organization_id).count()
-        role = "admin" if existing_users == 0 else "member"
-
-        # Ensure the email is unique
-        existing_user = db.query(User).filter(User.email == user.email).first()
-        if existing_user:
-            raise HTTPException(status_code=400, detail="Email already registered")
+        role = await run_in_threadpool(registration_role, db, user)
 
         # Hash password and create user
-        hashed_password = get_password_hash(user.password)
+        hashed_password = await hashing_service.hash(user.password)
         new_user = User(
             email=user.email,
             hashed_password=hashed_password,
@@ -80,36 +100,37 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
             organization_id=user.organization_id
         )
 
-        db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
+        await run_in_threadpool(save_new_user, db, new_user, [f"org:{user.organization_id}"])
 
         # Send invite email
-        send_invite_email(user.email, user.password)
+        await run_in_threadpool(send_invite_email, user.email, user.password)
         print("Invitation sent")
 
         return new_user
 
+    except HTTPException:
+        # 4xx validation errors and the hashing pool's 503 + Retry-After pass through unchanged
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
 @router.post("/super_admin_login",response_model=Token)
-def super_admin_login(user: UserLogin, db: Session = Depends(get_db)):
-    db_user = db.query(User).filter(User.email == user.email).first()
-    if not db_user or not verify_password(user.password, db_user.hashed_password):
+async def super_admin_login(user: UserLogin, db: Session = Depends(get_db)):
+    db_user = await run_in_threadpool(find_user_by_email, db, user.email)
+    if not db_user or not await hashing_service.verify(user.password, db_user.hashed_password):
         raise HTTPException(status_code=400, detail="Invalid credentials")
     
-    if db_user.role != "super_admin":
+    role = db_user.role
+    if role != "super_admin":
         raise HTTPException(status_code=403, detail="Access denied. Super Admins only.")
-    # Generate both access and refresh tokens
-    access_token = create_access_token({"sub": str(db_user.id)})
-    refresh_token = create_refresh_token({"sub": str(db_user.id)})
+    # Generate both access and refresh tokens; read db_user before this, the commit expires it
+    access_token, refresh_token = await run_in_threadpool(issue_login_tokens, db, db_user)
 
     return {"message": "success", "access_token": access_token,
-            "refresh_token": refresh_token,"token_type": "bearer", "role": db_user.role}
+            "refresh_token": refresh_token,"token_type": "bearer", "role": role}
 
 @router.post("/login",response_model=Token)
-def login(user: UserLogin, db: Session = Depends(get_db)):
+async def login(user: UserLogin, db: Session = Depends(get_db)):
     """
         Authenticate a user and generate a JWT token.
 
@@ -125,20 +146,59 @@ def login(user: UserLogin, db: Session = Depends(get_db)):
             400 Bad Request: If the email or password is incorrect.
 
     """
-    db_user = db.query(User).filter(User.email == user.email).first()
-    if not db_user or not verify_password(user.password, db_user.hashed_password):
+    db_user = await run_in_threadpool(find_user_by_email, db, user.email)
+    if not db_user or not await hashing_service.verify(user.password, db_user.hashed_password):
         raise HTTPException(status_code=400, detail="Invalid credentials")
     
     # team_membership = db.query(TeamMembership).filter(TeamMembership.user_id == db_user.id).first()
     # role_id = team_membership.role_id if team_membership else None  # Handle case where user has no team
 
     # Generate JWT token using user ID
-    access_token = create_access_token({"sub": str(db_user.id)})
-    refresh_token = create_refresh_token({"sub": str(db_user.id)})
+    access_token, refresh_token = await run_in_threadpool(issue_login_tokens, db, db_user)
 
     return {"message": "success", "access_token": access_token,
             "refresh_token": refresh_token,"token_type": "bearer"}
 
+@router.post("/token/refresh", response_model=Token)
+def refresh_access_token(request: TokenRefreshRequest, db: Session = Depends(get_db)):
+    """
+        Exchange a refresh token for a new access token and a rotated refresh token.
+
+        No password check is involved, so long-lived sessions do not pay for bcrypt
+        every time the access token expires.
+
+        Responses:
+            200 OK: New access and refresh tokens.
+            401 Unauthorized: The refresh token is invalid, expired, revoked or was already used.
+    """
+    user_id, new_refresh_token = rotate_refresh_token(db, request.refresh_token)
+    db_user = load_principal(db, user_id)
+    if not db_user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+
+    access_token = create_access_token(build_token_data(db, db_user))
+    db.commit()
+
+    return {"message": "success", "access_token": access_token,
+            "refresh_token": new_refresh_token, "token_type": "bearer"}
+
+@router.post("/logout")
+def logout(payload: Dict[str, Any] = Depends(get_token_payload), db: Session = Depends(get_db),
+           current_user: User = Depends(get_current_user)):
+    """
+        Revoke the presented access token and every outstanding refresh token of the user.
+
+        Responses: 200 OK: Logged out.
+                   401 Unauthorized: The token is invalid or already revoked.
+    """
+    if payload.get("jti"):
+        revocation_list.revoke(db, payload["jti"], datetime.utcfromtimestamp(payload["exp"]))
+    db.query(RefreshToken).filter(RefreshToken.user_id == current_user.id, RefreshToken.revoked == False).update(
+        {RefreshToken.revoked: True}, synchronize_session=False
+    )
+    db.commit()
+    return {"message": "Logged out successfully"}
+
 @router.post("/roles")
 def create_role(role_request: RoleCreateRequest, role_name: UserRole, db: Session = Depends(get_db), 
                 current_user: User= Depends(get_current_user)):
@@ -162,23 +222,22 @@ def create_role(role_request: RoleCreateRequest, role_name: UserRole, db: Sessio
     return {"message": "Role created successfully", "role": db_role.role_name}
 
 @router.post("/admin/login")
-def admin_login(user: UserLogin, db: Session = Depends(get_db)):
+async def admin_login(user: UserLogin, db: Session = Depends(get_db)):
     # breakpoint()
-    db_user = db.query(User).filter(User.email == user.email).first()
-    if not db_user or not verify_password(user.password, db_user.hashed_password):
+    db_user = await run_in_threadpool(find_user_by_email, db, user.email)
+    if not db_user or not await hashing_service.verify(user.password, db_user.hashed_password):
         raise HTTPException(status_code=400, detail="Invalid credentials")
     
     if db_user.role != "admin":
         raise HTTPException(status_code=403, detail="Access denied. Admins only.")
     # Generate both access and refresh tokens
-    access_token = create_access_token({"sub": str(db_user.id)})
-    refresh_token = create_refresh_token({"sub": str(db_user.id)})
+    access_token, refresh_token = await run_in_threadpool(issue_login_tokens, db, db_user)
 
     return {"message": "success", "access_token": access_token,
             "refresh_token": refresh_token,"token_type": "bearer"}
 
 @router.get("/users")
-def get_users(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def get_users(db: Session = Depends(get_read_db), current_user: User = Depends(get_current_user)):
     # Get the organization_id of the current admin
     organization_id = current_user.organization_id
     
@@ -4,7 +4,6 @@ from task.auth import get_current_user
 from task.auth import verify_jwt_token
 
 router = APIRouter()
-active_connections = {} #connection alive
 
 @router.websocket("/ws/notifications/{user_id}")
 async def websocket_endpoint(websocket: WebSocket, user_id: int):
@@ -15,7 +14,7 @@ async def websocket_endpoint(websocket: WebSocket, user_id: int):
         real-time message exchange between the client and the server.
     
         Functionality:
-            Connects the user to the WebSocket manager.
+            Connects the user to the WebSocket manager; a user may have several connections open.
             Listens for incoming messages from the user.
             Sends acknowledgment messages back to the client.
             Handles disconnection when the user disconnects.
@@ -25,4 +24,6 @@ async def websocket_endpoint(websocket: WebSocket, user_id: int):
         while True:
             await websocket.receive_text()  # Keep the connection alive
     except WebSocketDisconnect:
-        manager.disconnect(user_id)
\ No newline at end of file
+        pass
+    finally:
+        await manager.disconnect(user_id, websocket)
@@ -1,8 +1,9 @@
 from pydantic import BaseModel, EmailStr
 from .models import TaskStatus, PriorityStatus
 from datetime import datetime
-from typing import Optional, List
+from typing import Any, Optional, List, Dict
 from pydantic import constr
+import enum
 
 
 class OrganizationCreate(BaseModel):
@@ -21,6 +22,9 @@ class Token(BaseModel):
     refresh_token: str
     token_type: str
     message: str
+
+class TokenRefreshRequest(BaseModel):
+    refresh_token: str
     
 
 class SuperUserCreate(BaseModel):
@@ -71,6 +75,15 @@ class TaskCreate(BaseModel):
     assignee_id: Optional[int] = None
     organization_id: int
 
+class TaskImportRow(TaskCreate):
+    team_id: int
+
+class TaskImportReport(BaseModel):
+    read: int
+    imported: int
+    rejected: int
+    rejects: List[Dict[str, Any]]
+
 class TaskOut(BaseModel):
     id: int
     title: str
@@ -84,6 +97,18 @@ class TaskOut(BaseModel):
     assignee_id: Optional[int]
     organization_id: int
 
+class BulkItemError(BaseModel):
+    index: int
+    title: Optional[str] = None
+    detail: str
+
+class BulkCreatedTask(TaskOut):
+    index: int  # Position of the item in the request
+
+class BulkTaskCreateResponse(BaseModel):
+    created: List[BulkCreatedTask]
+    errors: List[BulkItemError]
+
 class TeamCreate(BaseModel):
     name: str
     organization_id: int
@@ -112,6 +137,19 @@ class TaskResponse(BaseModel):
     creator_id: int
     team_id: int
 
+class TaskBulkUpdateRequest(BaseModel):
+    task_ids: List[int]
+    status: Optional[TaskStatus] = None
+    priority: Optional[PriorityStatus] = None
+    assignee_id: Optional[int] = None
+
+class BulkTaskUpdateItem(TaskResponse):
+    status: str
+
+class BulkTaskUpdateResponse(BaseModel):
+    updated: List[BulkTaskUpdateItem]
+    not_found: List[int]
+
 class DeleteTaskRequest(BaseModel):
     task_id: int
 
@@ -134,6 +172,22 @@ class DeleteTaskRequest(BaseModel):
 class TokenData(BaseModel):
     email: str | None = None
 
+class TokenClaims(BaseModel):
+    sub: int
+    role: Optional[str] = None
+    org: Optional[int] = None
+    teams: Dict[str, str] = {}
+    ver: int = 0
+
+class TaskSortField(str, enum.Enum):
+    CREATED_AT = "created_at"
+    UPDATED_AT = "updated_at"
+    DEADLINE = "deadline"
+    PRIORITY = "priority"
+    STATUS = "status"
+    TITLE = "title"
+    ID = "id"
+
 class TaskResponseSchema(BaseModel):
     id: int
     title: str
@@ -146,6 +200,33 @@ class TaskResponseSchema(BaseModel):
 
     class Config:
         from_attributes = True 
+
+class TaskSearchResult(BaseModel):
+    id: int
+    title: str
+    description: Optional[str]
+    status: str
+    priority: str
+    deadline: Optional[datetime]
+    team_id: int
+    assignee_id: Optional[int]
+    rank: float
     
+class TaskEventOut(BaseModel):
+    seq: int
+    task_id: int
+    team_id: Optional[int]
+    event_type: str
+    payload: Dict[str, Any]
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class TaskChangesResponse(BaseModel):
+    events: List[TaskEventOut]
+    next_since: int
+    has_more: bool
+
 class RoleCreateRequest(BaseModel):
     role_name: str
\ No newline at end of file
@@ -0,0 +1,14 @@
+import re
+
+
+def query_count(response) -> int:
+    """Number of SQL statements the server reported for a response via Server-Timing."""
+    match = re.search(r'desc="(\d+) queries"', response.headers.get("Server-Timing", ""))
+    assert match, "Response has no db Server-Timing entry"
+    return int(match.group(1))
+
+
+def assert_max_queries(response, limit: int):
+    """Fail when a route issued more than `limit` SQL statements."""
+    count = query_count(response)
+    assert count <= limit, f"{response.request.method} {response.request.url.path} issued {count} queries, expected at most {limit}"
@@ -0,0 +1,19 @@
+from task.utils.bloom_filter import BloomFilter
+
+
+def test_added_items_are_always_found():
+    """A Bloom filter never reports a false negative."""
+    bloom = BloomFilter(capacity=1000)
+    jtis = [f"jti-{i}" for i in range(1000)]
+    for jti in jtis:
+        bloom.add(jti)
+    assert all(jti in bloom for jti in jtis)
+
+
+def test_false_positive_rate_stays_low():
+    """Unknown items mostly miss, which is what keeps revocation checks off the database."""
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"revoked-{i}")
+    false_positives = sum(f"live-{i}" in bloom for i in range(10000))
+    assert false_positives < 300
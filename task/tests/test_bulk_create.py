@@ -0,0 +1,109 @@
+import pytest
+from fastapi.testclient import TestClient
+from task.main import app
+from task.database import SessionLocal
+from task.models import User, Team, Task, Organization
+from task.hashing import get_password_hash
+from datetime import datetime
+from task.auth import create_access_token
+from task.tests.helpers import query_count
+
+@pytest.fixture(scope="module")
+def client():
+    """Create a Test Client for FastAPI."""
+    return TestClient(app)
+
+@pytest.fixture(scope="function")
+def db_session():
+    """Provides a new test database session for each test."""
+    db = SessionLocal()
+    yield db
+    db.rollback()
+    db.close()
+
+@pytest.fixture(scope="function")
+def setup_data(db_session):
+    """Setup test data: an organization, an admin user and a team."""
+    organization = Organization(name="Bulk Org")
+    db_session.add(organization)
+    db_session.commit()
+    db_session.refresh(organization)
+
+    test_user = User(
+        email="bulkadmin@example.com",
+        hashed_password=get_password_hash("testpassword"),
+        role="admin",
+        organization_id=organization.id,
+    )
+    db_session.add(test_user)
+    db_session.commit()
+    db_session.refresh(test_user)
+
+    test_team = Team(name="Bulk Team", organization_id=organization.id)
+    db_session.add(test_team)
+    db_session.commit()
+    db_session.refresh(test_team)
+
+    db_session.add(Task(title="Bulk existing", description="Already there", status="Not Started",
+                        priority="Low", deadline=datetime.utcnow(), creator_id=test_user.id,
+                        team_id=test_team.id, organization_id=organization.id))
+    db_session.commit()
+
+    yield {"user": test_user, "team": test_team, "organization": organization}
+
+    db_session.query(Task).filter_by(team_id=test_team.id).delete()
+    db_session.query(Team).filter_by(id=test_team.id).delete()
+    db_session.query(User).filter_by(id=test_user.id).delete()
+    db_session.query(Organization).filter_by(id=organization.id).delete()
+    db_session.commit()
+
+
+def task_payload(title, organization_id, assignee_id=None):
+    return {
+        "title": title,
+        "description": f"{title} description",
+        "status": "Not Started",
+        "priority": "Medium",
+        "deadline": datetime.utcnow().isoformat(),
+        "assignee_id": assignee_id,
+        "organization_id": organization_id,
+    }
+
+
+def test_bulk_create_reports_per_item_errors(client, db_session, setup_data):
+    """Valid items are created while duplicates and bad references are reported by index."""
+    user = setup_data["user"]
+    team = setup_data["team"]
+    organization_id = setup_data["organization"].id
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+
+    payload = [
+        task_payload("Bulk one", organization_id, assignee_id=user.id),
+        task_payload("Bulk existing", organization_id),
+        task_payload("Bulk two", organization_id),
+        task_payload("Bulk one", organization_id),
+        task_payload("Bulk three", organization_id, assignee_id=-1),
+    ]
+    response = client.post(f"/task/{team.id}/bulk-create", json=payload, headers=headers)
+    assert response.status_code == 200
+
+    body = response.json()
+    assert [(task["index"], task["title"]) for task in body["created"]] == [(0, "Bulk one"), (2, "Bulk two")]
+    assert all(task["team_id"] == team.id and task["creator_id"] == user.id for task in body["created"])
+    assert [error["index"] for error in body["errors"]] == [1, 3, 4]
+    assert db_session.query(Task).filter_by(team_id=team.id).count() == 3
+
+
+def test_bulk_create_query_count_is_independent_of_batch_size(client, setup_data):
+    """A hundred tasks cost the same number of statements as one."""
+    user = setup_data["user"]
+    team = setup_data["team"]
+    organization_id = setup_data["organization"].id
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+
+    small = client.post(f"/task/{team.id}/bulk-create", json=[task_payload("Bulk small", organization_id)],
+                        headers=headers)
+    large = client.post(f"/task/{team.id}/bulk-create",
+                        json=[task_payload(f"Bulk large {i}", organization_id) for i in range(100)], headers=headers)
+    assert len(large.json()["created"]) == 100
+    assert query_count(large) <= query_count(small)
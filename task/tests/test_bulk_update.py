@@ -0,0 +1,91 @@
+import pytest
+from fastapi.testclient import TestClient
+from task.main import app
+from task.database import SessionLocal
+from task.models import User, Team, Task, Role, TeamMembership, Permission
+from task.hashing import get_password_hash
+from datetime import datetime
+from task.auth import create_access_token
+from task.utils.notification_dispatcher import notification_dispatcher
+
+client = TestClient(app)
+
+@pytest.fixture(scope="function")
+def db_session():
+    """Provides a fresh database session for each test."""
+    db = SessionLocal()
+    yield db
+    db.rollback()
+    db.close()
+
+@pytest.fixture(scope="function")
+def setup_data(db_session):
+    """Setup test data: a team member with write/update permission and three tasks."""
+    test_user = User(
+        email="bulkupdate@example.com",
+        hashed_password=get_password_hash("testpassword")
+    )
+    db_session.add(test_user)
+    db_session.commit()
+    db_session.refresh(test_user)
+
+    test_team = Team(name="Bulk Update Team")
+    db_session.add(test_team)
+    db_session.commit()
+    db_session.refresh(test_team)
+
+    test_role = Role(role_name="admin")
+    db_session.add(test_role)
+    db_session.commit()
+    db_session.refresh(test_role)
+
+    db_session.add(TeamMembership(team_id=test_team.id, user_id=test_user.id, role_id=test_role.id))
+    db_session.add(Permission(user_id=test_user.id, read=True, write=True, update=True))
+    tasks = [Task(title=f"Bulk update {i}", description="", status="Not Started", priority="Low",
+                  deadline=datetime.utcnow(), creator_id=test_user.id, assignee_id=test_user.id,
+                  team_id=test_team.id)
+             for i in range(3)]
+    db_session.add_all(tasks)
+    db_session.commit()
+
+    yield {"user": test_user, "team": test_team, "tasks": tasks}
+
+    db_session.query(Task).filter_by(team_id=test_team.id).delete()
+    db_session.query(Permission).filter_by(user_id=test_user.id).delete()
+    db_session.query(TeamMembership).filter_by(team_id=test_team.id).delete()
+    db_session.query(Role).filter_by(id=test_role.id).delete()
+    db_session.query(Team).filter_by(id=test_team.id).delete()
+    db_session.query(User).filter_by(id=test_user.id).delete()
+    db_session.commit()
+
+
+def test_bulk_update_sends_one_message_per_recipient(monkeypatch, db_session, setup_data):
+    """All tasks move in one request and the assignee hears about it once."""
+    user = setup_data["user"]
+    task_ids = [task.id for task in setup_data["tasks"]]
+    sent = []
+
+    def record(notifications):
+        sent.extend((user_id, message) for user_ids, message in notifications for user_id in user_ids)
+    monkeypatch.setattr(notification_dispatcher, "notify", record)
+
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+    response = client.put("/task/bulk-update", json={"task_ids": task_ids + [-1], "status": "Completed"},
+                          headers=headers)
+    assert response.status_code == 200
+
+    body = response.json()
+    assert sorted(task["id"] for task in body["updated"]) == sorted(task_ids)
+    assert all(task["status"] == "Completed" for task in body["updated"])
+    assert body["not_found"] == [-1]
+
+    assert [user_id for user_id, _ in sent] == [user.id]
+    assert sent[0][1].startswith("3 task updates:")
+
+
+def test_bulk_update_requires_a_change(setup_data):
+    """A request that sets no field is rejected."""
+    user = setup_data["user"]
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+    response = client.put("/task/bulk-update", json={"task_ids": [setup_data["tasks"][0].id]}, headers=headers)
+    assert response.status_code == 400
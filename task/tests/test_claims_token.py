@@ -0,0 +1,86 @@
+import pytest
+from fastapi.testclient import TestClient
+from task.main import app
+from task.database import SessionLocal
+from task.models import User, Team, Role, TeamMembership
+from task.hashing import get_password_hash
+from task.auth import create_access_token, build_user_claims, bump_auth_version
+
+client = TestClient(app)
+
+@pytest.fixture(scope="function")
+def db_session():
+    """Provides a new test database session for each test."""
+    db = SessionLocal()
+    yield db
+    db.rollback()
+    db.close()
+
+@pytest.fixture(scope="function")
+def setup_data(db_session):
+    """Setup test data: a user who is admin of one team."""
+    test_user = User(
+        email="claimsuser@example.com",
+        hashed_password=get_password_hash("testpassword")
+    )
+    db_session.add(test_user)
+    db_session.commit()
+    db_session.refresh(test_user)
+
+    test_team = Team(name="Claims Team")
+    db_session.add(test_team)
+    db_session.commit()
+    db_session.refresh(test_team)
+
+    test_role = Role(role_name="admin")
+    db_session.add(test_role)
+    db_session.commit()
+    db_session.refresh(test_role)
+
+    db_session.add(TeamMembership(team_id=test_team.id, user_id=test_user.id, role_id=test_role.id))
+    db_session.commit()
+
+    yield {"user": test_user, "team": test_team, "role": test_role}
+
+    db_session.query(TeamMembership).filter_by(team_id=test_team.id).delete()
+    db_session.query(Role).filter_by(id=test_role.id).delete()
+    db_session.query(Team).filter_by(id=test_team.id).delete()
+    db_session.query(User).filter_by(id=test_user.id).delete()
+    db_session.commit()
+
+
+def test_claims_contain_team_roles(db_session, setup_data):
+    """The claims map carries the caller's role in each team."""
+    user = setup_data["user"]
+    team = setup_data["team"]
+
+    claims = build_user_claims(db_session, user)
+    assert claims["sub"] == str(user.id)
+    assert claims["teams"] == {str(team.id): "admin"}
+    assert claims["ver"] == 0
+
+
+def test_claims_token_authorizes_team_dashboard(db_session, setup_data):
+    """A claims token is accepted for team members."""
+    user = setup_data["user"]
+    team = setup_data["team"]
+    token = create_access_token(build_user_claims(db_session, user))
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.get(f"/dashboard/team-dashboard/{team.id}", headers=headers)
+    assert response.status_code == 200
+
+
+def test_stale_claims_token_is_rejected(db_session, setup_data):
+    """Bumping auth_version forces clients holding old claims to refresh."""
+    user = setup_data["user"]
+    team = setup_data["team"]
+    token = create_access_token(build_user_claims(db_session, user))
+    headers = {"Authorization": f"Bearer {token}"}
+
+    bump_auth_version(db_session, user.id)
+    db_session.commit()
+
+    response = client.get(f"/dashboard/team-dashboard/{team.id}", headers=headers)
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Token claims are stale, please refresh your token"
@@ -0,0 +1,80 @@
+import pytest
+from fastapi.testclient import TestClient
+from task.main import app
+from task.database import SessionLocal
+from task.models import User, Organization, ChangeCounter
+from task.hashing import get_password_hash
+from task.auth import create_access_token
+from task.utils.change_counters import bump_change_counters, task_scopes
+
+client = TestClient(app)
+
+@pytest.fixture(scope="function")
+def db_session():
+    """Provides a new test database session for each test."""
+    db = SessionLocal()
+    yield db
+    db.rollback()
+    db.close()
+
+@pytest.fixture(scope="function")
+def setup_data(db_session):
+    """Setup test data: a user in an organization."""
+    organization = Organization(name="Conditional Org")
+    db_session.add(organization)
+    db_session.commit()
+    db_session.refresh(organization)
+
+    test_user = User(
+        email="conditional@example.com",
+        hashed_password=get_password_hash("testpassword"),
+        organization_id=organization.id,
+    )
+    db_session.add(test_user)
+    db_session.commit()
+    db_session.refresh(test_user)
+
+    yield {"user": test_user, "organization": organization}
+
+    db_session.query(ChangeCounter).filter(ChangeCounter.scope.in_(
+        [f"user:{test_user.id}", f"org:{organization.id}"])).delete(synchronize_session=False)
+    db_session.query(User).filter_by(id=test_user.id).delete()
+    db_session.query(Organization).filter_by(id=organization.id).delete()
+    db_session.commit()
+
+
+@pytest.mark.parametrize("path", ["/dashboard/user-dashboard", "/organization/dashboard", "/task/sortfilter"])
+def test_unchanged_views_answer_304(db_session, setup_data, path):
+    """A matching If-None-Match gets 304 until a task write bumps the counter."""
+    user = setup_data["user"]
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+
+    first = client.get(path, headers=headers)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    repeat = client.get(path, headers={**headers, "If-None-Match": etag})
+    assert repeat.status_code == 304
+    assert repeat.headers["ETag"] == etag
+
+    bump_change_counters(db_session, task_scopes(setup_data["organization"].id, None, (user.id,)))
+    db_session.commit()
+
+    changed = client.get(path, headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_overdue_list_is_not_cached(setup_data):
+    """Tasks turn overdue without a write, so overdue=true is always answered in full."""
+    user = setup_data["user"]
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+
+    first = client.get("/task/sortfilter", params={"overdue": "true"}, headers=headers)
+    assert first.status_code == 200
+    assert "ETag" not in first.headers
+
+    cached = client.get("/task/sortfilter", headers=headers)
+    repeat = client.get("/task/sortfilter", params={"overdue": "true"},
+                        headers={**headers, "If-None-Match": cached.headers["ETag"]})
+    assert repeat.status_code == 200
@@ -0,0 +1,133 @@
+from datetime import datetime, timedelta, timezone
+from task.models import TaskStatus
+from task.utils.deadline_scheduler import DeadlineScheduler
+
+
+def loaded_scheduler(window_hours=6):
+    """A scheduler whose window is open, without touching the database."""
+    scheduler = DeadlineScheduler(offsets=[60, 0], window_hours=window_hours)
+    scheduler.loaded_until = datetime.utcnow() + scheduler.lead + scheduler.window
+    return scheduler
+
+
+def test_reminders_fire_in_deadline_order():
+    """Each task fires at every offset, earliest first, to its creator, assignee and reviewer."""
+    scheduler = loaded_scheduler()
+    now = datetime.utcnow()
+    scheduler.schedule(1, now + timedelta(hours=3, minutes=30), "later", TaskStatus.NOT_STARTED, (1, 2, None))
+    scheduler.schedule(2, now + timedelta(hours=2), "sooner", TaskStatus.NOT_STARTED, (1, 1, 3))
+
+    due = scheduler.pop_due(now + timedelta(hours=2, minutes=45))
+    assert due == [(2, "sooner", [1, 3], 60), (2, "sooner", [1, 3], 0), (1, "later", [1, 2], 60)]
+    assert scheduler.pop_due(now + timedelta(hours=4)) == [(1, "later", [1, 2], 0)]
+    assert scheduler.pop_due(now + timedelta(days=1)) == []
+
+
+def test_reschedule_and_cancel_drop_stale_reminders():
+    """Only the latest schedule of a task fires; cancelled and completed tasks do not fire."""
+    scheduler = loaded_scheduler()
+    now = datetime.utcnow()
+    scheduler.schedule(1, now + timedelta(hours=2), "moved", TaskStatus.NOT_STARTED, (1,))
+    scheduler.schedule(1, now + timedelta(hours=4), "moved", TaskStatus.IN_PROGRESS, (1, 2))
+    scheduler.schedule(2, now + timedelta(hours=2), "cancelled", TaskStatus.NOT_STARTED, (1,))
+    scheduler.cancel(2)
+    scheduler.schedule(3, now + timedelta(hours=2), "done", TaskStatus.NOT_STARTED, (1,))
+    scheduler.schedule(3, now + timedelta(hours=2), "done", TaskStatus.COMPLETED, (1,))
+
+    assert scheduler.pop_due(now + timedelta(hours=3)) == [(1, "moved", [1, 2], 60)]
+
+
+def test_deadlines_outside_the_window_are_left_to_the_next_load():
+    """Tasks due past the loaded window are not held in memory."""
+    scheduler = loaded_scheduler(window_hours=1)
+    now = datetime.now(timezone.utc)
+    scheduler.schedule(1, now + timedelta(days=3), "far", TaskStatus.NOT_STARTED, (1,))
+    assert scheduler.pop_due(datetime.utcnow() + timedelta(days=4)) == []
+
+
+def test_past_offsets_are_skipped():
+    """A task scheduled inside its last hour only gets the at-deadline reminder."""
+    scheduler = loaded_scheduler()
+    now = datetime.utcnow()
+    scheduler.schedule(1, now + timedelta(minutes=30), "soon", TaskStatus.NOT_STARTED, (1,))
+    assert scheduler.pop_due(now + timedelta(hours=1)) == [(1, "soon", [1], 0)]
+
+
+class FakeSession:
+    """Returns canned results in order; `during_query` runs while the first result set is being read."""
+    def __init__(self, results, during_query=None, max_seq=0):
+        self.results = list(results)
+        self.during_query = during_query
+        self.max_seq = max_seq
+
+    def scalar(self, statement):
+        return self.max_seq
+
+    def execute(self, statement):
+        if self.during_query:
+            self.during_query()
+            self.during_query = None
+        rows = self.results.pop(0)
+        return type("Result", (), {"all": lambda _: rows})()
+
+    def close(self):
+        pass
+
+
+def test_writes_during_a_window_load_are_kept():
+    """A task written while the window loads is neither dropped by schedule() nor overwritten by the load."""
+    now = datetime.utcnow()
+    scheduler = DeadlineScheduler(offsets=[60, 0], window_hours=6)
+    stale = (1, now + timedelta(hours=3), "old title", 1, None, 1)
+
+    def concurrent_writes():
+        scheduler.schedule(1, now + timedelta(hours=4), "new title", TaskStatus.IN_PROGRESS, (1,))
+        scheduler.schedule(2, now + timedelta(hours=2), "created", TaskStatus.NOT_STARTED, (2,))
+
+    scheduler.session_factory = lambda: FakeSession([[stale]], during_query=concurrent_writes)
+    scheduler.load_window()
+
+    due = scheduler.pop_due(now + timedelta(hours=5))
+    assert [(task_id, title) for task_id, title, _, _ in due] == [(2, "created"), (2, "created"),
+                                                                 (1, "new title"), (1, "new title")]
+
+
+def test_sync_applies_writes_from_other_workers():
+    """Outbox events since the last sync reschedule changed tasks and cancel deleted ones, once."""
+    now = datetime.utcnow()
+    scheduler = loaded_scheduler()
+    scheduler._synced_seq = 10
+    scheduler.schedule(1, now + timedelta(hours=2), "moved", TaskStatus.NOT_STARTED, (1,))
+    scheduler.schedule(2, now + timedelta(hours=2), "deleted", TaskStatus.NOT_STARTED, (1,))
+
+    events = [(11, 1), (12, 2)]
+    moved = (1, now + timedelta(hours=4), "moved", TaskStatus.IN_PROGRESS, 3, None, 1)
+    scheduler.session_factory = lambda: FakeSession([events, [moved]])
+    assert scheduler.sync_changes() == 2
+    # The same events come back in the overlap on the next sync and are not replayed
+    scheduler.session_factory = lambda: FakeSession([events])
+    assert scheduler.sync_changes() == 0
+
+    assert scheduler.pop_due(now + timedelta(hours=5)) == [(1, "moved", [1, 3], 60), (1, "moved", [1, 3], 0)]
+
+
+def test_nothing_is_held_before_a_window_is_loaded():
+    """Workers that are not the leader never load a window, so their schedule/cancel calls keep no state."""
+    scheduler = DeadlineScheduler(offsets=[60, 0], window_hours=6)
+    now = datetime.utcnow()
+    for task_id in range(1000):
+        scheduler.schedule(task_id, now + timedelta(hours=2), "task", TaskStatus.NOT_STARTED, (1,))
+        scheduler.cancel(task_id)
+    assert scheduler._tasks == {} and scheduler._touched == {} and scheduler._heap == []
+
+
+def test_overdue_tasks_are_not_held():
+    """Updating a task past its deadline leaves nothing behind, and drops its earlier reminders."""
+    scheduler = loaded_scheduler()
+    now = datetime.utcnow()
+    scheduler.schedule(1, now + timedelta(hours=2), "task", TaskStatus.NOT_STARTED, (1,))
+    for task_id in range(2, 1002):
+        scheduler.schedule(task_id, now - timedelta(hours=1), "overdue", TaskStatus.NOT_STARTED, (1,))
+    scheduler.schedule(1, now - timedelta(minutes=5), "task", TaskStatus.IN_PROGRESS, (1,))
+    assert scheduler._tasks == {} and scheduler._touched == {}
+    assert scheduler.pop_due(now + timedelta(hours=3)) == []
@@ -0,0 +1,20 @@
+import pytest
+from task.utils.etag import make_etag, etag_matches, parse_task_etag
+
+
+def test_etag_matches_lists_and_weak_tags():
+    """If-None-Match may list several tags, weak or strong, or "*"."""
+    etag = make_etag(5, 3)
+    assert etag == '"5-3"'
+    assert etag_matches('"1-1", W/"5-3"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"5-2"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_parse_task_etag():
+    """If-Match yields the expected version of the named task only."""
+    assert parse_task_etag('"5-3"', 5) == 3
+    assert parse_task_etag("*", 5) is None
+    with pytest.raises(ValueError):
+        parse_task_etag('"6-3"', 5)
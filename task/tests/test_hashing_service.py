@@ -0,0 +1,29 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+from task.hashing import HashingService
+
+
+def test_hash_and_verify_in_process_pool():
+    """Passwords hashed in the pool verify in the pool."""
+    async def run():
+        service = HashingService(workers=1, max_pending=4)
+        try:
+            hashed = await service.hash("testpassword")
+            assert await service.verify("testpassword", hashed)
+            assert not await service.verify("wrongpassword", hashed)
+        finally:
+            service.shutdown()
+
+    asyncio.run(run())
+
+
+def test_queue_depth_limit_rejects_with_503():
+    """Calls beyond max_pending are refused instead of queued."""
+    async def run():
+        service = HashingService(workers=1, max_pending=0)
+        with pytest.raises(HTTPException) as exc:
+            await service.hash("testpassword")
+        assert exc.value.status_code == 503
+
+    asyncio.run(run())
@@ -0,0 +1,44 @@
+import pytest
+from fastapi.testclient import TestClient
+from task.main import app
+from task.database import SessionLocal
+from task.models import User, RefreshToken
+from task.hashing import get_password_hash
+
+client = TestClient(app)
+
+@pytest.fixture(scope="function")
+def db_session():
+    """Provides a database session for tests and handles cleanup."""
+    db = SessionLocal()
+    yield db
+    db.close()
+
+@pytest.fixture(scope="function")
+def test_user(db_session):
+    """Sets up a test user in the database."""
+    test_user = User(
+        email="logoutuser@example.com",
+        hashed_password=get_password_hash("testpassword")
+    )
+    db_session.add(test_user)
+    db_session.commit()
+    yield test_user
+    db_session.query(RefreshToken).filter(RefreshToken.user_id == test_user.id).delete()
+    db_session.query(User).filter(User.id == test_user.id).delete()
+    db_session.commit()
+
+def test_logout_revokes_access_and_refresh_tokens(db_session, test_user):
+    """After logout neither the access token nor the refresh token is accepted."""
+    tokens = client.post("/login", json={"email": "logoutuser@example.com", "password": "testpassword"}).json()
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    response = client.post("/logout", headers=headers)
+    assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+
+    response = client.get("/users", headers=headers)
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Token has been revoked"
+
+    response = client.post("/token/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 401
@@ -0,0 +1,71 @@
+import asyncio
+from task.utils.notification_dispatcher import NotificationDispatcher
+
+
+class FakeManager:
+    """Records broadcasts; every recipient counts as one connection."""
+    def __init__(self):
+        self.sent = []
+
+    async def broadcast_to_team(self, user_ids, message):
+        recipients = [user_id for user_id in dict.fromkeys(user_ids) if user_id is not None]
+        self.sent.extend((user_id, message) for user_id in recipients)
+        return len(recipients), 0
+
+
+def test_notify_returns_before_delivery_and_keeps_per_user_order():
+    """Queued messages arrive later, in order for each recipient, once per user."""
+    async def run():
+        fake = FakeManager()
+        dispatcher = NotificationDispatcher(workers=2, websocket_manager=fake)
+        dispatcher.start()
+        try:
+            dispatcher.notify([([1, 2, 2, None], "first"), ([1], "second")])
+            assert fake.sent == []
+            await dispatcher.drain()
+            stats = dispatcher.snapshot()
+        finally:
+            await dispatcher.stop()
+        assert [message for user_id, message in fake.sent if user_id == 1] == ["first", "second"]
+        assert [message for user_id, message in fake.sent if user_id == 2] == ["first"]
+        assert stats["connections_queued"] == 3
+        assert stats["queue_depth"] == 0
+
+    asyncio.run(run())
+
+
+class GatedManager(FakeManager):
+    """Holds every broadcast until `gate` is set; `entered` is set once a worker is inside one."""
+    def __init__(self):
+        super().__init__()
+        self.gate = asyncio.Event()
+        self.entered = asyncio.Event()
+
+    async def broadcast_to_team(self, user_ids, message):
+        self.entered.set()
+        await self.gate.wait()
+        return await super().broadcast_to_team(user_ids, message)
+
+
+def test_notify_from_worker_thread_and_queue_overflow():
+    """notify() works from threadpool threads; items beyond the queue size are dropped."""
+    async def run():
+        fake = GatedManager()
+        dispatcher = NotificationDispatcher(workers=1, max_queue=1, websocket_manager=fake)
+        dispatcher.start()
+        try:
+            # The only worker is busy with m0, so the queue holds m1 and drops the rest
+            dispatcher.notify([([1], "m0")])
+            await fake.entered.wait()
+            await asyncio.get_running_loop().run_in_executor(
+                None, lambda: [dispatcher.notify([([1], f"m{index}")]) for index in range(1, 4)])
+            fake.gate.set()
+            await dispatcher.drain()
+            stats = dispatcher.snapshot()
+        finally:
+            await dispatcher.stop()
+        assert stats["enqueued"] == 2
+        assert stats["dropped"] == 2
+        assert fake.sent == [(1, "m0"), (1, "m1")]
+
+    asyncio.run(run())
@@ -0,0 +1,30 @@
+import pytest
+from sqlalchemy import create_engine, exc, text
+from task.utils.pool_metrics import instrumented_pool, pool_metrics
+
+
+def test_checkouts_are_timed(tmp_path):
+    """Every checkout lands in the wait-time histogram."""
+    engine = create_engine(f"sqlite:///{tmp_path}/pool.db", poolclass=instrumented_pool("test_checkouts"),
+                           pool_size=2, max_overflow=0)
+    for _ in range(3):
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+    stats = pool_metrics["test_checkouts"].snapshot()
+    assert stats["checkouts"] == 3
+    assert sum(stats["wait_histogram"].values()) == 3
+    assert stats["checked_out"] == 0
+
+
+def test_pool_timeouts_are_counted(tmp_path):
+    """A checkout that gives up waiting increments the timeout counter."""
+    engine = create_engine(f"sqlite:///{tmp_path}/pool.db", poolclass=instrumented_pool("test_timeouts"),
+                           pool_size=1, max_overflow=0, pool_timeout=0.05)
+    with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    stats = pool_metrics["test_timeouts"].snapshot()
+    assert stats["timeouts"] == 1
+    assert stats["checkouts"] == 1
@@ -0,0 +1,34 @@
+import time
+from task.utils.principal_cache import PrincipalCache
+
+
+def test_cache_hit_and_invalidate():
+    """Cached values are returned until the subject is invalidated."""
+    cache = PrincipalCache(max_size=10, ttl=60)
+    cache.set("1", {"id": 1, "role": "admin"})
+    assert cache.get("1") == {"id": 1, "role": "admin"}
+
+    cache.invalidate(1)
+    assert cache.get("1") is None
+
+
+def test_cache_entries_expire():
+    """Entries older than the TTL are treated as misses."""
+    cache = PrincipalCache(max_size=10, ttl=0.01)
+    cache.set("1", {"id": 1})
+    time.sleep(0.02)
+    assert cache.get("1") is None
+    assert len(cache) == 0
+
+
+def test_cache_evicts_least_recently_used():
+    """The cache never grows past max_size."""
+    cache = PrincipalCache(max_size=2, ttl=60)
+    cache.set("1", {"id": 1})
+    cache.set("2", {"id": 2})
+    cache.get("1")
+    cache.set("3", {"id": 3})
+
+    assert cache.get("2") is None
+    assert cache.get("1") == {"id": 1}
+    assert cache.get("3") == {"id": 3}
@@ -0,0 +1,70 @@
+import pytest
+from fastapi.testclient import TestClient
+from datetime import datetime, timedelta
+from task.main import app
+from task.database import SessionLocal
+from task.models import User, Task, Team
+from task.hashing import get_password_hash
+from task.auth import create_access_token
+from task.tests.helpers import assert_max_queries, query_count
+
+client = TestClient(app)
+
+@pytest.fixture(scope="function")
+def db_session():
+    """Provides a new test database session for each test."""
+    db = SessionLocal()
+    yield db
+    db.rollback()
+    db.close()
+
+@pytest.fixture(scope="function")
+def setup_data(db_session):
+    """A user with a handful of tasks assigned in one team."""
+    test_user = User(
+        email="budgetuser@example.com",
+        hashed_password=get_password_hash("testpassword")
+    )
+    db_session.add(test_user)
+    db_session.commit()
+    db_session.refresh(test_user)
+
+    test_team = Team(name="Budget Team")
+    db_session.add(test_team)
+    db_session.commit()
+    db_session.refresh(test_team)
+
+    for i in range(10):
+        db_session.add(Task(
+            title=f"Budget Task {i}",
+            description="query budget",
+            deadline=datetime.utcnow() + timedelta(days=1),
+            assignee_id=test_user.id,
+            creator_id=test_user.id,
+            team_id=test_team.id,
+        ))
+    db_session.commit()
+
+    yield {"user": test_user, "team": test_team}
+
+    db_session.query(Task).filter_by(team_id=test_team.id).delete()
+    db_session.query(Team).filter_by(id=test_team.id).delete()
+    db_session.query(User).filter_by(id=test_user.id).delete()
+    db_session.commit()
+
+
+def test_user_dashboard_query_budget(setup_data):
+    """The user dashboard cost does not grow with the number of tasks."""
+    token = create_access_token({"sub": str(setup_data["user"].id)})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.get("/dashboard/user-dashboard", headers=headers)
+    assert response.status_code == 200
+    assert_max_queries(response, 6)
+
+
+def test_server_timing_header_reports_db_time(setup_data):
+    """Every response carries a db Server-Timing entry."""
+    response = client.get("/users", headers={"Authorization": f"Bearer {create_access_token({'sub': str(setup_data['user'].id)})}"})
+    assert "db;dur=" in response.headers["Server-Timing"]
+    assert query_count(response) >= 1
@@ -0,0 +1,29 @@
+import time
+from task.database import WriteStickiness
+
+
+def test_recent_writer_reads_from_primary():
+    """A client that just wrote stays on the primary for the stickiness window."""
+    stickiness = WriteStickiness(window=0.05)
+    assert not stickiness.is_sticky(None)
+    assert not stickiness.is_sticky("not a time")
+
+    marker = stickiness.marker()
+    assert stickiness.is_sticky(marker)
+
+    time.sleep(0.06)
+    assert not stickiness.is_sticky(marker)
+
+
+def test_marker_is_read_from_header_or_cookie():
+    """Any worker can honour the marker: it travels with the request, not in process memory."""
+    class FakeRequest:
+        def __init__(self, headers=None, cookies=None):
+            self.headers = headers or {}
+            self.cookies = cookies or {}
+
+    stickiness = WriteStickiness(window=5)
+    marker = stickiness.marker()
+    assert stickiness.is_sticky(stickiness.request_marker(FakeRequest(headers={stickiness.header: marker})))
+    assert stickiness.is_sticky(stickiness.request_marker(FakeRequest(cookies={stickiness.cookie: marker})))
+    assert not stickiness.is_sticky(stickiness.request_marker(FakeRequest()))
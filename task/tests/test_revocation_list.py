@@ -0,0 +1,30 @@
+from datetime import datetime, timedelta
+from task.utils.revocation import RevocationList
+
+
+class FailingSession:
+    """Stands in for a session whose database is unreachable."""
+    def __enter__(self):
+        raise RuntimeError("database unavailable")
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class RecordingSession:
+    def __init__(self):
+        self.merged = []
+
+    def merge(self, row):
+        self.merged.append(row)
+
+
+def test_failed_rebuild_keeps_the_previous_filter():
+    """A sync that cannot reach the database neither fails the caller nor forgets revoked jtis."""
+    revocations = RevocationList(capacity=100, session_factory=FailingSession)
+    revocations.revoke(RecordingSession(), "revoked-jti", datetime.utcnow() + timedelta(hours=1))
+
+    revocations._maybe_sync()
+    assert "revoked-jti" in revocations._bloom
+    assert revocations._last_sync is not None
+    assert revocations._last_rebuild is None  # Retried on the next interval
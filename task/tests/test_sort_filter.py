@@ -1,5 +1,6 @@
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from task.main import app
 from task.database import get_db, SessionLocal
@@ -7,6 +8,7 @@ from task.models import User, Team, Task, Role, TeamMembership
 from task.hashing import get_password_hash
 from datetime import datetime, timedelta
 from task.auth import create_access_token
+from task.utils.pagination import encode_cursor
 
 @pytest.fixture(scope="module")
 def client():
@@ -135,10 +137,109 @@ def test_sort_filter(client, db_session, setup_data):
     task_priorities = [priority_mapping[task["priority"]] for task in tasks]
     assert task_priorities[0] >= task_priorities[1]
 
-    # # ✅ Test invalid sort field
-    # response = client.get("/task/sortfilter?sort_by=invalid_field", headers=headers)
-    # assert response.status_code == 422  # Unprocessable Entity for invalid field
+    # ✅ Test invalid sort field
+    response = client.get("/task/sortfilter?sort_by=invalid_field", headers=headers)
+    assert response.status_code == 422  # Unprocessable Entity for invalid field
 
-    # # ✅ Test invalid order field
-    # response = client.get("/task/sortfilter?order=invalid_order", headers=headers)
-    # assert response.status_code == 422  # Unprocessable Entity for invalid order
+    # ✅ Test invalid order field
+    response = client.get("/task/sortfilter?order=invalid_order", headers=headers)
+    assert response.status_code == 422  # Unprocessable Entity for invalid order
+
+
+def test_sort_filter_keyset_pagination(client, db_session, setup_data):
+    """Pages follow X-Next-Cursor without gaps or repeats."""
+    user = setup_data['user']
+    team = setup_data['team']
+    token = create_access_token({"sub": str(user.id)})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    created = [create_test_task(db_session, user, team) for _ in range(5)]
+
+    seen = []
+    url = "/task/sortfilter?sort_by=created_at&order=asc&limit=2"
+    response = client.get(url, headers=headers)
+    while True:
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page) <= 2
+        seen.extend(task["id"] for task in page)
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        response = client.get(f"{url}&cursor={cursor}", headers=headers)
+
+    assert len(seen) == len(set(seen))
+    assert {task.id for task in created} <= set(seen)
+
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+def test_sort_filter_pages_through_null_sort_values(client, db_session, setup_data, order):
+    """Rows whose sort column is NULL are paged through like any other, in both directions."""
+    user = setup_data['user']
+    team = setup_data['team']
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+
+    created = [create_test_task(db_session, user, team) for _ in range(5)]
+    # An explicit value overrides the column's onupdate default
+    db_session.execute(update(Task).where(Task.id.in_([task.id for task in created[:3]])).values(updated_at=None))
+    db_session.commit()
+
+    seen = []
+    url = f"/task/sortfilter?sort_by=updated_at&order={order}&limit=2"
+    response = client.get(url, headers=headers)
+    while True:
+        assert response.status_code == 200
+        seen.extend(task["id"] for task in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        response = client.get(f"{url}&cursor={cursor}", headers=headers)
+
+    assert len(seen) == len(set(seen))
+    assert {task.id for task in created} <= set(seen)
+
+
+def test_sort_filter_limit_is_capped(client, setup_data):
+    """Page sizes above the cap are rejected."""
+    token = create_access_token({"sub": str(setup_data['user'].id)})
+    response = client.get("/task/sortfilter?limit=100000", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 422
+
+
+def test_sort_filter_rejects_unknown_enum_values_and_mistyped_cursors(client, setup_data):
+    """Bad filter values are a 422 and cursor values of the wrong type a 400, never a 500."""
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(setup_data['user'].id)})}"}
+    assert client.get("/task/sortfilter?status=foo", headers=headers).status_code == 422
+    assert client.get("/task/sortfilter?priority=Urgent", headers=headers).status_code == 422
+
+    for sort_by, values in (("priority", ["Urgent", 1]), ("id", ["1"]), ("deadline", [None, 1])):
+        response = client.get("/task/sortfilter", params={"sort_by": sort_by, "cursor": encode_cursor(values)},
+                              headers=headers)
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid cursor"
+
+
+def test_sort_filter_in_lists_ranges_and_multi_sort(client, db_session, setup_data):
+    """IN-lists, range filters and multi-column sort combine into one query."""
+    user = setup_data['user']
+    team = setup_data['team']
+    token = create_access_token({"sub": str(user.id)})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    create_test_task(db_session, user, team, status="In Progress", priority="High")
+    create_test_task(db_session, user, team, status="In Review", priority="Low")
+    create_test_task(db_session, user, team, status="Completed", priority="Medium")
+
+    response = client.get("/task/sortfilter?status=In Progress&status=In Review&sort_by=-priority,created_at",
+                          headers=headers)
+    assert response.status_code == 200
+    tasks = response.json()
+    assert {task["status"] for task in tasks} <= {"In Progress", "In Review"}
+    priority_mapping = {"Low": 1, "Medium": 2, "High": 3}
+    task_priorities = [priority_mapping[task["priority"]] for task in tasks]
+    assert task_priorities == sorted(task_priorities, reverse=True)
+
+    tomorrow = (datetime.utcnow() + timedelta(days=1)).isoformat()
+    response = client.get(f"/task/sortfilter?deadline_to={tomorrow}&overdue=true", headers=headers)
+    assert response.status_code == 200
+    assert all(task["status"] != "Completed" for task in response.json())
@@ -0,0 +1,26 @@
+from sqlalchemy import create_engine, text
+from task.utils.sql_instrumentation import count_queries
+
+
+def test_statements_are_counted_and_repeats_flagged(tmp_path):
+    """Identical statements repeated in one block are reported as N+1 suspects."""
+    engine = create_engine(f"sqlite:///{tmp_path}/count.db")
+    with count_queries() as stats:
+        with engine.connect() as connection:
+            for i in range(6):
+                connection.execute(text("SELECT :i"), {"i": i})
+            connection.execute(text("SELECT 'once'"))
+
+    assert stats.count == 7
+    assert stats.n_plus_one_suspects(threshold=5) == [("SELECT ?", 6)]
+    assert stats.server_timing().endswith('desc="7 queries"')
+
+
+def test_nothing_is_recorded_outside_a_block(tmp_path):
+    """Statements outside count_queries are not attributed to anything."""
+    engine = create_engine(f"sqlite:///{tmp_path}/count.db")
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    with count_queries() as stats:
+        pass
+    assert stats.count == 0
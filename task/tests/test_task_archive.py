@@ -0,0 +1,105 @@
+import pytest
+from fastapi.testclient import TestClient
+from task.main import app
+from task.database import SessionLocal
+from task.models import User, Team, Task, TaskArchive, TaskEvent, ChangeCounter
+from task.hashing import get_password_hash
+from datetime import datetime, timedelta
+from task.auth import create_access_token
+from task.utils.task_archive import TaskArchiver
+
+client = TestClient(app)
+
+@pytest.fixture(scope="function")
+def db_session():
+    """Provides a new test database session for each test."""
+    db = SessionLocal()
+    yield db
+    db.rollback()
+    db.close()
+
+@pytest.fixture(scope="function")
+def setup_data(db_session):
+    """Setup test data: one old completed task, one recent completed task, one open task."""
+    test_user = User(email="archive@example.com", hashed_password=get_password_hash("testpassword"))
+    test_team = Team(name="Archive Team")
+    db_session.add_all([test_user, test_team])
+    db_session.commit()
+
+    long_ago = datetime.utcnow() - timedelta(days=365)
+    tasks = {
+        "old_done": Task(title="Archive old done", status="Completed", updated_at=long_ago),
+        "new_done": Task(title="Archive new done", status="Completed"),
+        "old_open": Task(title="Archive old open", status="In Progress", updated_at=long_ago),
+    }
+    for task in tasks.values():
+        task.description = ""
+        task.priority = "Low"
+        task.deadline = long_ago
+        task.creator_id = test_user.id
+        task.assignee_id = test_user.id
+        task.team_id = test_team.id
+    db_session.add_all(tasks.values())
+    db_session.commit()
+    # updated_at is stamped by onupdate on every flush; pin it for the old rows
+    db_session.query(Task).filter(Task.id.in_([tasks["old_done"].id, tasks["old_open"].id])) \
+        .update({Task.updated_at: long_ago}, synchronize_session=False)
+    db_session.commit()
+
+    yield {"user": test_user, "team": test_team, "tasks": tasks}
+
+    db_session.query(TaskArchive).filter_by(team_id=test_team.id).delete()
+    db_session.query(TaskEvent).filter_by(team_id=test_team.id).delete()
+    db_session.query(ChangeCounter).filter(ChangeCounter.scope.in_(
+        ["org:None", f"team:{test_team.id}", f"user:{test_user.id}"])).delete(synchronize_session=False)
+    db_session.query(Task).filter_by(team_id=test_team.id).delete()
+    db_session.query(Team).filter_by(id=test_team.id).delete()
+    db_session.query(User).filter_by(id=test_user.id).delete()
+    db_session.commit()
+
+
+def test_archiver_moves_only_old_completed_tasks(db_session, setup_data):
+    team = setup_data["team"]
+    old_done = setup_data["tasks"]["old_done"]
+
+    moved = TaskArchiver(SessionLocal, after_days=30, batch_size=1).run_once()
+    assert moved >= 1
+
+    assert db_session.query(Task).filter_by(id=old_done.id).first() is None
+    assert db_session.query(TaskArchive).filter_by(id=old_done.id, team_id=team.id).count() == 1
+    hot_titles = {task.title for task in db_session.query(Task).filter_by(team_id=team.id)}
+    assert hot_titles == {"Archive new done", "Archive old open"}
+    assert db_session.query(TaskEvent).filter_by(task_id=old_done.id, event_type="archived").count() == 1
+
+
+def test_archived_tasks_only_listed_on_request(setup_data):
+    user = setup_data["user"]
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+    TaskArchiver(SessionLocal, after_days=30).run_once()
+
+    hot = client.get("/dashboard/user-dashboard", headers=headers).json()
+    assert "Archive old done" not in {task["title"] for task in hot["assigned_tasks"]}
+
+    everything = client.get("/dashboard/user-dashboard", params={"include_archived": True}, headers=headers).json()
+    assert "Archive old done" in {task["title"] for task in everything["assigned_tasks"]}
+
+    listed = client.get("/task/sortfilter", params={"include_archived": True, "status": "Completed"},
+                        headers=headers).json()
+    assert "Archive old done" in {task["title"] for task in listed}
+
+
+def test_export_and_search_keep_archived_tasks(setup_data):
+    """Exports include archived tasks by default; search finds them when asked to."""
+    user = setup_data["user"]
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+    TaskArchiver(SessionLocal, after_days=30).run_once()
+
+    exported = client.get("/task/export", headers=headers).text
+    assert "Archive old done" in exported
+    live_only = client.get("/task/export", params={"include_archived": False}, headers=headers).text
+    assert "Archive old done" not in live_only
+
+    found = client.get("/task/search", params={"q": "archive done", "include_archived": True}, headers=headers).json()
+    assert "Archive old done" in {task["title"] for task in found}
+    found = client.get("/task/search", params={"q": "archive done"}, headers=headers).json()
+    assert "Archive old done" not in {task["title"] for task in found}
@@ -0,0 +1,82 @@
+import pytest
+from fastapi.testclient import TestClient
+from task.main import app
+from task.database import SessionLocal
+from task.models import User, Team, Task, Organization, TaskEvent, ChangeCounter
+from task.hashing import get_password_hash
+from datetime import datetime
+from task.auth import create_access_token
+
+client = TestClient(app)
+
+@pytest.fixture(scope="function")
+def db_session():
+    """Provides a new test database session for each test."""
+    db = SessionLocal()
+    yield db
+    db.rollback()
+    db.close()
+
+@pytest.fixture(scope="function")
+def setup_data(db_session):
+    """Setup test data: an organization with an admin user and a team."""
+    organization = Organization(name="Changes Org")
+    db_session.add(organization)
+    db_session.commit()
+    db_session.refresh(organization)
+
+    test_user = User(
+        email="changes@example.com",
+        hashed_password=get_password_hash("testpassword"),
+        role="admin",
+        organization_id=organization.id,
+    )
+    db_session.add(test_user)
+    db_session.commit()
+    db_session.refresh(test_user)
+
+    test_team = Team(name="Changes Team", organization_id=organization.id)
+    db_session.add(test_team)
+    db_session.commit()
+    db_session.refresh(test_team)
+
+    yield {"user": test_user, "team": test_team, "organization": organization}
+
+    db_session.query(TaskEvent).filter_by(organization_id=organization.id).delete()
+    db_session.query(ChangeCounter).filter(ChangeCounter.scope.in_(
+        [f"org:{organization.id}", f"team:{test_team.id}", f"user:{test_user.id}"])).delete(synchronize_session=False)
+    db_session.query(Task).filter_by(team_id=test_team.id).delete()
+    db_session.query(Team).filter_by(id=test_team.id).delete()
+    db_session.query(User).filter_by(id=test_user.id).delete()
+    db_session.query(Organization).filter_by(id=organization.id).delete()
+    db_session.commit()
+
+
+def test_changes_feed_follows_task_writes(setup_data):
+    """Create and delete each append an event; the feed resumes from next_since."""
+    user = setup_data["user"]
+    team = setup_data["team"]
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+
+    start = client.get("/task/changes", headers=headers).json()
+    assert start["events"] == []
+
+    task_data = {
+        "title": "Outbox Task",
+        "description": "Tracked",
+        "status": "Not Started",
+        "priority": "Low",
+        "deadline": datetime.utcnow().isoformat(),
+        "organization_id": setup_data["organization"].id,
+    }
+    created = client.post(f"/task/{team.id}/create-task", json=task_data, headers=headers).json()
+    client.request("DELETE", f"/task/{team.id}/delete-task", json={"task_id": created["id"]}, headers=headers)
+
+    feed = client.get("/task/changes", params={"since": start["next_since"], "limit": 1}, headers=headers).json()
+    assert [(event["event_type"], event["task_id"]) for event in feed["events"]] == [("created", created["id"])]
+    assert feed["events"][0]["payload"]["title"] == "Outbox Task"
+    assert feed["has_more"] is True
+
+    rest = client.get("/task/changes", params={"since": feed["next_since"]}, headers=headers).json()
+    assert [event["event_type"] for event in rest["events"]] == ["deleted"]
+    assert rest["has_more"] is False
@@ -0,0 +1,77 @@
+import csv
+import io
+import json
+import pytest
+from fastapi.testclient import TestClient
+from task.main import app
+from task.database import SessionLocal
+from task.models import User, Team, Task, Organization
+from task.hashing import get_password_hash
+from datetime import datetime
+from task.auth import create_access_token
+
+client = TestClient(app)
+
+@pytest.fixture(scope="function")
+def db_session():
+    """Provides a new test database session for each test."""
+    db = SessionLocal()
+    yield db
+    db.rollback()
+    db.close()
+
+@pytest.fixture(scope="function")
+def setup_data(db_session):
+    """Setup test data: an organization with a user, a team and a few tasks."""
+    organization = Organization(name="Export Org")
+    db_session.add(organization)
+    db_session.commit()
+    db_session.refresh(organization)
+
+    test_user = User(
+        email="export@example.com",
+        hashed_password=get_password_hash("testpassword"),
+        organization_id=organization.id,
+    )
+    test_team = Team(name="Export Team", organization_id=organization.id)
+    db_session.add_all([test_user, test_team])
+    db_session.commit()
+
+    db_session.add_all([Task(title=f"Export {i}", description="with, comma", status="Not Started",
+                             priority="Low", deadline=datetime.utcnow(), creator_id=test_user.id,
+                             team_id=test_team.id, organization_id=organization.id)
+                        for i in range(3)])
+    db_session.commit()
+
+    yield {"user": test_user, "organization": organization}
+
+    db_session.query(Task).filter_by(team_id=test_team.id).delete()
+    db_session.query(Team).filter_by(id=test_team.id).delete()
+    db_session.query(User).filter_by(id=test_user.id).delete()
+    db_session.query(Organization).filter_by(id=organization.id).delete()
+    db_session.commit()
+
+
+def test_export_ndjson_and_csv(setup_data):
+    """Both formats stream every task of the organization."""
+    user = setup_data["user"]
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+
+    response = client.get("/task/export", params={"format": "ndjson"}, headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(row["title"] for row in rows) == ["Export 0", "Export 1", "Export 2"]
+    assert rows[0]["status"] == "Not Started"
+
+    response = client.get("/task/export", params={"format": "csv"}, headers=headers)
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 3
+    assert rows[0]["description"] == "with, comma"
+
+
+def test_export_rejects_unknown_format(setup_data):
+    user = setup_data["user"]
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+    assert client.get("/task/export", params={"format": "xml"}, headers=headers).status_code == 422
@@ -0,0 +1,99 @@
+import io
+import pytest
+from fastapi.testclient import TestClient
+from task.main import app
+from task.database import SessionLocal
+from task.models import User, Team, Task, Organization, TaskEvent, ChangeCounter
+from task.hashing import get_password_hash
+from task.auth import create_access_token
+from task.utils.task_import import read_rows
+
+client = TestClient(app)
+
+@pytest.fixture(scope="function")
+def db_session():
+    """Provides a new test database session for each test."""
+    db = SessionLocal()
+    yield db
+    db.rollback()
+    db.close()
+
+@pytest.fixture(scope="function")
+def setup_data(db_session):
+    """Setup test data: an organization with an admin and a team."""
+    organization = Organization(name="Import Org")
+    db_session.add(organization)
+    db_session.commit()
+    db_session.refresh(organization)
+
+    admin = User(email="importadmin@example.com", hashed_password=get_password_hash("testpassword"),
+                 role="admin", organization_id=organization.id)
+    team = Team(name="Import Team", organization_id=organization.id)
+    db_session.add_all([admin, team])
+    db_session.commit()
+
+    yield {"admin": admin, "team": team, "organization": organization}
+
+    db_session.query(TaskEvent).filter_by(organization_id=organization.id).delete()
+    db_session.query(ChangeCounter).filter(ChangeCounter.scope.in_(
+        [f"org:{organization.id}", f"team:{team.id}", f"user:{admin.id}"])).delete(synchronize_session=False)
+    db_session.query(Task).filter_by(team_id=team.id).delete()
+    db_session.query(Team).filter_by(id=team.id).delete()
+    db_session.query(User).filter_by(id=admin.id).delete()
+    db_session.query(Organization).filter_by(id=organization.id).delete()
+    db_session.commit()
+
+
+def test_read_rows_csv_treats_empty_cells_as_missing():
+    stream = io.StringIO("title,description,assignee_id\nA,,\n")
+    assert list(read_rows(stream, "csv")) == [(2, {"title": "A", "description": ""})]
+
+
+def test_import_loads_valid_rows_and_reports_rejects(db_session, setup_data):
+    """Valid rows land in tasks; bad, duplicate and unknown-team rows are reported by line."""
+    admin = setup_data["admin"]
+    team = setup_data["team"]
+    organization_id = setup_data["organization"].id
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(admin.id), 'role': 'admin'})}"}
+
+    header = "title,description,status,priority,deadline,team_id,organization_id\n"
+    rows = [
+        f"Imported one,First,Not Started,Low,2030-01-01T00:00:00,{team.id},{organization_id}",
+        f"Imported two,Second,In Progress,High,2030-01-02T00:00:00,{team.id},{organization_id}",
+        f"Imported bad,Third,Unknown,High,2030-01-02T00:00:00,{team.id},{organization_id}",
+        f"Imported one,Again,Not Started,Low,2030-01-01T00:00:00,{team.id},{organization_id}",
+        f"Imported orphan,Lost,Not Started,Low,2030-01-01T00:00:00,-1,{organization_id}",
+    ]
+    body = (header + "\n".join(rows) + "\n").encode()
+    response = client.post("/task/import", files={"file": ("tasks.csv", body, "text/csv")}, headers=headers)
+    assert response.status_code == 200, response.json()
+
+    report = response.json()
+    assert (report["read"], report["imported"], report["rejected"]) == (5, 2, 3)
+    assert sorted(reject["line"] for reject in report["rejects"]) == [4, 5, 6]
+    titles = {task.title for task in db_session.query(Task).filter_by(team_id=team.id)}
+    assert titles == {"Imported one", "Imported two"}
+    assert db_session.query(TaskEvent).filter_by(organization_id=organization_id, event_type="created").count() == 2
+
+
+def test_import_rejects_teams_of_another_organization(db_session, setup_data):
+    """A row stamped with the admin's organization cannot land in another organization's team."""
+    admin = setup_data["admin"]
+    organization_id = setup_data["organization"].id
+    other_team = Team(name="Import Other Team")
+    db_session.add(other_team)
+    db_session.commit()
+    try:
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': str(admin.id), 'role': 'admin'})}"}
+        body = ("title,deadline,team_id,organization_id\n"
+                f"Imported elsewhere,2030-01-01T00:00:00,{other_team.id},{organization_id}\n").encode()
+        response = client.post("/task/import", files={"file": ("tasks.csv", body, "text/csv")}, headers=headers)
+        assert response.status_code == 200, response.json()
+
+        report = response.json()
+        assert (report["imported"], report["rejected"]) == (0, 1)
+        assert report["rejects"][0]["errors"] == ["Team belongs to another organization"]
+        assert db_session.query(Task).filter_by(team_id=other_team.id).count() == 0
+    finally:
+        db_session.query(Team).filter_by(id=other_team.id).delete()
+        db_session.commit()
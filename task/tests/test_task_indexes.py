@@ -0,0 +1,51 @@
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.dialects import postgresql
+from task.database import SessionLocal
+from task.models import Task, TaskStatus, TeamMembership
+
+"""
+    EXPLAIN checks that each dashboard query is answered from the index built for it.
+    Sequential scans are disabled so the planner picks an index whenever one
+    applies, regardless of how small the test tables are.
+"""
+
+# name -> (the statement the route issues, the indexes that may serve it)
+DASHBOARD_QUERIES = {
+    "user_dashboard assigned": (select(Task).where(Task.assignee_id == 1), ("ix_tasks_assignee_id_status",)),
+    "user_dashboard created": (select(Task).where(Task.creator_id == 1), ("ix_tasks_creator_id",)),
+    "user_dashboard review": (select(Task).where(Task.reviewer_id == 1), ("ix_tasks_reviewer_id",)),
+    "team_dashboard in progress": (select(Task).where(Task.assignee_id == 1, Task.status == TaskStatus.IN_PROGRESS),
+                                   ("ix_tasks_assignee_id_status",)),
+    "team_dashboard awaiting": (select(Task).where(Task.assignee_id == 1, Task.status == TaskStatus.IN_REVIEW),
+                                ("ix_tasks_assignee_id_status",)),
+    "admin_dashboard recent": (select(Task).order_by(Task.created_at.desc()), ("ix_tasks_created_at",)),
+    "organization dashboard": (select(Task).where(Task.organization_id == 1),
+                               ("ix_tasks_organization_id_created_at", "ix_tasks_organization_id_deadline")),
+    "sortfilter by created_at": (select(Task).where(Task.organization_id == 1).order_by(Task.created_at, Task.id).limit(50),
+                                 ("ix_tasks_organization_id_created_at",)),
+    "sortfilter by deadline": (select(Task).where(Task.organization_id == 1).order_by(Task.deadline, Task.id).limit(50),
+                               ("ix_tasks_organization_id_deadline",)),
+    "update_task team members": (select(TeamMembership).where(TeamMembership.team_id == 1),
+                                 ("uq_team_memberships_team_id_user_id",)),
+    "team status": (select(Task).where(Task.team_id == 1, Task.status == TaskStatus.COMPLETED),
+                    ("ix_tasks_team_id_status",)),
+    "deadline scheduler window": (select(Task.id).where(Task.deadline > "2026-01-01", Task.deadline <= "2026-01-02"),
+                                  ("ix_tasks_deadline",)),
+}
+
+@pytest.fixture(scope="function")
+def db_session():
+    db = SessionLocal()
+    db.execute(text("SET LOCAL enable_seqscan = off"))
+    yield db
+    db.rollback()
+    db.close()
+
+@pytest.mark.parametrize("name", sorted(DASHBOARD_QUERIES))
+def test_dashboard_query_uses_index(db_session, name):
+    """The plan for each dashboard query scans one of the indexes built for it."""
+    statement, indexes = DASHBOARD_QUERIES[name]
+    sql = statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    plan = "\n".join(row[0] for row in db_session.execute(text(f"EXPLAIN {sql}")))
+    assert any(f" {index} " in f"{plan} " for index in indexes), f"{name} does not use {' or '.join(indexes)}:\n{plan}"
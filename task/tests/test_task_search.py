@@ -0,0 +1,93 @@
+import pytest
+from fastapi.testclient import TestClient
+from task.main import app
+from task.database import SessionLocal
+from task.models import User, Team, Task
+from task.hashing import get_password_hash
+from datetime import datetime
+from task.auth import create_access_token
+
+@pytest.fixture(scope="module")
+def client():
+    """Create a Test Client for FastAPI."""
+    return TestClient(app)
+
+@pytest.fixture(scope="function")
+def db_session():
+    """Provides a new test database session for each test."""
+    db = SessionLocal()
+    yield db
+    db.rollback()
+    db.close()
+
+@pytest.fixture(scope="function")
+def setup_data(db_session):
+    """Setup test data: a user, a team and three tasks with distinct text."""
+    test_user = User(
+        email="searchuser@example.com",
+        hashed_password=get_password_hash("testpassword")
+    )
+    db_session.add(test_user)
+    db_session.commit()
+    db_session.refresh(test_user)
+
+    test_team = Team(name="Search Team")
+    db_session.add(test_team)
+    db_session.commit()
+    db_session.refresh(test_team)
+
+    for title, description in (
+        ("Fix login timeout", "Login page times out on slow networks"),
+        ("Write release notes", "Mention the login fix in passing"),
+        ("Refactor billing", "Split invoices into their own module"),
+    ):
+        db_session.add(Task(
+            title=title,
+            description=description,
+            status="Not Started",
+            priority="Medium",
+            deadline=datetime.utcnow(),
+            creator_id=test_user.id,
+            assignee_id=test_user.id,
+            team_id=test_team.id,
+        ))
+    db_session.commit()
+
+    yield {"user": test_user, "team": test_team}
+
+    db_session.query(Task).filter_by(team_id=test_team.id).delete()
+    db_session.query(Team).filter_by(id=test_team.id).delete()
+    db_session.query(User).filter_by(id=test_user.id).delete()
+    db_session.commit()
+
+
+def test_search_ranks_title_matches_first(client, setup_data):
+    """Tasks mentioning the term more often rank higher; non-matching tasks are left out."""
+    token = create_access_token({"sub": str(setup_data["user"].id)})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.get("/task/search", params={"q": "login"}, headers=headers)
+    assert response.status_code == 200
+    titles = [hit["title"] for hit in response.json()]
+    assert titles == ["Fix login timeout", "Write release notes"]
+    assert response.json()[0]["rank"] >= response.json()[1]["rank"]
+
+
+def test_search_supports_exclusion_and_paging(client, setup_data):
+    """Web-search syntax is honoured and X-Next-Offset points at the next page."""
+    token = create_access_token({"sub": str(setup_data["user"].id)})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.get("/task/search", params={"q": "login -release"}, headers=headers)
+    assert [hit["title"] for hit in response.json()] == ["Fix login timeout"]
+
+    response = client.get("/task/search", params={"q": "login", "limit": 1}, headers=headers)
+    assert len(response.json()) == 1
+    assert response.headers["X-Next-Offset"] == "1"
+
+
+def test_search_requires_query(client, setup_data):
+    """An empty query is rejected."""
+    token = create_access_token({"sub": str(setup_data["user"].id)})
+    response = client.get("/task/search", params={"q": ""}, headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 422
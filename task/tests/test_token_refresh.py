@@ -0,0 +1,62 @@
+import pytest
+from fastapi.testclient import TestClient
+from task.main import app
+from task.database import SessionLocal
+from task.models import User, RefreshToken
+from task.hashing import get_password_hash
+
+client = TestClient(app)
+
+@pytest.fixture(scope="function")
+def db_session():
+    """Provides a database session for tests and handles cleanup."""
+    db = SessionLocal()
+    yield db
+    db.close()
+
+@pytest.fixture(scope="function")
+def test_user(db_session):
+    """Sets up a test user in the database."""
+    test_user = User(
+        email="refreshuser@example.com",
+        hashed_password=get_password_hash("testpassword")
+    )
+    db_session.add(test_user)
+    db_session.commit()
+    yield test_user
+    db_session.query(RefreshToken).filter(RefreshToken.user_id == test_user.id).delete()
+    db_session.query(User).filter(User.id == test_user.id).delete()
+    db_session.commit()
+
+def login(email="refreshuser@example.com", password="testpassword"):
+    response = client.post("/login", json={"email": email, "password": password})
+    assert response.status_code == 200, f"Login failed: {response.json()}"
+    return response.json()
+
+def test_refresh_returns_new_tokens(db_session, test_user):
+    """A valid refresh token yields a working access token and a rotated refresh token."""
+    tokens = login()
+    response = client.post("/token/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+    data = response.json()
+    assert data["refresh_token"] != tokens["refresh_token"]
+
+    headers = {"Authorization": f"Bearer {data['access_token']}"}
+    assert client.get("/users", headers=headers).status_code == 200
+
+def test_refresh_token_reuse_revokes_family(db_session, test_user):
+    """Replaying a rotated refresh token revokes every token of that login."""
+    tokens = login()
+    rotated = client.post("/token/refresh", json={"refresh_token": tokens["refresh_token"]}).json()
+
+    replay = client.post("/token/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert replay.status_code == 401
+    assert replay.json()["detail"] == "Refresh token reuse detected"
+
+    response = client.post("/token/refresh", json={"refresh_token": rotated["refresh_token"]})
+    assert response.status_code == 401
+
+def test_refresh_with_invalid_token(db_session):
+    """Garbage tokens are rejected."""
+    response = client.post("/token/refresh", json={"refresh_token": "not-a-token"})
+    assert response.status_code == 401
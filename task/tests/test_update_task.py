@@ -4,8 +4,9 @@ from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 from task.main import app  # FastAPI app instance
 from task.database import get_db, SessionLocal
-from task.models import Team, Task, TeamMembership, Role, User
+from task.models import Team, Task, TeamMembership, Role, User, Permission
 from task.hashing import get_password_hash
+from task.auth import create_access_token
 
 client = TestClient(app)
 
@@ -114,4 +115,34 @@ def test_update_task(db_session, setup_data):
     
     # Step 6: Cleanup the created task
     db_session.query(Task).filter_by(id=created_task["id"]).delete()
-    db_session.commit()
\ No newline at end of file
+    db_session.commit()
+
+
+def test_update_task_if_match(db_session, setup_data):
+    """Updates carry an ETag, and a stale If-Match is answered with 412."""
+    test_user = setup_data["user"]
+    test_team = setup_data["team"]
+    db_session.add(Permission(user_id=test_user.id, read=True, write=True, update=True))
+    task = Task(title="Versioned Task", description="v0", status="Not Started", priority="Low",
+                deadline=datetime.utcnow(), creator_id=test_user.id, team_id=test_team.id)
+    db_session.add(task)
+    db_session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(test_user.id)})}"}
+    update_data = {"task_id": task.id, "description": "v1", "priority": "High", "status": "In Progress"}
+
+    first = client.put(f"/task/{test_team.id}/update-task", json=update_data,
+                       headers={**headers, "If-Match": f'"{task.id}-0"'})
+    assert first.status_code == 200
+    assert first.headers["ETag"] == f'"{task.id}-1"'
+
+    stale = client.put(f"/task/{test_team.id}/update-task", json={**update_data, "description": "v2"},
+                       headers={**headers, "If-Match": f'"{task.id}-0"'})
+    assert stale.status_code == 412
+
+    current = client.put(f"/task/{test_team.id}/update-task", json={**update_data, "description": "v2"},
+                         headers={**headers, "If-Match": first.headers["ETag"]})
+    assert current.status_code == 200
+    assert current.json()["description"] == "v2"
+
+    db_session.query(Permission).filter_by(user_id=test_user.id).delete()
+    db_session.commit()
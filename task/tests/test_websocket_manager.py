@@ -0,0 +1,130 @@
+import asyncio
+from task.utils.websocket_manager import WebSocketManager, skipped_notice
+
+
+class FakeWebSocket:
+    """Stands in for a client connection; `stall` blocks sends until released, `broken` fails them."""
+    def __init__(self, stall=False, broken=False):
+        self.stall = asyncio.Event() if stall else None
+        self.broken = broken
+        self.received = []
+        self.closed = False
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, payload):
+        if self.stall is not None:
+            await self.stall.wait()
+        if self.broken:
+            raise RuntimeError("Cannot call send once a close message has been sent.")
+        self.received.append(payload)
+
+    async def close(self):
+        self.closed = True
+
+
+def test_every_connection_of_a_user_gets_the_message():
+    """A second tab no longer replaces the first; disconnecting one keeps the other."""
+    async def run():
+        manager = WebSocketManager()
+        first, second = FakeWebSocket(), FakeWebSocket()
+        await manager.connect(1, first)
+        await manager.connect(1, second)
+        assert await manager.send_personal_message(1, "hello") == (2, 0)
+        await manager.drain(timeout=1)
+
+        await manager.disconnect(1, first)
+        assert await manager.send_personal_message(1, "again") == (1, 0)
+        await manager.drain(timeout=1)
+        await manager.disconnect(1, second)
+        assert manager.active_connections == {}
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first.received == ["hello"]
+    assert second.received == ["hello", "again"]
+
+
+def test_broadcast_does_not_wait_for_slow_clients():
+    """Messages are queued per connection; a stalled send is evicted on timeout, a failing one at once."""
+    async def run():
+        manager = WebSocketManager(send_timeout=0.05)
+        healthy, stalled, broken = FakeWebSocket(), FakeWebSocket(stall=True), FakeWebSocket(broken=True)
+        await manager.connect(1, healthy)
+        await manager.connect(2, stalled)
+        await manager.connect(3, broken)
+        result = await asyncio.wait_for(manager.broadcast_to_team([1, 2, 3, 4], "update"), timeout=0.01)
+        await manager.drain(timeout=1)
+        return manager, result, healthy, stalled, broken
+
+    manager, result, healthy, stalled, broken = asyncio.run(run())
+    assert result == (3, 0)
+    assert healthy.received == ["update"]
+    assert stalled.closed and broken.closed
+    assert list(manager.active_connections) == [1]
+    assert manager.snapshot()["evicted"] == 2
+
+
+def overflow(policy):
+    """Queue five messages on a stalled connection that holds two, then let it catch up."""
+    async def run():
+        manager = WebSocketManager(max_queue=2, overflow_policy=policy)
+        websocket = FakeWebSocket(stall=True)
+        await manager.connect(1, websocket)
+        results = []
+        for index in range(5):
+            results.append(await manager.send_personal_message(1, f"m{index}"))
+            await asyncio.sleep(0)
+        stats = manager.snapshot()
+        websocket.stall.set()
+        await manager.drain(timeout=1)
+        return websocket, results, stats, manager.snapshot()
+
+    return asyncio.run(run())
+
+
+def test_overflow_drop_oldest():
+    """The oldest queued messages give way; the in-flight one still completes."""
+    websocket, results, stats, after = overflow("drop_oldest")
+    assert results == [(1, 0)] * 5
+    assert stats["queued"] == 2 and stats["max_queue_depth"] == 2
+    assert websocket.received == ["m0", "m3", "m4"]
+    assert after["dropped"] == 2 and after["queued"] == 0
+
+
+def test_overflow_coalesce():
+    """A full backlog collapses into one skipped notice ahead of the messages queued after it."""
+    websocket, results, stats, after = overflow("coalesce")
+    assert websocket.received == ["m0", skipped_notice(2), "m3", "m4"]
+    assert after["dropped"] == 2
+
+
+def test_overflow_disconnect():
+    """A connection that cannot keep up is closed and stops receiving."""
+    websocket, results, stats, after = overflow("disconnect")
+    assert results[-1] == (0, 0)
+    assert (0, 1) in results
+    assert websocket.closed
+    assert after["connections"] == 0 and after["evicted"] == 1
+
+
+def test_payload_is_serialized_once_per_broadcast(monkeypatch):
+    """Non-string messages are encoded as JSON a single time for all recipients."""
+    import task.utils.websocket_manager as websocket_manager
+    calls = []
+    original = websocket_manager.serialize
+    monkeypatch.setattr(websocket_manager, "serialize", lambda message: calls.append(message) or original(message))
+
+    async def run():
+        manager = WebSocketManager()
+        sockets = [FakeWebSocket() for _ in range(5)]
+        for user_id, websocket in enumerate(sockets):
+            await manager.connect(user_id, websocket)
+        await manager.broadcast_to_team(range(5), {"task_id": 1, "status": "Completed"})
+        await manager.drain(timeout=1)
+        return sockets
+
+    sockets = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(websocket.received == ['{"task_id": 1, "status": "Completed"}'] for websocket in sockets)
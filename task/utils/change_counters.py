@@ -0,0 +1,49 @@
+from typing import Iterable, Optional
+from fastapi import Request, Response
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from task.models import ChangeCounter
+from task.utils.etag import make_etag, etag_matches
+
+
+def task_scopes(organization_id=None, team_id=None, user_ids: Iterable = ()):
+    """Counter scopes whose cached views a write to a task invalidates."""
+    scopes = {f"user:{user_id}" for user_id in user_ids if user_id is not None}
+    scopes.add(f"org:{organization_id}")  # "org:None" covers tasks outside any organization
+    if team_id is not None:
+        scopes.add(f"team:{team_id}")
+    return scopes
+
+
+def bump_change_counters(db, scopes: Iterable[str]):
+    """
+        Increment the counters for `scopes` inside the caller's transaction.
+
+        One upsert covers every scope; rows are written in a fixed order so concurrent
+        writers touching overlapping scopes cannot deadlock.
+    """
+    scopes = sorted(set(scopes))
+    if not scopes:
+        return
+    statement = insert(ChangeCounter).values([{"scope": scope, "value": 1} for scope in scopes])
+    statement = statement.on_conflict_do_update(index_elements=[ChangeCounter.scope],
+                                                set_={"value": ChangeCounter.value + 1})
+    db.execute(statement)
+
+
+def read_change_counter(db, scope: str) -> int:
+    return db.scalar(select(ChangeCounter.value).where(ChangeCounter.scope == scope)) or 0
+
+
+def check_not_modified(request: Request, response: Response, *etag_parts) -> Optional[Response]:
+    """
+        Set the ETag on `response` and return a 304 response when the client already has it.
+
+        Routes return the 304 as-is, before running any of their own queries.
+    """
+    etag = make_etag(*etag_parts)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("If-None-Match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,293 @@
+import asyncio
+import heapq
+import itertools
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import func, select
+from starlette.concurrency import run_in_threadpool
+from task.models import Task, TaskEvent, TaskStatus
+
+DEADLINE_REMINDERS_ENABLED = os.getenv("DEADLINE_REMINDERS_ENABLED", "true").lower() == "true"
+# Minutes before the deadline at which reminders go out; 0 is the deadline itself
+DEADLINE_REMINDER_OFFSETS = [int(minutes) for minutes in os.getenv("DEADLINE_REMINDER_OFFSETS", "1440,60,0").split(",")]
+# How far past the largest reminder offset deadlines are held in memory
+DEADLINE_WINDOW_HOURS = float(os.getenv("DEADLINE_WINDOW_HOURS", "6"))
+# How often the leader replays task_events written by other workers
+DEADLINE_SYNC_SECONDS = float(os.getenv("DEADLINE_SYNC_SECONDS", "5"))
+# Outbox rows re-read on every sync: events of different organizations can commit out of seq order
+DEADLINE_SYNC_OVERLAP = int(os.getenv("DEADLINE_SYNC_OVERLAP", "200"))
+DEADLINE_LEADER_RETRY_SECONDS = float(os.getenv("DEADLINE_LEADER_RETRY_SECONDS", "30"))
+# Session-level advisory lock held by the one worker that fires reminders
+DEADLINE_LEADER_LOCK_KEY = 7212
+
+
+def _naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _describe(minutes: int) -> str:
+    if minutes == 0:
+        return "is due now"
+    for unit, size in (("day", 1440), ("hour", 60), ("minute", 1)):
+        if minutes % size == 0:
+            count = minutes // size
+            return f"is due in {count} {unit}{'s' if count != 1 else ''}"
+
+
+class DeadlineScheduler:
+    """
+        Fires deadline reminders from an in-memory heap through the notification dispatcher.
+
+        Only deadlines up to `loaded_until` are held in memory. That window is filled from
+        a range query on ix_tasks_deadline at startup and topped up as time advances,
+        never by scanning the table. Changed or cancelled tasks leave stale heap entries
+        behind; they are recognised by their generation number and skipped when they
+        reach the top.
+
+        With several app workers, only the one holding the DEADLINE_LEADER_LOCK_KEY
+        advisory lock loads a window and fires reminders; the others stay idle and take
+        over if the leader goes away. Writes served by the leader reach the heap at once
+        through schedule() and cancel(), which are safe to call from request threads.
+        Writes served by other workers reach it within DEADLINE_SYNC_SECONDS, from the
+        task_events outbox.
+    """
+    def __init__(self, offsets: Iterable[int] = DEADLINE_REMINDER_OFFSETS, window_hours: float = DEADLINE_WINDOW_HOURS,
+                 session_factory=None, sync_interval: float = DEADLINE_SYNC_SECONDS):
+        self.offsets = sorted(set(offsets), reverse=True)
+        self.lead = timedelta(minutes=max(self.offsets))
+        self.window = timedelta(hours=window_hours)
+        self.session_factory = session_factory
+        self.sync_interval = sync_interval
+        self.loaded_until: Optional[datetime] = None
+        self._loading_until: Optional[datetime] = None  # end of the window load in flight
+        self._heap: List[Tuple[datetime, int, int, int]] = []  # (fire_at, generation, task_id, offset)
+        # task_id -> (generation, deadline, title, recipients)
+        self._tasks: Dict[int, Tuple[int, datetime, str, List[int]]] = {}
+        self._touched: Dict[int, int] = {}  # task_id -> generation of its last schedule/cancel during a load
+        self._generations = itertools.count(1)
+        self._synced_seq: Optional[int] = None
+        self._recent_seqs: Set[int] = set()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._leader_connection = None
+        self._task = None
+
+    def _session(self):
+        if self.session_factory is None:
+            from task.database import SessionLocal
+            self.session_factory = SessionLocal
+        return self.session_factory()
+
+    def _put(self, task_id: int, deadline: datetime, title: str, recipients: List[int], generation: int, now: datetime):
+        pushed = False
+        for offset in self.offsets:
+            fire_at = deadline - timedelta(minutes=offset)
+            if fire_at > now:
+                heapq.heappush(self._heap, (fire_at, generation, task_id, offset))
+                pushed = True
+        # An overdue task has nothing left to fire; pop_due would never clear its entry
+        if pushed:
+            self._tasks[task_id] = (generation, deadline, title, recipients)
+        else:
+            self._tasks.pop(task_id, None)
+
+    def schedule(self, task_id: int, deadline: datetime, title: str, status, recipients: Iterable[Optional[int]]):
+        """Add or replace the reminders of a task; completed tasks are cancelled instead."""
+        if status == TaskStatus.COMPLETED:
+            self.cancel(task_id)
+            return
+        deadline = _naive_utc(deadline)
+        recipients = sorted({user_id for user_id in recipients if user_id is not None})
+        with self._lock:
+            # Before the first load (and on workers that are not the leader) nothing is held
+            horizon = max(filter(None, (self.loaded_until, self._loading_until)), default=None)
+            if horizon is None:
+                return
+            entry = self._tasks.get(task_id)
+            if entry is not None and entry[1:] == (deadline, title, recipients):
+                return
+            generation = next(self._generations)
+            # A load in flight skips rows touched after it started, so anything up to its
+            # end must go in now or it would be lost
+            if self._loading_until is not None:
+                self._touched[task_id] = generation
+            if deadline > horizon:
+                # Outside the window: a later window load will read it from the database
+                self._tasks.pop(task_id, None)
+                return
+            head = self._heap[0][0] if self._heap else None
+            self._put(task_id, deadline, title, recipients, generation, datetime.utcnow())
+            wake = head is None or self._heap[0][0] < head
+        if wake:
+            self._wake()
+
+    def cancel(self, task_id: int):
+        with self._lock:
+            # Only a load in flight needs to know, so it does not bring the task back
+            if self._loading_until is not None:
+                self._touched[task_id] = next(self._generations)
+            self._tasks.pop(task_id, None)
+
+    def _wake(self):
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def load_window(self):
+        """Read the deadlines that fall between the current horizon and the next one."""
+        now = datetime.utcnow()
+        start = self.loaded_until or now
+        end = now + self.lead + self.window
+        with self._lock:
+            started_at = next(self._generations)
+            self._loading_until = end
+        db = self._session()
+        try:
+            if self._synced_seq is None:
+                # Outbox replay starts from here; later events may repeat rows read below, which is harmless
+                self._synced_seq = db.scalar(select(func.coalesce(func.max(TaskEvent.seq), 0)))
+            rows = db.execute(
+                select(Task.id, Task.deadline, Task.title, Task.assignee_id, Task.reviewer_id, Task.creator_id)
+                .where(Task.deadline > start, Task.deadline <= end, Task.status != TaskStatus.COMPLETED)
+            ).all()
+        except Exception:
+            with self._lock:
+                self._loading_until = None
+                self._touched.clear()
+            raise
+        finally:
+            db.close()
+        with self._lock:
+            for task_id, deadline, title, *recipients in rows:
+                # A write that raced with the query already put the fresher version in place
+                if self._touched.get(task_id, 0) > started_at:
+                    continue
+                recipients = sorted({user_id for user_id in recipients if user_id is not None})
+                self._put(task_id, deadline, title, recipients, next(self._generations), now)
+            # Touches are only recorded while a load is in flight; this one is done with them
+            self._touched.clear()
+            self.loaded_until = end
+            self._loading_until = None
+        return len(rows)
+
+    def sync_changes(self) -> int:
+        """Apply task writes recorded in task_events since the last sync; returns how many tasks changed."""
+        db = self._session()
+        try:
+            if self._synced_seq is None:
+                self._synced_seq = db.scalar(select(func.coalesce(func.max(TaskEvent.seq), 0)))
+                return 0
+            events = db.execute(select(TaskEvent.seq, TaskEvent.task_id)
+                                .where(TaskEvent.seq > self._synced_seq - DEADLINE_SYNC_OVERLAP)).all()
+            fresh = {task_id for seq, task_id in events if seq not in self._recent_seqs}
+            rows = []
+            if fresh:
+                rows = db.execute(select(Task.id, Task.deadline, Task.title, Task.status, Task.assignee_id,
+                                         Task.reviewer_id, Task.creator_id)
+                                  .where(Task.id.in_(fresh))).all()
+        finally:
+            db.close()
+        found = set()
+        for task_id, deadline, title, status, *recipients in rows:
+            found.add(task_id)
+            self.schedule(task_id, deadline, title, status, recipients)
+        # Deleted or archived
+        for task_id in fresh - found:
+            self.cancel(task_id)
+        if events:
+            self._synced_seq = max(self._synced_seq, max(seq for seq, _ in events))
+        self._recent_seqs = {seq for seq, _ in events if seq > self._synced_seq - DEADLINE_SYNC_OVERLAP}
+        return len(fresh)
+
+    def pop_due(self, now: datetime) -> List[Tuple[int, str, List[int], int]]:
+        """Remove and return the reminders due at `now` as (task_id, title, recipients, offset)."""
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                _, generation, task_id, offset = heapq.heappop(self._heap)
+                entry = self._tasks.get(task_id)
+                if entry is None or entry[0] != generation:
+                    continue
+                due.append((task_id, entry[2], entry[3], offset))
+                if offset == self.offsets[-1]:
+                    del self._tasks[task_id]
+        return due
+
+    def _next_delay(self, now: datetime) -> float:
+        refresh_at = self.loaded_until - self.lead - self.window / 2
+        with self._lock:
+            next_fire = self._heap[0][0] if self._heap else refresh_at
+        return max(0.0, min((min(next_fire, refresh_at) - now).total_seconds(), self.sync_interval))
+
+    def acquire_leadership(self) -> bool:
+        """Try to take the leader lock on a dedicated connection, held for as long as this worker runs."""
+        from sqlalchemy import text
+        from task.database import engine
+
+        connection = engine.connect()
+        try:
+            acquired = connection.scalar(text("SELECT pg_try_advisory_lock(:key)"), {"key": DEADLINE_LEADER_LOCK_KEY})
+            # Session-level lock: it outlives this transaction, which must not stay open
+            connection.rollback()
+        except Exception:
+            connection.close()
+            raise
+        if not acquired:
+            connection.close()
+            return False
+        self._leader_connection = connection
+        return True
+
+    def release_leadership(self):
+        if self._leader_connection is not None:
+            # Invalidate rather than close: back in the pool, the connection would keep the session lock
+            self._leader_connection.invalidate()
+            self._leader_connection = None
+
+    async def run_forever(self):
+        from task.utils.notification_dispatcher import notification_dispatcher
+
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        while not await run_in_threadpool(self.acquire_leadership):
+            await asyncio.sleep(DEADLINE_LEADER_RETRY_SECONDS)
+        print("Deadline scheduler: this worker fires deadline reminders")
+        while True:
+            try:
+                now = datetime.utcnow()
+                if self.loaded_until is None or now + self.lead + self.window / 2 >= self.loaded_until:
+                    await run_in_threadpool(self.load_window)
+                else:
+                    await run_in_threadpool(self.sync_changes)
+                notification_dispatcher.notify((recipients, f"Reminder: task {task_id} '{title}' {_describe(offset)}.")
+                                               for task_id, title, recipients, offset in self.pop_due(now))
+                self._wakeup.clear()
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._next_delay(datetime.utcnow()))
+            except asyncio.TimeoutError:
+                pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Deadline scheduler error: {str(e)}")
+                await asyncio.sleep(5)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self.run_forever())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await run_in_threadpool(self.release_leadership)
+
+
+deadline_scheduler = DeadlineScheduler()
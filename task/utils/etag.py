@@ -0,0 +1,38 @@
+from typing import Optional
+
+
+def make_etag(*parts) -> str:
+    """Strong entity tag built from the given parts, e.g. make_etag(7, 3) -> '"7-3"'."""
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def _tags(header: str):
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag:
+            yield tag
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """True when an If-None-Match / If-Match header lists `etag` (weak comparison) or is "*"."""
+    if not header:
+        return False
+    return any(tag == "*" or tag == etag for tag in _tags(header))
+
+
+def parse_task_etag(header: str, task_id: int) -> Optional[int]:
+    """
+        Version a client expects when it sends If-Match for a task.
+
+        Returns None for "*" (any version). Raises ValueError when the header does not
+        name this task.
+    """
+    for tag in _tags(header):
+        if tag == "*":
+            return None
+        task_part, _, version = tag.strip('"').partition("-")
+        if task_part == str(task_id) and version.isdigit():
+            return int(version)
+    raise ValueError(header)
@@ -0,0 +1,134 @@
+import asyncio
+import os
+import threading
+import time
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+NOTIFICATION_WORKERS = int(os.getenv("NOTIFICATION_WORKERS", "4"))
+NOTIFICATION_QUEUE_SIZE = int(os.getenv("NOTIFICATION_QUEUE_SIZE", "10000"))
+
+# One queued item: the (recipients, message) pairs produced by one write
+Notifications = List[Tuple[Sequence[Optional[int]], str]]
+
+
+class NotificationDispatcher:
+    """
+        Delivers WebSocket notifications from an asyncio queue drained by worker tasks.
+
+        Request handlers call notify() after their commit and return without waiting for
+        any socket. notify() is safe to call from threadpool workers as well as from the
+        event loop. A worker hands a queued item's messages, in order, to the
+        WebSocketManager, which queues each one on every recipient connection without
+        waiting for any client to read it.
+    """
+    def __init__(self, workers: int = NOTIFICATION_WORKERS, max_queue: int = NOTIFICATION_QUEUE_SIZE,
+                 websocket_manager=None):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.websocket_manager = websocket_manager
+        self.enqueued = 0
+        self.dispatched = 0
+        self.dropped = 0
+        self.connections_queued = 0
+        self.connections_failed = 0
+        self.lag_total_ms = 0.0
+        self.lag_max_ms = 0.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: List[asyncio.Task] = []
+        self._lock = threading.Lock()
+
+    def notify(self, notifications: Iterable[Tuple[Sequence[Optional[int]], str]]):
+        """Queue (recipients, message) pairs for delivery; never blocks."""
+        notifications = [(user_ids, message) for user_ids, message in notifications if user_ids]
+        if not notifications:
+            return
+        if self._loop is None:
+            print(f"Notification dispatcher not running, dropped {len(notifications)} notifications")
+            with self._lock:
+                self.dropped += 1
+            return
+        item = (time.monotonic(), notifications)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._put(item)
+        else:
+            self._loop.call_soon_threadsafe(self._put, item)
+
+    def _put(self, item):
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            print(f"Notification queue full, dropped {len(item[1])} notifications")
+            with self._lock:
+                self.dropped += 1
+            return
+        with self._lock:
+            self.enqueued += 1
+
+    async def _dispatch(self, notifications: Notifications):
+        # In order, so each recipient sees an item's messages in the order they were queued
+        for user_ids, message in notifications:
+            queued, failed = await self.websocket_manager.broadcast_to_team(user_ids, message)
+            with self._lock:
+                self.connections_queued += queued
+                self.connections_failed += failed
+
+    async def _worker(self):
+        while True:
+            enqueued_at, notifications = await self._queue.get()
+            lag_ms = (time.monotonic() - enqueued_at) * 1000
+            with self._lock:
+                self.dispatched += 1
+                self.lag_total_ms += lag_ms
+                self.lag_max_ms = max(self.lag_max_ms, lag_ms)
+            try:
+                await self._dispatch(notifications)
+            except Exception as e:
+                print(f"Notification dispatch error: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    def start(self):
+        if self._tasks:
+            return
+        if self.websocket_manager is None:
+            from task.utils.websocket_manager import manager
+            self.websocket_manager = manager
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._tasks = [self._loop.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def drain(self):
+        """Wait until everything queued so far has been sent."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._loop = None
+        self._queue = None
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "workers": len(self._tasks),
+                "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+                "queue_size": self.max_queue,
+                "enqueued": self.enqueued,
+                "dispatched": self.dispatched,
+                "dropped": self.dropped,
+                "connections_queued": self.connections_queued,
+                "connections_failed": self.connections_failed,
+                "lag_avg_ms": round(self.lag_total_ms / self.dispatched, 3) if self.dispatched else 0.0,
+                "lag_max_ms": round(self.lag_max_ms, 3),
+            }
+
+
+notification_dispatcher = NotificationDispatcher()
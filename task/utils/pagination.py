@@ -0,0 +1,25 @@
+import base64
+import enum
+import json
+from datetime import datetime
+from fastapi import HTTPException, status
+
+
+def encode_cursor(values) -> str:
+    """Opaque keyset cursor for the sort values of the last row of a page."""
+    plain = [value.isoformat() if isinstance(value, datetime)
+             else value.value if isinstance(value, enum.Enum)
+             else value
+             for value in values]
+    return base64.urlsafe_b64encode(json.dumps(plain).encode()).decode()
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """Inverse of encode_cursor; a cursor that was tampered with or truncated is a 400."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return values
@@ -0,0 +1,131 @@
+import asyncio
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from task.database import SessionLocal
+from task.models import RevokedToken
+from task.utils.bloom_filter import BloomFilter
+
+REVOCATION_BLOOM_CAPACITY = int(os.getenv("REVOCATION_BLOOM_CAPACITY", "100000"))
+REVOCATION_SYNC_SECONDS = float(os.getenv("REVOCATION_SYNC_SECONDS", "5"))
+REVOCATION_REBUILD_SECONDS = float(os.getenv("REVOCATION_REBUILD_SECONDS", "3600"))
+
+
+class RevocationList:
+    """
+        Revoked token jtis, backed by the revoked_tokens table and fronted by a Bloom filter.
+
+        The filter is topped up every REVOCATION_SYNC_SECONDS with rows revoked since
+        the last sync (by any process), and rebuilt from the unexpired rows every
+        REVOCATION_REBUILD_SECONDS. A jti that misses the filter is definitely not
+        revoked; only a hit costs a primary-key lookup. A sync or rebuild that fails
+        keeps the previous filter rather than failing the request that triggered it.
+
+        Expired rows are deleted by a background task (start()), never on the request path.
+    """
+    def __init__(self, capacity: int = REVOCATION_BLOOM_CAPACITY,
+                 sync_interval: float = REVOCATION_SYNC_SECONDS,
+                 rebuild_interval: float = REVOCATION_REBUILD_SECONDS,
+                 session_factory=SessionLocal):
+        self.capacity = capacity
+        self.sync_interval = sync_interval
+        self.rebuild_interval = rebuild_interval
+        self.session_factory = session_factory
+        self._bloom = BloomFilter(capacity)
+        self._watermark = None
+        self._last_sync = None
+        self._last_rebuild = None
+        self._lock = threading.Lock()
+        self._task = None
+
+    def revoke(self, db: Session, jti: str, expires_at: datetime):
+        """Record a revoked jti; visible to this process immediately, to others after their next sync."""
+        db.merge(RevokedToken(jti=jti, expires_at=expires_at, revoked_at=datetime.utcnow()))
+        with self._lock:
+            self._bloom.add(jti)
+
+    def is_revoked(self, jti: str) -> bool:
+        if not jti:
+            return False
+        self._maybe_sync()
+        if jti not in self._bloom:
+            return False
+        with self.session_factory() as db:
+            return db.query(RevokedToken.jti).filter(
+                RevokedToken.jti == jti, RevokedToken.expires_at > datetime.utcnow()
+            ).first() is not None
+
+    def _maybe_sync(self):
+        now = time.monotonic()
+        if self._last_sync is not None and now - self._last_sync < self.sync_interval:
+            return
+        with self._lock:
+            if self._last_sync is not None and now - self._last_sync < self.sync_interval:
+                return
+            try:
+                with self.session_factory() as db:
+                    if self._last_rebuild is None or now - self._last_rebuild >= self.rebuild_interval:
+                        self._rebuild(db)
+                        self._last_rebuild = now
+                    else:
+                        self._sync(db)
+            except Exception as e:
+                print(f"Revocation list sync error, keeping the previous filter: {str(e)}")
+            # Also after a failure, so a database outage is retried once per interval, not on every request
+            self._last_sync = now
+
+    def _sync(self, db: Session):
+        # Overlap the window so rows committed slightly out of order are not missed
+        since = self._watermark - timedelta(seconds=self.sync_interval * 2)
+        rows = db.query(RevokedToken.jti, RevokedToken.revoked_at).filter(RevokedToken.revoked_at >= since).all()
+        for jti, revoked_at in rows:
+            self._bloom.add(jti)
+            self._watermark = max(self._watermark, revoked_at)
+
+    def _rebuild(self, db: Session):
+        """Rebuild the filter from the rows that have not expired yet."""
+        watermark = datetime.utcnow()
+        rows = db.query(RevokedToken.jti).filter(RevokedToken.expires_at > watermark).all()
+        bloom = BloomFilter(max(self.capacity, len(rows) * 2))
+        for (jti,) in rows:
+            bloom.add(jti)
+        self._bloom = bloom
+        self._watermark = watermark
+
+    def prune(self) -> int:
+        """Delete rows whose token has expired anyway; returns how many went."""
+        with self.session_factory() as db:
+            pruned = db.query(RevokedToken).filter(
+                RevokedToken.expires_at <= datetime.utcnow()
+            ).delete(synchronize_session=False)
+            db.commit()
+        return pruned
+
+    async def run_forever(self):
+        while True:
+            try:
+                pruned = await run_in_threadpool(self.prune)
+                if pruned:
+                    print(f"Pruned {pruned} expired revoked tokens")
+            except Exception as e:
+                print(f"Revoked token pruning error: {str(e)}")
+            await asyncio.sleep(self.rebuild_interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self.run_forever())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+revocation_list = RevocationList()
@@ -0,0 +1,71 @@
+import contextvars
+import logging
+import os
+import time
+from collections import Counter
+from contextlib import contextmanager
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger("task.sql")
+
+# The same statement this many times in one request is reported as an N+1 suspect
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+
+
+class QueryStats:
+    """Statements issued while handling one request (or inside one count_queries block)."""
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.statements = Counter()
+
+    def n_plus_one_suspects(self, threshold: int = N_PLUS_ONE_THRESHOLD):
+        return [(statement, count) for statement, count in self.statements.most_common() if count >= threshold]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.total_ms:.1f};desc="{self.count} queries"'
+
+
+current_query_stats = contextvars.ContextVar("current_query_stats", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_timer(conn, cursor, statement, parameters, context, executemany):
+    if current_query_stats.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    stats = current_query_stats.get()
+    if stats is None or not conn.info.get("query_start"):
+        return
+    stats.count += 1
+    stats.total_ms += (time.perf_counter() - conn.info["query_start"].pop()) * 1000
+    stats.statements[statement] += 1
+
+
+@contextmanager
+def count_queries():
+    """Collect QueryStats for the statements executed inside the block (threadpool calls included)."""
+    stats = QueryStats()
+    token = current_query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        current_query_stats.reset(token)
+
+
+async def sql_instrumentation_middleware(request, call_next):
+    """
+        Count statements and DB time per request, add a Server-Timing header and
+        log one debug line, with a warning for repeated identical statements.
+    """
+    with count_queries() as stats:
+        response = await call_next(request)
+    response.headers["Server-Timing"] = stats.server_timing()
+    logger.debug("%s %s: %d queries in %.1f ms", request.method, request.url.path, stats.count, stats.total_ms)
+    for statement, count in stats.n_plus_one_suspects():
+        logger.warning("Possible N+1 on %s %s: %d x %s", request.method, request.url.path, count, statement)
+    return response
@@ -0,0 +1,133 @@
+import asyncio
+import os
+from datetime import datetime, timedelta
+from functools import lru_cache
+from sqlalchemy import delete, func, insert, literal_column, null, select, union_all
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import aliased
+from starlette.concurrency import run_in_threadpool
+from task.models import Task, TaskArchive, TaskStatus, SEARCH_VECTOR_EXPRESSION
+from task.utils.change_counters import bump_change_counters, task_scopes
+from task.utils.task_events import record_task_events, task_event
+
+# Off by default: archived tasks drop out of every read that does not opt into them
+ARCHIVE_ENABLED = os.getenv("ARCHIVE_ENABLED", "false").lower() == "true"
+ARCHIVE_AFTER_DAYS = float(os.getenv("ARCHIVE_AFTER_DAYS", "90"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+ARCHIVE_INTERVAL_SECONDS = float(os.getenv("ARCHIVE_INTERVAL_SECONDS", "300"))
+
+# Columns shared by tasks and tasks_archive
+ARCHIVE_COLUMNS = [column.key for column in TaskArchive.__table__.columns if column.key != "archived_at"]
+
+
+@lru_cache(maxsize=2)
+def tasks_with_archive(searchable: bool = False):
+    """
+        Task entity over tasks UNION ALL tasks_archive, for reads that opt into archived rows.
+
+        Filters and ordering applied to the returned entity are pushed down into both
+        branches by Postgres, so each side still uses its own indexes. tasks_archive has no
+        search_vector column; with searchable=True the archive side computes it with the
+        expression ix_tasks_archive_search_vector indexes, otherwise it is NULL.
+    """
+    hot = select(*(Task.__table__.c[name] for name in ARCHIVE_COLUMNS),
+                 Task.__table__.c.search_vector)
+    cold_vector = literal_column(SEARCH_VECTOR_EXPRESSION, TSVECTOR) if searchable else null()
+    cold = select(*(TaskArchive.__table__.c[name] for name in ARCHIVE_COLUMNS),
+                  cold_vector.label("search_vector"))
+    return aliased(Task, union_all(hot, cold).subquery("tasks_all"), name="tasks_all")
+
+
+class TaskArchiver:
+    """
+        Moves completed tasks older than ARCHIVE_AFTER_DAYS from tasks into tasks_archive.
+
+        Disabled unless ARCHIVE_ENABLED=true. Once rows are archived, /task/sortfilter,
+        /user-dashboard, /task/search and /task/export return them when asked to
+        (include_archived); the team, organization and admin dashboards count live tasks only.
+
+        Each batch is a single DELETE ... RETURNING feeding an INSERT, in its own short
+        transaction. Rows are claimed with FOR UPDATE SKIP LOCKED, so the mover never waits
+        on a task a request is editing, and several app instances can run it side by side.
+    """
+    def __init__(self, session_factory=None, after_days: float = ARCHIVE_AFTER_DAYS,
+                 batch_size: int = ARCHIVE_BATCH_SIZE, interval: float = ARCHIVE_INTERVAL_SECONDS):
+        self.session_factory = session_factory
+        self.after_days = after_days
+        self.batch_size = batch_size
+        self.interval = interval
+        self._task = None
+
+    def archive_statement(self, cutoff: datetime):
+        batch = (select(Task.id)
+                 .where(Task.status == TaskStatus.COMPLETED,
+                        func.coalesce(Task.updated_at, Task.created_at) < cutoff)
+                 .order_by(Task.id)
+                 .limit(self.batch_size)
+                 .with_for_update(skip_locked=True)
+                 .cte("batch"))
+        moved = (delete(Task)
+                 .where(Task.id == batch.c.id)
+                 .returning(*(Task.__table__.c[name] for name in ARCHIVE_COLUMNS))
+                 .cte("moved"))
+        return (insert(TaskArchive)
+                .from_select(ARCHIVE_COLUMNS, select(*(moved.c[name] for name in ARCHIVE_COLUMNS)))
+                .returning(TaskArchive.id, TaskArchive.team_id, TaskArchive.organization_id,
+                           TaskArchive.creator_id, TaskArchive.assignee_id, TaskArchive.reviewer_id))
+
+    def move_batch(self, db) -> int:
+        """Archive one batch and return how many tasks moved."""
+        cutoff = datetime.utcnow() - timedelta(days=self.after_days)
+        rows = db.execute(self.archive_statement(cutoff)).mappings().all()
+        if rows:
+            record_task_events(db, [task_event("archived", row["id"], row["team_id"], row["organization_id"])
+                                    for row in rows])
+            scopes = set()
+            for row in rows:
+                scopes |= task_scopes(row["organization_id"], row["team_id"],
+                                      (row["creator_id"], row["assignee_id"], row["reviewer_id"]))
+            bump_change_counters(db, scopes)
+        db.commit()
+        return len(rows)
+
+    def run_once(self) -> int:
+        """Archive batches until a short batch shows the backlog is drained."""
+        if self.session_factory is None:
+            from task.database import SessionLocal
+            self.session_factory = SessionLocal
+        total = 0
+        db = self.session_factory()
+        try:
+            while True:
+                moved = self.move_batch(db)
+                total += moved
+                if moved < self.batch_size:
+                    return total
+        finally:
+            db.close()
+
+    async def run_forever(self):
+        while True:
+            try:
+                moved = await run_in_threadpool(self.run_once)
+                if moved:
+                    print(f"Archived {moved} completed tasks")
+            except Exception as e:
+                print(f"Task archiver error: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self.run_forever())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+task_archiver = TaskArchiver()
@@ -0,0 +1,50 @@
+from typing import Any, Dict, Iterable, List, Optional
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import func, insert, select
+from task.models import TaskEvent
+
+TASK_CHANGES_MAX_LIMIT = 1000
+# First key of the advisory lock that orders outbox writes within an organization
+TASK_EVENTS_LOCK_KEY = 7211
+
+
+def task_event(event_type: str, task_id: int, team_id: Optional[int], organization_id: Optional[int],
+               payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    return {
+        "event_type": event_type,
+        "task_id": task_id,
+        "team_id": team_id,
+        "organization_id": organization_id,
+        "payload": jsonable_encoder(payload or {}),
+    }
+
+
+def record_task_events(db, events: Iterable[Dict[str, Any]]):
+    """
+        Append events to the task_events outbox inside the caller's transaction.
+
+        seq comes from a sequence, which hands out numbers in insert order, not commit
+        order. A transaction-scoped advisory lock per organization makes the two agree
+        within an organization, so a reader that has seen seq N will never later find a
+        smaller seq appear for the same organization.
+    """
+    events = list(events)
+    if not events:
+        return
+    lock_task_events(db, {event["organization_id"] for event in events})
+    db.execute(insert(TaskEvent), events)
+
+
+def lock_task_events(db, organization_ids: Iterable[Optional[int]]):
+    """Take the outbox advisory locks for these organizations, in a fixed order."""
+    for organization_id in sorted({organization_id or 0 for organization_id in organization_ids}):
+        db.execute(select(func.pg_advisory_xact_lock(TASK_EVENTS_LOCK_KEY, organization_id)))
+
+
+def read_task_changes(db, organization_id: Optional[int], since: int, limit: int) -> List[TaskEvent]:
+    statement = select(TaskEvent).where(TaskEvent.seq > since)
+    if organization_id is None:
+        statement = statement.where(TaskEvent.organization_id.is_(None))
+    else:
+        statement = statement.where(TaskEvent.organization_id == organization_id)
+    return db.scalars(statement.order_by(TaskEvent.seq).limit(limit)).all()
@@ -0,0 +1,68 @@
+import csv
+import enum
+import io
+import json
+import os
+from datetime import datetime
+from typing import Iterator, Optional
+from sqlalchemy import select
+from task.database import SessionLocal, ReadSessionLocal
+from task.models import Task
+from task.utils.task_archive import tasks_with_archive
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "2000"))
+
+EXPORT_COLUMNS = (Task.id, Task.title, Task.description, Task.status, Task.priority, Task.deadline,
+                  Task.created_at, Task.updated_at, Task.team_id, Task.assignee_id, Task.reviewer_id,
+                  Task.creator_id)
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+
+
+def _plain(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+def _batches(organization_id: Optional[int], include_archived: bool, primary: bool):
+    """
+        Yield lists of row tuples from a server-side cursor.
+
+        Runs on its own session: the request's session is closed before a streaming
+        body starts. created_at order is served by ix_tasks_organization_id_created_at,
+        so the first rows are sent without sorting the whole organization; with archived
+        tasks, both tables' (organization_id, created_at) indexes feed a merge.
+    """
+    session_factory = SessionLocal if primary else ReadSessionLocal
+    db = session_factory()
+    try:
+        entity = tasks_with_archive() if include_archived else Task
+        statement = select(*(getattr(entity, field) for field in EXPORT_FIELDS)).order_by(entity.created_at)
+        if organization_id is None:
+            statement = statement.where(entity.organization_id.is_(None))
+        else:
+            statement = statement.where(entity.organization_id == organization_id)
+        result = db.execute(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        for rows in result.partitions():
+            yield rows
+    finally:
+        db.close()
+
+
+def export_ndjson(organization_id: Optional[int], include_archived: bool = True, primary: bool = False) -> Iterator[str]:
+    for rows in _batches(organization_id, include_archived, primary):
+        yield "".join(json.dumps(dict(zip(EXPORT_FIELDS, map(_plain, row)))) + "\n" for row in rows)
+
+
+def export_csv(organization_id: Optional[int], include_archived: bool = True, primary: bool = False) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    yield buffer.getvalue()
+    for rows in _batches(organization_id, include_archived, primary):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_plain(value) for value in row] for row in rows)
+        yield buffer.getvalue()
@@ -0,0 +1,251 @@
+from datetime import datetime
+from functools import lru_cache
+from typing import List, Optional, Literal
+from fastapi import HTTPException, Query
+from sqlalchemy import and_, bindparam, func, or_, select, tuple_
+from task.models import Task, TaskStatus, PriorityStatus
+from task.schemas import TaskSortField
+from task.utils.pagination import encode_cursor, decode_cursor
+from task.utils.task_archive import tasks_with_archive
+
+SORTFILTER_MAX_LIMIT = 500
+SEARCH_MAX_LIMIT = 100
+SEARCH_MAX_OFFSET = 1000
+DATETIME_SORT_FIELDS = {TaskSortField.CREATED_AT, TaskSortField.UPDATED_AT, TaskSortField.DEADLINE}
+ENUM_SORT_FIELDS = {TaskSortField.STATUS: TaskStatus, TaskSortField.PRIORITY: PriorityStatus}
+
+# IN-list filters: query parameter -> column
+LIST_FILTERS = {
+    "status": Task.status,
+    "priority": Task.priority,
+    "assignee_id": Task.assignee_id,
+    "team_id": Task.team_id,
+}
+# Range filters: query parameter -> (column, comparison)
+RANGE_FILTERS = {
+    "deadline_from": (Task.deadline, ">="),
+    "deadline_to": (Task.deadline, "<"),
+    "created_from": (Task.created_at, ">="),
+    "created_to": (Task.created_at, "<"),
+    "updated_from": (Task.updated_at, ">="),
+    "updated_to": (Task.updated_at, "<"),
+}
+
+
+class TaskListQuery:
+    """
+        Query parameters accepted by task listing endpoints.
+
+        Repeat a list parameter to match any of its values (?status=In Progress&status=In Review).
+        sort_by takes a comma-separated list of fields; prefix a field with "-" to sort it
+        descending, otherwise `order` applies.
+    """
+    def __init__(
+        self,
+        status: Optional[List[TaskStatus]] = Query(None, description="Filter by task status (repeatable)"),
+        priority: Optional[List[PriorityStatus]] = Query(None, description="Filter by task priority (repeatable)"),
+        assignee_id: Optional[List[int]] = Query(None, description="Filter by assignee ID (repeatable)"),
+        team_id: Optional[List[int]] = Query(None, description="Filter by team ID (repeatable)"),
+        deadline_from: Optional[datetime] = Query(None, description="Deadline on or after"),
+        deadline_to: Optional[datetime] = Query(None, description="Deadline before"),
+        created_from: Optional[datetime] = Query(None, description="Created on or after"),
+        created_to: Optional[datetime] = Query(None, description="Created before"),
+        updated_from: Optional[datetime] = Query(None, description="Updated on or after"),
+        updated_to: Optional[datetime] = Query(None, description="Updated before"),
+        overdue: Optional[bool] = Query(None, description="Only tasks past their deadline and not completed"),
+        sort_by: str = Query("created_at", description="Sort fields, e.g. priority,-deadline"),
+        order: Literal["asc", "desc"] = Query("asc", description="Sort order: asc or desc"),
+        cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+        limit: int = Query(100, ge=1, le=SORTFILTER_MAX_LIMIT, description="Page size"),
+        include_archived: bool = Query(False, description="Also return archived tasks"),
+    ):
+        self.lists = {name: values for name, values in (("status", status), ("priority", priority),
+                                                        ("assignee_id", assignee_id), ("team_id", team_id)) if values}
+        self.ranges = {name: value for name, value in (("deadline_from", deadline_from), ("deadline_to", deadline_to),
+                                                       ("created_from", created_from), ("created_to", created_to),
+                                                       ("updated_from", updated_from), ("updated_to", updated_to))
+                       if value is not None}
+        self.overdue = bool(overdue)
+        self.sort = parse_sort(sort_by, order)
+        self.cursor = cursor
+        self.limit = limit
+        self.include_archived = include_archived
+
+
+def parse_sort(sort_by: str, order: str):
+    """Turn "priority,-deadline" into ((TaskSortField.PRIORITY, False), (TaskSortField.DEADLINE, True))."""
+    keys = []
+    for raw in sort_by.split(","):
+        raw = raw.strip()
+        descending = order == "desc"
+        if raw.startswith("-"):
+            raw, descending = raw[1:], True
+        try:
+            field = TaskSortField(raw)
+        except ValueError:
+            raise HTTPException(status_code=422, detail=f"Invalid sort field: {raw}")
+        if field in (key for key, _ in keys):
+            continue
+        keys.append((field, descending))
+    # id breaks ties so the keyset order is total
+    if TaskSortField.ID not in (key for key, _ in keys):
+        keys.append((TaskSortField.ID, keys[0][1]))
+    return tuple(keys)
+
+
+def sort_column(field: TaskSortField, entity=Task):
+    return getattr(entity, field.value)
+
+
+def is_nullable(field: TaskSortField) -> bool:
+    return Task.__table__.c[field.value].nullable
+
+
+def keyset_after(column, value, descending: bool, nullable: bool):
+    """
+        Rows that sort after `value` in this column.
+
+        Postgres puts NULL last in ascending and first in descending order, i.e. it sorts
+        NULL above every value, and a cursor taken on a NULL row holds null; plain
+        comparisons against NULL match nothing and would end the pagination early.
+    """
+    if not nullable:
+        return column < value if descending else column > value
+    if descending:
+        return or_(column < value, and_(value.is_(None), column.is_not(None)))
+    return or_(column > value, and_(column.is_(None), value.is_not(None)))
+
+
+def keyset_equal(column, value, nullable: bool):
+    return column.is_not_distinct_from(value) if nullable else column == value
+
+
+def cursor_value(field: TaskSortField, value):
+    """Check one decoded cursor value against its sort column; anything else is a 400."""
+    if value is None and is_nullable(field):
+        return None
+    try:
+        if field in DATETIME_SORT_FIELDS:
+            return datetime.fromisoformat(value)
+        if field in ENUM_SORT_FIELDS:
+            return ENUM_SORT_FIELDS[field](value)
+        if field == TaskSortField.ID and type(value) is int:
+            return value
+        if field == TaskSortField.TITLE and isinstance(value, str):
+            return value
+    except (TypeError, ValueError):
+        pass
+    raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@lru_cache(maxsize=256)
+def build_task_statement(list_filters: tuple, range_filters: tuple, overdue: bool, org_is_null: bool,
+                         sort: tuple, with_cursor: bool, include_archived: bool = False):
+    """
+        Compile-once SELECT for one filter shape.
+
+        Every value is a named bind parameter (IN-lists are expanding), so requests that
+        differ only in values reuse the same statement and SQLAlchemy's compiled form.
+    """
+    entity = tasks_with_archive() if include_archived else Task
+    statement = select(entity)
+    if org_is_null:
+        statement = statement.where(entity.organization_id.is_(None))
+    else:
+        statement = statement.where(entity.organization_id == bindparam("organization_id"))
+
+    for name in list_filters:
+        column = getattr(entity, LIST_FILTERS[name].key)
+        statement = statement.where(column.in_(bindparam(name, expanding=True)))
+    for name in range_filters:
+        column, operator = RANGE_FILTERS[name]
+        column = getattr(entity, column.key)
+        parameter = bindparam(name, type_=column.type)
+        statement = statement.where(column >= parameter if operator == ">=" else column < parameter)
+    if overdue:
+        statement = statement.where(entity.deadline < bindparam("now", type_=Task.deadline.type),
+                                    entity.status != TaskStatus.COMPLETED)
+
+    columns = [sort_column(field, entity) for field, _ in sort]
+    if with_cursor:
+        parameters = [bindparam(f"cursor_{index}", type_=column.type) for index, column in enumerate(columns)]
+        directions = {descending for _, descending in sort}
+        if len(directions) == 1 and not any(is_nullable(field) for field, _ in sort):
+            # Uniform direction over NOT NULL columns: a row comparison the planner can drive from a composite index
+            keyset = tuple_(*columns)
+            statement = statement.where(keyset < tuple_(*parameters) if directions.pop() else keyset > tuple_(*parameters))
+        else:
+            # (c0 after v0) OR (c0 = v0 AND c1 after v1) OR ..., with NULL placed where Postgres sorts it
+            branches = []
+            for index, (column, (field, descending)) in enumerate(zip(columns, sort)):
+                after = keyset_after(column, parameters[index], descending, is_nullable(field))
+                branches.append(and_(*(keyset_equal(columns[j], parameters[j], is_nullable(sort[j][0]))
+                                       for j in range(index)), after))
+            statement = statement.where(or_(*branches))
+
+    statement = statement.order_by(*(column.desc() if descending else column
+                                     for column, (_, descending) in zip(columns, sort)))
+    return statement.limit(bindparam("limit"))
+
+
+def list_tasks(db, filters: TaskListQuery, organization_id: Optional[int]):
+    """Run a TaskListQuery for one organization; returns (tasks, next_cursor or None)."""
+    params = dict(filters.lists)
+    params.update(filters.ranges)
+    params["limit"] = filters.limit + 1
+    if organization_id is not None:
+        params["organization_id"] = organization_id
+    if filters.overdue:
+        params["now"] = datetime.utcnow()
+
+    if filters.cursor:
+        values = decode_cursor(filters.cursor, len(filters.sort))
+        for index, ((field, _), value) in enumerate(zip(filters.sort, values)):
+            params[f"cursor_{index}"] = cursor_value(field, value)
+
+    statement = build_task_statement(
+        tuple(sorted(filters.lists)), tuple(sorted(filters.ranges)), filters.overdue,
+        organization_id is None, filters.sort, filters.cursor is not None, filters.include_archived,
+    )
+    tasks = db.execute(statement, params).scalars().all()
+
+    next_cursor = None
+    if len(tasks) > filters.limit:
+        tasks = tasks[:filters.limit]
+        last = tasks[-1]
+        next_cursor = encode_cursor([getattr(last, field.value) for field, _ in filters.sort])
+    return tasks, next_cursor
+
+
+def build_search_statement(org_is_null: bool, with_teams: bool, include_archived: bool = False):
+    """
+        Ranked full-text search over title and description.
+
+        The @@ match is served by the GIN index on tasks.search_vector (and on the
+        tasks_archive expression when archived tasks are included); only matching rows
+        are ranked, and only the projected columns are read back.
+    """
+    entity = tasks_with_archive(searchable=True) if include_archived else Task
+    query = func.websearch_to_tsquery("english", bindparam("q"))
+    rank = func.ts_rank_cd(entity.search_vector, query).label("rank")
+    statement = select(entity.id, entity.title, entity.description, entity.status, entity.priority, entity.deadline,
+                       entity.team_id, entity.assignee_id, rank).where(entity.search_vector.op("@@")(query))
+    if org_is_null:
+        statement = statement.where(entity.organization_id.is_(None))
+    else:
+        statement = statement.where(entity.organization_id == bindparam("organization_id"))
+    if with_teams:
+        statement = statement.where(entity.team_id.in_(bindparam("team_id", expanding=True)))
+    return statement.order_by(rank.desc(), entity.id).limit(bindparam("limit")).offset(bindparam("offset"))
+
+
+def search_tasks(db, q: str, organization_id: Optional[int], team_ids: Optional[List[int]], limit: int, offset: int,
+                 include_archived: bool = False):
+    """Return one page of search hits as dicts, best match first."""
+    params = {"q": q, "limit": limit, "offset": offset}
+    if organization_id is not None:
+        params["organization_id"] = organization_id
+    if team_ids:
+        params["team_id"] = team_ids
+    statement = build_search_statement(organization_id is None, bool(team_ids), include_archived)
+    return [dict(row._mapping) for row in db.execute(statement, params)]
@@ -0,0 +1,245 @@
+"""
+    Bulk task import through PostgreSQL COPY.
+
+    Rows are read from CSV or NDJSON, validated against TaskImportRow in chunks, copied
+    into a temporary staging table and merged into tasks with set-based SQL, one
+    transaction per chunk. Rows that fail validation or reference missing teams/users are
+    written to the reject list instead of aborting the import.
+
+    CLI: python -m task.utils.task_import tasks.csv --creator-id 1 [--format csv|ndjson]
+             [--chunk-size 10000] [--rejects rejects.ndjson]
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from pydantic import ValidationError
+from sqlalchemy import text
+from task.models import Task
+from task.schemas import TaskImportRow
+from task.utils.change_counters import bump_change_counters, task_scopes
+from task.utils.deadline_scheduler import deadline_scheduler
+from task.utils.task_events import record_task_events, task_event
+
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "10000"))
+
+STAGING_COLUMNS = ("line", "title", "description", "status", "priority", "deadline", "reviewer_id",
+                   "assignee_id", "creator_id", "team_id", "organization_id")
+TASK_COLUMNS = STAGING_COLUMNS[1:]
+
+# ON COMMIT DELETE ROWS empties the table after every chunk's transaction
+CREATE_STAGING = text(f"""
+    CREATE TEMPORARY TABLE IF NOT EXISTS tasks_import_staging (
+        line integer PRIMARY KEY,
+        title varchar NOT NULL,
+        description varchar,
+        status {Task.__table__.c.status.type.name},
+        priority {Task.__table__.c.priority.type.name},
+        deadline timestamp NOT NULL,
+        reviewer_id integer,
+        assignee_id integer,
+        creator_id integer NOT NULL,
+        team_id integer NOT NULL,
+        organization_id integer
+    ) ON COMMIT DELETE ROWS
+""")
+
+# First failing reference per staged row; NULL means the row can be merged. The team,
+# assignee and reviewer must all belong to the row's organization.
+REJECT_REASONS = text("""
+    SELECT s.line, s.title, CASE
+        WHEN NOT EXISTS (SELECT 1 FROM teams WHERE teams.id = s.team_id) THEN 'Team not found'
+        WHEN s.organization_id IS NOT NULL
+             AND NOT EXISTS (SELECT 1 FROM organizations WHERE organizations.id = s.organization_id)
+            THEN 'Organization not found'
+        WHEN NOT EXISTS (SELECT 1 FROM teams WHERE teams.id = s.team_id
+                         AND teams.organization_id IS NOT DISTINCT FROM s.organization_id)
+            THEN 'Team belongs to another organization'
+        WHEN s.assignee_id IS NOT NULL AND NOT EXISTS (SELECT 1 FROM users WHERE users.id = s.assignee_id)
+            THEN 'Assignee not found'
+        WHEN s.assignee_id IS NOT NULL
+             AND NOT EXISTS (SELECT 1 FROM users WHERE users.id = s.assignee_id
+                             AND users.organization_id IS NOT DISTINCT FROM s.organization_id)
+            THEN 'Assignee belongs to another organization'
+        WHEN s.reviewer_id IS NOT NULL AND NOT EXISTS (SELECT 1 FROM users WHERE users.id = s.reviewer_id)
+            THEN 'Reviewer not found'
+        WHEN s.reviewer_id IS NOT NULL
+             AND NOT EXISTS (SELECT 1 FROM users WHERE users.id = s.reviewer_id
+                             AND users.organization_id IS NOT DISTINCT FROM s.organization_id)
+            THEN 'Reviewer belongs to another organization'
+        WHEN EXISTS (SELECT 1 FROM tasks WHERE tasks.title = s.title)
+            THEN 'Task with this title already exists.'
+        WHEN EXISTS (SELECT 1 FROM tasks_import_staging d WHERE d.title = s.title AND d.line < s.line)
+            THEN 'Duplicate title in import'
+    END AS reason
+    FROM tasks_import_staging s
+""")
+
+DELETE_STAGED = text("DELETE FROM tasks_import_staging WHERE line = ANY(:lines)")
+
+MERGE_STAGED = text(f"""
+    INSERT INTO tasks ({", ".join(TASK_COLUMNS)}, created_at, updated_at, version)
+    SELECT {", ".join(TASK_COLUMNS)}, now() at time zone 'utc', now() at time zone 'utc', 0
+    FROM tasks_import_staging
+    ORDER BY line
+    RETURNING id, title
+""")
+
+
+class ImportProgress:
+    """Running totals of an import, passed to the progress callback after every chunk."""
+    def __init__(self):
+        self.read = 0
+        self.imported = 0
+        self.rejects: List[Dict[str, Any]] = []
+        self.started = time.monotonic()
+
+    @property
+    def rejected(self) -> int:
+        return len(self.rejects)
+
+    def __str__(self):
+        rate = self.read / max(time.monotonic() - self.started, 1e-9)
+        return f"read {self.read}  imported {self.imported}  rejected {self.rejected}  ({rate:,.0f} rows/sec)"
+
+
+def read_rows(stream, fmt: str) -> Iterator[Tuple[int, Any]]:
+    """Yield (line number, raw row) from a text stream; a bad NDJSON line is yielded as None."""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            # Empty cells mean "not given", except that a description may legitimately be empty
+            yield reader.line_num, {key: value for key, value in row.items() if value != "" or key == "description"}
+    else:
+        for line, raw in enumerate(stream, start=1):
+            if not raw.strip():
+                continue
+            try:
+                yield line, json.loads(raw)
+            except ValueError:
+                yield line, None
+
+
+def _copy_buffer(rows: List[Tuple[int, TaskImportRow]], creator_id: int) -> io.StringIO:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for line, row in rows:
+        writer.writerow([line, row.title, row.description, row.status.name, row.priority.name,
+                         row.deadline.isoformat(), row.reviewer_id, row.assignee_id, creator_id, row.team_id,
+                         row.organization_id])
+    buffer.seek(0)
+    return buffer
+
+
+def _import_chunk(db, chunk: List[Tuple[int, Any]], creator_id: int, organization_id: Optional[int],
+                  progress: ImportProgress):
+    valid = []
+    for line, raw in chunk:
+        if raw is None:
+            progress.rejects.append({"line": line, "errors": ["Invalid JSON"]})
+            continue
+        try:
+            row = TaskImportRow.model_validate(raw)
+        except ValidationError as e:
+            progress.rejects.append({"line": line, "row": raw,
+                                     "errors": [f"{'.'.join(map(str, error['loc']))}: {error['msg']}"
+                                                for error in e.errors()]})
+            continue
+        if organization_id is not None and row.organization_id != organization_id:
+            progress.rejects.append({"line": line, "row": raw, "errors": ["Organization mismatch"]})
+            continue
+        valid.append((line, row))
+    if not valid:
+        return
+
+    db.execute(CREATE_STAGING)
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY tasks_import_staging ({', '.join(STAGING_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                           _copy_buffer(valid, creator_id))
+    finally:
+        cursor.close()
+
+    failed = {line: (title, reason) for line, title, reason in db.execute(REJECT_REASONS) if reason}
+    if failed:
+        db.execute(DELETE_STAGED, {"lines": list(failed)})
+        progress.rejects.extend({"line": line, "title": title, "errors": [reason]}
+                                for line, (title, reason) in failed.items())
+    merged = [row for line, row in valid if line not in failed]
+    if merged:
+        # Titles are unique among the merged rows, so they map the new ids back to the rows
+        task_ids = {title: task_id for task_id, title in db.execute(MERGE_STAGED)}
+        record_task_events(db, [task_event("created", task_ids[row.title], row.team_id, row.organization_id,
+                                           row.model_dump())
+                                for row in merged])
+        scopes = set()
+        for row in merged:
+            scopes |= task_scopes(row.organization_id, row.team_id, (creator_id, row.assignee_id, row.reviewer_id))
+        bump_change_counters(db, scopes)
+    db.commit()
+    for row in merged:
+        deadline_scheduler.schedule(task_ids[row.title], row.deadline, row.title, row.status,
+                                    (creator_id, row.assignee_id, row.reviewer_id))
+    progress.imported += len(merged)
+
+
+def import_tasks(db, stream, fmt: str, creator_id: int, organization_id: Optional[int] = None,
+                 chunk_size: int = IMPORT_CHUNK_SIZE,
+                 on_progress: Optional[Callable[[ImportProgress], None]] = None) -> ImportProgress:
+    """
+        Import tasks from a CSV or NDJSON text stream.
+
+        Each chunk is committed on its own, so a failure part-way keeps the chunks already
+        loaded. When organization_id is given, rows for any other organization are rejected.
+    """
+    if fmt not in ("csv", "ndjson"):
+        raise ValueError(f"Unsupported import format: {fmt}")
+    progress = ImportProgress()
+    rows = read_rows(stream, fmt)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        progress.read += len(chunk)
+        _import_chunk(db, chunk, creator_id, organization_id, progress)
+        if on_progress:
+            on_progress(progress)
+    return progress
+
+
+def write_rejects(rejects: Iterable[Dict[str, Any]], path: str):
+    with open(path, "w") as reject_file:
+        for reject in rejects:
+            reject_file.write(json.dumps(reject, default=str) + "\n")
+
+
+def main():
+    from task.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path")
+    parser.add_argument("--creator-id", type=int, required=True)
+    parser.add_argument("--format", choices=["csv", "ndjson"])
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+    parser.add_argument("--rejects", default="rejects.ndjson")
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.path.endswith(".csv") else "ndjson")
+    db = SessionLocal()
+    try:
+        with open(args.path, newline="") as stream:
+            progress = import_tasks(db, stream, fmt, args.creator_id, chunk_size=args.chunk_size,
+                                    on_progress=lambda p: print(p, file=sys.stderr))
+    finally:
+        db.close()
+    write_rejects(progress.rejects, args.rejects)
+    print(f"done: {progress}; rejects written to {args.rejects}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,40 +1,202 @@
-from fastapi import WebSocket, WebSocketDisconnect
-from typing import Dict, List
+import asyncio
+import json
+import os
+from collections import deque
+from fastapi import WebSocket
+from fastapi.encoders import jsonable_encoder
+from typing import Any, Deque, Dict, Iterable, Optional, Tuple
+
+WEBSOCKET_SEND_TIMEOUT = float(os.getenv("WEBSOCKET_SEND_TIMEOUT", "5"))
+WEBSOCKET_QUEUE_SIZE = int(os.getenv("WEBSOCKET_QUEUE_SIZE", "100"))
+# What to do when a connection's queue is full: drop_oldest, coalesce or disconnect
+WEBSOCKET_OVERFLOW_POLICY = os.getenv("WEBSOCKET_OVERFLOW_POLICY", "drop_oldest")
+OVERFLOW_POLICIES = ("drop_oldest", "coalesce", "disconnect")
+
+
+def serialize(message: Any) -> str:
+    """Text frame for a message: strings go out as they are, anything else as JSON."""
+    if isinstance(message, str):
+        return message
+    return json.dumps(jsonable_encoder(message))
+
+
+def skipped_notice(count: int) -> str:
+    """Sent in place of the messages a coalescing connection skipped."""
+    return f"{count} notifications were skipped; reload to catch up."
+
+
+class Connection:
+    """One client socket with its bounded outbound queue, drained by a writer task."""
+    def __init__(self, user_id: int, websocket: WebSocket, max_queue: int):
+        self.user_id = user_id
+        self.websocket = websocket
+        self.max_queue = max_queue
+        self.queue: Deque[str] = deque()
+        self.skipped = 0
+        self.ready = asyncio.Event()
+        self.idle = asyncio.Event()
+        self.idle.set()
+        self.writer: Optional[asyncio.Task] = None
+
+    @property
+    def depth(self) -> int:
+        return len(self.queue) + (1 if self.skipped else 0)
+
+    def push(self, payload: str):
+        self.queue.append(payload)
+        self.idle.clear()
+        self.ready.set()
+
 
 class WebSocketManager:
     """
         Manages WebSocket connections for real-time communication.
+
+        A user may hold several connections (one per tab or device); every message sent
+        to the user goes to all of them. Sending never waits on a client: each connection
+        has an outbound queue of at most max_queue messages, written out by its own task.
+        When a slow client's queue is full, the overflow policy decides what gives:
+
+            drop_oldest: the oldest queued message is discarded.
+            coalesce:    the whole backlog is replaced by one "notifications were skipped"
+                         notice, followed by the new message.
+            disconnect:  the connection is closed; the client reconnects and reloads.
+
+        A connection whose send fails or takes longer than send_timeout is closed and
+        dropped from the registry.
     """
-    def __init__(self):
-        self.active_connections: Dict[int, WebSocket] = {}
+    def __init__(self, send_timeout: float = WEBSOCKET_SEND_TIMEOUT, max_queue: int = WEBSOCKET_QUEUE_SIZE,
+                 overflow_policy: str = WEBSOCKET_OVERFLOW_POLICY):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown WebSocket overflow policy: {overflow_policy}")
+        self.active_connections: Dict[int, Dict[WebSocket, Connection]] = {}
+        self.send_timeout = send_timeout
+        self.max_queue = max_queue
+        self.overflow_policy = overflow_policy
+        self.sent = 0
+        self.dropped = 0
+        self.evicted = 0
 
     async def connect(self, user_id: int, websocket: WebSocket):
         """Accept WebSocket connection and store it for a user."""
         await websocket.accept()
-        self.active_connections[user_id] = websocket
+        connection = Connection(user_id, websocket, self.max_queue)
+        connection.writer = asyncio.get_running_loop().create_task(self._write(connection))
+        self.active_connections.setdefault(user_id, {})[websocket] = connection
         print(f"WebSocket connected for user {user_id}. Active Users: {list(self.active_connections.keys())}")
 
-    async def disconnect(self, user_id: int):
-        """Remove WebSocket connection when the user disconnects."""
-        if user_id in self.active_connections:
+    def _remove(self, user_id: int, websocket: WebSocket) -> Optional[Connection]:
+        connections = self.active_connections.get(user_id)
+        if connections is None:
+            return None
+        connection = connections.pop(websocket, None)
+        if not connections:
             del self.active_connections[user_id]
+        if connection is not None:
+            self.dropped += len(connection.queue)
+            connection.idle.set()
+            if connection.writer is not None and connection.writer is not asyncio.current_task():
+                connection.writer.cancel()
+        return connection
+
+    async def disconnect(self, user_id: int, websocket: WebSocket):
+        """Remove one of the user's connections when it closes."""
+        if self._remove(user_id, websocket) is not None:
             print(f"WebSocket disconnected for user {user_id}.")
 
-    async def send_personal_message(self, user_id: int, message: str):
-        """Send message to a specific user if connected."""
-        if user_id in self.active_connections:
-            try:
-                await self.active_connections[user_id].send_text(message)
-                print(f"Sent message to user {user_id}: {message}")
-            except Exception as e:
-                print(f"Error sending message to {user_id}: {str(e)}")
-        else:
-            print(f"User {user_id} is not connected.")
-
-    async def broadcast_to_team(self, user_ids: List[int], message: str):
-        """Send message to multiple users."""
-        print(f"Broadcasting message: '{message}' to users: {user_ids}")
-        for user_id in user_ids:
-            await self.send_personal_message(user_id, message)
+    async def _close(self, websocket: WebSocket):
+        try:
+            await asyncio.wait_for(websocket.close(), timeout=self.send_timeout)
+        except Exception:
+            pass
+
+    def _evict(self, connection: Connection, reason: str):
+        if self._remove(connection.user_id, connection.websocket) is None:
+            return
+        print(f"Dropping WebSocket for user {connection.user_id}: {reason}")
+        self.evicted += 1
+        asyncio.get_running_loop().create_task(self._close(connection.websocket))
+
+    async def _write(self, connection: Connection):
+        """Writer task: send queued messages one at a time until the connection goes away."""
+        while True:
+            await connection.ready.wait()
+            connection.ready.clear()
+            while connection.queue or connection.skipped:
+                if connection.skipped:
+                    payload, connection.skipped = skipped_notice(connection.skipped), 0
+                else:
+                    payload = connection.queue.popleft()
+                try:
+                    await asyncio.wait_for(connection.websocket.send_text(payload), timeout=self.send_timeout)
+                except asyncio.TimeoutError:
+                    self._evict(connection, f"send timed out after {self.send_timeout}s")
+                    return
+                except Exception as e:
+                    self._evict(connection, str(e) or type(e).__name__)
+                    return
+                self.sent += 1
+            connection.idle.set()
+
+    def _enqueue(self, connection: Connection, payload: str) -> bool:
+        if len(connection.queue) >= connection.max_queue:
+            if self.overflow_policy == "disconnect":
+                self._evict(connection, f"outbound queue full ({connection.max_queue} messages)")
+                return False
+            if self.overflow_policy == "coalesce":
+                connection.skipped += len(connection.queue)
+                self.dropped += len(connection.queue)
+                connection.queue.clear()
+            else:
+                connection.queue.popleft()
+                self.dropped += 1
+        connection.push(payload)
+        return True
+
+    async def send_personal_message(self, user_id: int, message: Any) -> Tuple[int, int]:
+        """Queue message for every connection of a user; returns (queued, failed)."""
+        return await self.broadcast_to_team([user_id], message)
+
+    async def broadcast_to_team(self, user_ids: Iterable[Optional[int]], message: Any) -> Tuple[int, int]:
+        """Queue message for multiple users; returns (queued, failed) connection counts."""
+        targets = [connection
+                   for user_id in dict.fromkeys(user_ids) if user_id is not None
+                   for connection in tuple(self.active_connections.get(user_id, {}).values())]
+        if not targets:
+            return 0, 0
+        # Serialized once, whatever the number of recipients
+        payload = serialize(message)
+        queued = sum(self._enqueue(connection, payload) for connection in targets)
+        return queued, len(targets) - queued
+
+    async def drain(self, timeout: Optional[float] = None):
+        """Wait until every connection has written out its queue."""
+        waiters = [connection.idle.wait() for connections in tuple(self.active_connections.values())
+                   for connection in tuple(connections.values())]
+        if waiters:
+            await asyncio.wait_for(asyncio.gather(*waiters), timeout=timeout)
+
+    async def close_all(self):
+        """Stop every writer and close every socket, e.g. on shutdown."""
+        connections = [connection for user_connections in tuple(self.active_connections.values())
+                       for connection in tuple(user_connections.values())]
+        for connection in connections:
+            self._remove(connection.user_id, connection.websocket)
+        await asyncio.gather(*(self._close(connection.websocket) for connection in connections))
+
+    def snapshot(self) -> dict:
+        depths = [connection.depth for connections in tuple(self.active_connections.values())
+                  for connection in tuple(connections.values())]
+        return {
+            "users": len(self.active_connections),
+            "connections": len(depths),
+            "overflow_policy": self.overflow_policy,
+            "queue_size": self.max_queue,
+            "queued": sum(depths),
+            "max_queue_depth": max(depths, default=0),
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "evicted": self.evicted,
+        }
 
 manager = WebSocketManager()